@@ -15,6 +15,13 @@ from dotenv import load_dotenv
 load_dotenv()  # .env 파일 로드
 
 from app.services.openai_service import OpenAIService
+from app.services import pipeline_events
+from app.services.pipeline_events import PipelineEventBus
+from app.services.model_router import get_model_router
+from app.services.openai_client import openai_client_registry, request_deadline
+from app.services.request_budget import (
+    STAGE_REALTIME_TRANSPORT, RequestBudget, current_budget, request_budget, stage_min_seconds
+)
 from app.services.notion_service import NotionService
 from app.services.naver_service import NaverService
 from app.services.google_maps_service import GoogleMapsService
@@ -53,6 +60,10 @@ class TravelPlanRequest(BaseModel):
             "avoid_crowds": True
         }
     )
+    bypass_cache: bool = Field(
+        False,
+        description="LLM 응답 캐시를 사용하지 않고 새로 생성"
+    )
 
 class ItineraryItem(BaseModel):
     """일정 항목"""
@@ -100,12 +111,14 @@ class TravelPlanResponse(BaseModel):
 # 헬퍼 함수들
 # =============================================================================
 
-async def _generate_8step_itinerary(request: TravelPlanRequest) -> Dict[str, Any]:
+async def _generate_8step_itinerary(request: TravelPlanRequest, events: Optional[PipelineEventBus] = None) -> Dict[str, Any]:
     """8단계 아키텍처로 여행 일정 생성"""
     openai_service = OpenAIService()
     ai_itinerary = await openai_service.generate_detailed_itinerary(
         prompt=request.prompt,
-        trip_details=request.preferences or {}
+        trip_details=request.preferences or {},
+        events=events,
+        bypass_cache=request.bypass_cache
     )
     print(f"8단계 처리된 일정 생성: {len(ai_itinerary.get('schedule', []))}개 항목")
     return ai_itinerary
@@ -160,12 +173,17 @@ async def _process_8step_itinerary(ai_itinerary: Dict[str, Any]) -> tuple:
     optimized_route = await maps_service.get_optimized_route(locations_for_route)
     print(f"✅ 경로 최적화 완료: {optimized_route.get('total_distance', 'N/A')}")
     
-    # 실시간 대중교통 정보 추가
-    if locations_for_route:
+    # 실시간 대중교통 정보 추가 (선택 단계: 시간 예산이 부족하면 건너뜀)
+    budget = current_budget()
+    if locations_for_route and budget.allows(STAGE_REALTIME_TRANSPORT, stage_min_seconds(STAGE_REALTIME_TRANSPORT, 3)):
         first_location = locations_for_route[0]['name']
         last_location = locations_for_route[-1]['name'] if len(locations_for_route) > 1 else first_location
-        realtime_transport = await transport_service.get_optimal_route_with_realtime(first_location, last_location)
-        optimized_route['realtime_transport'] = realtime_transport
+        realtime_transport = await budget.run(
+            STAGE_REALTIME_TRANSPORT,
+            transport_service.get_optimal_route_with_realtime(first_location, last_location)
+        )
+        if realtime_transport is not None:
+            optimized_route['realtime_transport'] = realtime_transport
     
     # 경로 정보 및 실시간 대중교통 정보 반영
     if optimized_route.get('route_segments'):
@@ -251,6 +269,118 @@ def _create_response(plan_id: str, request: TravelPlanRequest, itinerary: List,
     
     return TravelPlanResponse(**response_data)
 
+async def _build_travel_plan(
+    request: TravelPlanRequest,
+    events: Optional[PipelineEventBus] = None,
+    deadline_seconds: Optional[float] = None
+) -> TravelPlanResponse:
+    """
+    여행 계획 생성 전체 흐름 (/plan, /plan-stream, 백그라운드 작업 공용)
+    
+    요청 전체에 시간 예산(PLAN_REQUEST_DEADLINE_SECONDS)을 적용합니다.
+    남은 시간이 부족하면 선택 단계(구역별 세분화, 블로그 본문, 실시간 대중교통)를 건너뛰고
+    processing_metadata['degradation']에 기록하며, OpenAI 호출도 같은 데드라인을 넘지 않습니다.
+    
+    Args:
+        request: 여행 계획 요청
+        events: 파이프라인 이벤트 버스 (SSE 스트리밍/로그/지연 측정 구독용)
+        deadline_seconds: 시간 예산 (생략 시 PLAN_REQUEST_DEADLINE_SECONDS, 0이면 무제한)
+    """
+    with request_budget(deadline_seconds) as budget, request_deadline(budget.remaining()):
+        return await _build_travel_plan_within_budget(request, events or PipelineEventBus(), budget)
+
+async def _build_travel_plan_within_budget(request: TravelPlanRequest, events: PipelineEventBus, budget: RequestBudget) -> TravelPlanResponse:
+    """_build_travel_plan 본문 (예산 컨텍스트 안에서 실행)"""
+    import uuid
+    plan_id = str(uuid.uuid4())
+    
+    # UI 설정값 추출 및 검증
+    preferences = request.preferences or {}
+    city = preferences.get('city', 'Seoul')
+    travel_style = preferences.get('travel_style', 'custom')
+    start_date = preferences.get('start_date')
+    end_date = preferences.get('end_date')
+    start_time = preferences.get('start_time', '09:00')
+    end_time = preferences.get('end_time', '18:00')
+    start_location = preferences.get('start_location', '')
+    
+    print(f"🚀 8단계 아키텍처 시작: {request.prompt}")
+    print(f"📍 도시: {city}, 스타일: {travel_style}")
+    print(f"⏰ 시간: {start_date} {start_time} ~ {end_date} {end_time}")
+    print(f"🏠 출발지: {start_location}")
+    
+    # 8단계 아키텍처로 실제 여행 일정 생성
+    ai_itinerary = await _generate_8step_itinerary(request, events)
+    sample_itinerary, optimized_route = await _process_8step_itinerary(ai_itinerary)
+    await events.emit(
+        pipeline_events.ROUTE_COMPUTED,
+        message='🗺️ 경로 최적화 완료',
+        progress=95,
+        total_distance=optimized_route.get('total_distance')
+    )
+    
+    print(f"✅ 8단계 처리 완료: {len(sample_itinerary)}개 장소 생성")
+    
+    # Notion 저장은 사용자 선택에 따라 결정
+    notion_url = None
+    notion_saved = False
+    notion_error = None
+    
+    # 비용 계산
+    total_cost = _calculate_total_cost(sample_itinerary)
+    
+    # 날씨 정보 조회 (UI에서 설정한 도시 사용)
+    from app.services.city_service import CityService
+    city_service = CityService()
+    weather_code = city_service.get_weather_code(city)
+    weather_info = await _get_weather_info(weather_code)
+    
+    # 출발지 정보를 경로 최적화에 반영
+    if start_location and optimized_route:
+        optimized_route['start_location'] = start_location
+    
+    # 응답 생성 (ItineraryItem 객체를 딕셔너리로 변환)
+    itinerary_dicts = []
+    for item in sample_itinerary:
+        if hasattr(item, '__dict__'):
+            item_dict = item.__dict__.copy()
+        else:
+            item_dict = item
+        itinerary_dicts.append(item_dict)
+    
+    # 8단계 처리 메타데이터 추가 (UI 설정값 포함)
+    processing_metadata = {
+        'total_verified_places': len(sample_itinerary),
+        'matched_places': len([item for item in sample_itinerary if item.__dict__.get('verified', False)]),
+        'cache_usage': ai_itinerary.get('cache_usage', {}),
+        'llm_cache': ai_itinerary.get('llm_cache', {}),
+        'llm_output': ai_itinerary.get('llm_output', {}),
+        'weather_forecast': weather_info,
+        'optimized_route': optimized_route,
+        'ui_settings': {
+            'city': city,
+            'travel_style': travel_style,
+            'start_date': start_date,
+            'end_date': end_date,
+            'start_time': start_time,
+            'end_time': end_time,
+            'start_location': start_location
+        },
+        'stage_timings_ms': events.get_timings(),
+        'degradation': budget.to_metadata()
+    }
+    degradation = processing_metadata['degradation']
+    if degradation['degraded']:
+        print(
+            f"⏱️ 시간 예산 적용: 건너뜀 {[entry['stage'] for entry in degradation['skipped']]}, "
+            f"축소 {[entry['stage'] for entry in degradation['truncated']]}"
+        )
+    
+    response = _create_response(plan_id, request, itinerary_dicts, total_cost, optimized_route, notion_url, notion_saved, notion_error, weather_info, processing_metadata)
+    
+    print(f"✅ 8단계 아키텍처 응답 생성 완료: {len(itinerary_dicts)}개 항목")
+    return response
+
 # =============================================================================
 # 메인 API 엔드포인트
 # =============================================================================
@@ -280,80 +410,7 @@ async def create_travel_plan(
     - "제주도 비오는 날 데이트" → 실내 장소 우선 추천
     """
     try:
-        import uuid
-        plan_id = str(uuid.uuid4())
-        
-        # UI 설정값 추출 및 검증
-        preferences = request.preferences or {}
-        city = preferences.get('city', 'Seoul')
-        travel_style = preferences.get('travel_style', 'custom')
-        start_date = preferences.get('start_date')
-        end_date = preferences.get('end_date')
-        start_time = preferences.get('start_time', '09:00')
-        end_time = preferences.get('end_time', '18:00')
-        start_location = preferences.get('start_location', '')
-        
-        print(f"🚀 8단계 아키텍처 시작: {request.prompt}")
-        print(f"📍 도시: {city}, 스타일: {travel_style}")
-        print(f"⏰ 시간: {start_date} {start_time} ~ {end_date} {end_time}")
-        print(f"🏠 출발지: {start_location}")
-        
-        # 8단계 아키텍처로 실제 여행 일정 생성
-        ai_itinerary = await _generate_8step_itinerary(request)
-        sample_itinerary, optimized_route = await _process_8step_itinerary(ai_itinerary)
-        
-        print(f"✅ 8단계 처리 완료: {len(sample_itinerary)}개 장소 생성")
-        
-        # Notion 저장은 사용자 선택에 따라 결정
-        notion_url = None
-        notion_saved = False
-        notion_error = None
-        
-        # 비용 계산
-        total_cost = _calculate_total_cost(sample_itinerary)
-        
-        # 날씨 정보 조회 (UI에서 설정한 도시 사용)
-        from app.services.city_service import CityService
-        city_service = CityService()
-        weather_code = city_service.get_weather_code(city)
-        weather_info = await _get_weather_info(weather_code)
-        
-        # 출발지 정보를 경로 최적화에 반영
-        if start_location and optimized_route:
-            optimized_route['start_location'] = start_location
-        
-        # 응답 생성 (ItineraryItem 객체를 딕셔너리로 변환)
-        itinerary_dicts = []
-        for item in sample_itinerary:
-            if hasattr(item, '__dict__'):
-                item_dict = item.__dict__.copy()
-            else:
-                item_dict = item
-            itinerary_dicts.append(item_dict)
-        
-        # 8단계 처리 메타데이터 추가 (UI 설정값 포함)
-        processing_metadata = {
-            'total_verified_places': len(sample_itinerary),
-            'matched_places': len([item for item in sample_itinerary if item.__dict__.get('verified', False)]),
-            'cache_usage': ai_itinerary.get('cache_usage', {}),
-            'weather_forecast': weather_info,
-            'optimized_route': optimized_route,
-            'ui_settings': {
-                'city': city,
-                'travel_style': travel_style,
-                'start_date': start_date,
-                'end_date': end_date,
-                'start_time': start_time,
-                'end_time': end_time,
-                'start_location': start_location
-            }
-        }
-        
-        response = _create_response(plan_id, request, itinerary_dicts, total_cost, optimized_route, notion_url, notion_saved, notion_error, weather_info, processing_metadata)
-        
-        print(f"✅ 8단계 아키텍처 응답 생성 완료: {len(itinerary_dicts)}개 항목")
-        return response
-        
+        return await _build_travel_plan(request)
     except ValueError as ve:
         # 🆕 장소 0개 등 사용자 에러는 400으로 반환 (명확한 메시지)
         print(f"User error in create_travel_plan: {str(ve)}")
@@ -387,6 +444,10 @@ async def health_check():
         "naver": "configured" if os.getenv("NAVER_CLIENT_ID") else "missing"
     }
     
+    # route별 모델, SLO 상태, 토큰 사용량
+    status["llm_routes"] = get_model_router().get_stats()
+    status["openai_client"] = openai_client_registry.get_stats()
+    
     return status
 
 @router.get("/config")
@@ -0,0 +1,160 @@
+"""
+백그라운드 작업 엔드포인트
+
+여행 계획 생성을 작업 큐로 실행하고 상태 폴링 / SSE 구독을 제공합니다.
+연결이 끊겨도 작업은 계속 실행되며, 같은 job_id로 다시 조회하거나 구독할 수 있습니다.
+"""
+
+import json
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.endpoints import TravelPlanRequest, _build_travel_plan
+from app.services.pipeline_events import PipelineEventBus
+from app.services.plan_job_service import TERMINAL_STATES, JobQueueFullError, PlanJobService
+
+router = APIRouter()
+
+# 이벤트가 없을 때 연결 유지를 위한 주석 전송 간격 (초)
+KEEPALIVE_SECONDS = 15
+
+
+async def _run_plan(payload: Dict[str, Any], events: PipelineEventBus) -> Dict[str, Any]:
+    """
+    작업 워커에서 /plan과 같은 파이프라인 실행
+    
+    기다리는 HTTP 연결이 없으므로 요청 예산 대신 PLAN_JOB_DEADLINE_SECONDS (기본 300초, 0이면 무제한)를 적용합니다.
+    """
+    response = await _build_travel_plan(
+        TravelPlanRequest(**payload),
+        events=events,
+        deadline_seconds=float(os.getenv('PLAN_JOB_DEADLINE_SECONDS', 300))
+    )
+    return response.model_dump()
+
+
+# 싱글톤 인스턴스 (main.py lifespan에서 종료)
+plan_job_service = PlanJobService(_run_plan)
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {
+        'status_url': f"/api/travel/plan/jobs/{job_id}",
+        'events_url': f"/api/travel/plan/jobs/{job_id}/events"
+    }
+
+
+@router.post("/plan/jobs", status_code=202)
+async def create_plan_job(request: TravelPlanRequest):
+    """
+    🧵 **여행 계획 생성 작업 등록**
+    
+    계획 생성을 백그라운드 작업으로 실행하고 즉시 job_id를 반환합니다.
+    결과는 `GET /plan/jobs/{job_id}`로 폴링하거나 `GET /plan/jobs/{job_id}/events`(SSE)로 구독합니다.
+    
+    대기 중인 작업이 많으면 503과 Retry-After 헤더를 반환합니다.
+    """
+    try:
+        job = await plan_job_service.submit(request.model_dump())
+    except JobQueueFullError as e:
+        return JSONResponse(status_code=503, content={'detail': str(e)}, headers={'Retry-After': '5'})
+    
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'queue_position': job['queue_position'],
+        **_job_links(job['job_id'])
+    }
+
+
+@router.get("/plan/jobs")
+async def get_plan_job_stats():
+    """작업 큐/워커 상태"""
+    return plan_job_service.get_stats()
+
+
+@router.get("/plan/jobs/{job_id}")
+async def get_plan_job(job_id: str):
+    """
+    🔎 **작업 상태 조회**
+    
+    `status`: queued / running / succeeded / failed
+    완료되면 `result`에 /plan 응답과 같은 데이터가, 실패하면 `error`에 원인이 담깁니다.
+    """
+    job = await plan_job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+    return {**job, **_job_links(job_id)}
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """SSE 직렬화 (id로 재연결 시 이어받기)"""
+    return f"id: {event['id']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+async def job_event_generator(job_id: str, after: int) -> AsyncGenerator[str, None]:
+    """
+    작업 진행 이벤트 스트리밍
+    
+    after 이후 이벤트를 먼저 보내고, 작업이 끝날 때까지 새 이벤트를 이어서 보냅니다.
+    complete 이벤트에는 최종 결과(data)를 함께 담습니다.
+    """
+    store = plan_job_service.store
+    last_sent = time.monotonic()
+    
+    while True:
+        for event in await store.events_since(job_id, after):
+            after = event['id']
+            if event['type'] == 'complete':
+                job = await store.get(job_id)
+                event = {**event, 'data': job.get('result') if job else None}
+            yield _sse(event)
+            last_sent = time.monotonic()
+            if event['type'] in ('complete', 'error'):
+                return
+        
+        job = await store.get(job_id)
+        if job is None:
+            yield f"data: {json.dumps({'type': 'error', 'message': '작업이 만료되었습니다'}, ensure_ascii=False)}\n\n"
+            return
+        if job['status'] in TERMINAL_STATES and not await store.events_since(job_id, after):
+            return
+        
+        if time.monotonic() - last_sent >= KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        await store.wait_for_change(job_id, after, timeout=KEEPALIVE_SECONDS)
+
+
+@router.get("/plan/jobs/{job_id}/events")
+async def stream_plan_job_events(
+    job_id: str,
+    after: int = Query(-1, description="이 id 이후의 이벤트만 전송"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    🌊 **작업 진행 SSE 구독**
+    
+    `/plan-stream`과 같은 이벤트 타입(status, item, complete, error)을 전송합니다.
+    연결이 끊기면 EventSource가 Last-Event-ID로 재연결하여 놓친 이벤트부터 이어받습니다.
+    구독을 끊어도 작업은 취소되지 않습니다.
+    """
+    if await plan_job_service.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+    
+    if last_event_id is not None and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    
+    return StreamingResponse(
+        job_event_generator(job_id, after),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # nginx 버퍼링 방지
+        }
+    )
@@ -10,9 +10,10 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional, AsyncGenerator
 import json
 import asyncio
-from datetime import datetime
 
-from app.services.openai_service import OpenAIService
+from app.api.endpoints import TravelPlanRequest, _build_travel_plan
+from app.services import pipeline_events
+from app.services.pipeline_events import PipelineEventBus
 
 router = APIRouter()
 
@@ -21,39 +22,73 @@ class TravelPlanStreamRequest(BaseModel):
     """스트리밍 여행 계획 요청"""
     prompt: str
     preferences: Optional[Dict[str, Any]] = None
+    bypass_cache: bool = False
+
+
+# 이벤트가 없을 때 연결 유지를 위한 주석 전송 간격 (초)
+KEEPALIVE_SECONDS = 15
+
+
+def _sse(data: Dict[str, Any]) -> str:
+    """SSE data 라인 직렬화"""
+    return f"data: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
 
 
 async def progress_generator(request: TravelPlanStreamRequest) -> AsyncGenerator[str, None]:
     """
-    진행 상황을 SSE 형식으로 실시간 스트리밍
-    크롤링되는 장소를 하나씩 표시
+    실제 여행 계획 파이프라인을 실행하며 진행 상황을 SSE 형식으로 실시간 스트리밍
+    
+    - status: 단계 완료 이벤트 (장소 수집, AI 생성 시작, 경로 계산 등)
+    - token: GPT 응답 토큰 (stream=True)
+    - item: 파싱이 끝난 일정 항목 (검증 전 원본)
+    - complete: /plan과 동일한 최종 응답
     """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def on_event(event: str, data: Dict[str, Any]):
+        """파이프라인 이벤트 → SSE 이벤트 타입 변환"""
+        if event == pipeline_events.LLM_TOKEN:
+            queue.put_nowait({'type': 'token', **data})
+        elif event == pipeline_events.ITEM_PARSED:
+            queue.put_nowait({'type': 'item', **data})
+        else:
+            queue.put_nowait({'type': 'status', 'stage': event, **data})
+    
+    events = PipelineEventBus()
+    events.subscribe(on_event)
+    
+    async def run_pipeline():
+        try:
+            plan_request = TravelPlanRequest(
+                prompt=request.prompt,
+                preferences=request.preferences,
+                bypass_cache=request.bypass_cache
+            )
+            response = await _build_travel_plan(plan_request, events=events)
+            await queue.put({'type': 'complete', 'progress': 100, 'data': response.model_dump()})
+        except ValueError as ve:
+            await queue.put({'type': 'error', 'message': str(ve)})
+        except Exception as e:
+            await queue.put({'type': 'error', 'message': f"오류 발생: {str(e)}"})
+    
+    yield _sse({'type': 'status', 'stage': 'started', 'message': '🚀 여행 계획 생성 시작...', 'progress': 0})
     
+    task = asyncio.create_task(run_pipeline())
     try:
-        # 1. 시작
-        yield f"data: {json.dumps({'type': 'status', 'message': '🚀 여행 계획 생성 시작...', 'progress': 0}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(0.1)
-        
-        # 2. 지역 추출
-        yield f"data: {json.dumps({'type': 'status', 'message': '📍 지역 정보 추출 중...', 'progress': 5}, ensure_ascii=False)}\n\n"
-        
-        # 3. 간단한 진행 메시지 (클라이언트에서 처리)
-        preferences = request.preferences or {}
-        
-        yield f"data: {json.dumps({'type': 'status', 'message': '🔍 장소 크롤링 중...', 'progress': 20}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(3)
-        
-        yield f"data: {json.dumps({'type': 'status', 'message': '🤖 AI 분석 중...', 'progress': 60}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(5)
-        
-        yield f"data: {json.dumps({'type': 'status', 'message': '✅ 검증 중...', 'progress': 90}, ensure_ascii=False)}\n\n"
-        
-        # 🆕 실제 계획 생성은 일반 API 호출 권장
-        yield f"data: {json.dumps({'type': 'info', 'message': '💡 실제 장소명은 클라이언트에서 표시됩니다', 'progress': 100}, ensure_ascii=False)}\n\n"
-        
-    except Exception as e:
-        error_msg = f"오류 발생: {str(e)}"
-        yield f"data: {json.dumps({'type': 'error', 'message': error_msg}, ensure_ascii=False)}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            
+            yield _sse(event)
+            if event['type'] in ('complete', 'error'):
+                break
+    finally:
+        # 클라이언트 연결 종료 시 파이프라인도 중단
+        if not task.done():
+            task.cancel()
 
 
 @router.post("/plan-stream")
@@ -62,11 +97,13 @@ async def create_travel_plan_stream(request: TravelPlanStreamRequest):
     🌊 **SSE 스트리밍 여행 계획 생성**
     
     ChatGPT처럼 진행 상황을 실시간으로 표시하면서 여행 계획을 생성합니다.
+    /plan과 같은 파이프라인을 실행하므로 별도로 /plan을 호출할 필요가 없습니다.
     
     ### SSE 이벤트 타입:
-    - `status`: 진행 상황 (예: "크롤링 중...")
-    - `info`: 정보 메시지 (예: "청도 인식 완료")
-    - `complete`: 최종 결과 데이터
+    - `status`: 단계 완료 (`stage`, `message`, `progress`)
+    - `token`: GPT 응답 토큰 (`text`)
+    - `item`: 생성되는 즉시 파싱된 일정 항목 (`index`, `item`)
+    - `complete`: 최종 결과 데이터 (`data`, /plan 응답과 동일)
     - `error`: 오류 메시지
     
     ### 사용 예시:
@@ -75,7 +112,9 @@ async def create_travel_plan_stream(request: TravelPlanStreamRequest):
     eventSource.onmessage = (event) => {
         const data = JSON.parse(event.data);
         if (data.type === 'status') {
-            console.log(data.message);  // "크롤링 중..."
+            console.log(data.message);  // "검증된 장소 24개 확보"
+        } else if (data.type === 'item') {
+            renderItem(data.item);  // 일정 항목 점진 표시
         }
     };
     ```
@@ -123,7 +123,7 @@ async def get_travel_plans(db: Session = Depends(get_db)):
     """사용자 여행 계획 목록 조회"""
     # 캐시 확인
     cache_key = "user_travel_plans_1"
-    cached_plans = cache_service.get(cache_key)
+    cached_plans = await cache_service.get(cache_key)
     if cached_plans:
         return cached_plans
     
@@ -141,7 +141,7 @@ async def get_travel_plans(db: Session = Depends(get_db)):
     ]
     
     # 캐시에 저장
-    cache_service.set(cache_key, result, ttl=300)
+    await cache_service.set(cache_key, result, ttl=300)
     
     return result
 
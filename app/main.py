@@ -5,6 +5,7 @@ FastAPI 메인 애플리케이션
 CORS 설정, 라우터 등록, 미들웨어 설정을 담당합니다.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -20,7 +21,24 @@ except ImportError:
 
 from app.api.endpoints import router as api_router
 from app.api.streaming_endpoints import router as streaming_router  # 🆕 SSE
+from app.api.job_endpoints import router as job_router, plan_job_service  # 🆕 백그라운드 작업
 # from app.api.user_endpoints import router as user_router  # 로그인 제거로 비활성화
+from app.services.http_client import http_client_registry
+from app.services.openai_client import openai_client_registry
+from app.services.redis_pool import close_all_redis_handles
+from app.services.tiered_cache_service import flush_tiered_crawl_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 주기: 공유 리소스 생성 및 정리"""
+    await http_client_registry.startup()
+    yield
+    await plan_job_service.close()  # 실행 중인 작업 워커 먼저 정리
+    await http_client_registry.close()
+    await openai_client_registry.close()
+    await flush_tiered_crawl_cache()  # 남은 write-behind 저장 후 Redis 종료
+    await close_all_redis_handles()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -28,7 +46,8 @@ app = FastAPI(
     description="AI 기반 맞춤형 한국 여행 계획 생성 서비스",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -44,6 +63,7 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/travel", tags=["travel"])
 # app.include_router(user_router, prefix="/api/users", tags=["users"])  # 로그인 제거
 app.include_router(streaming_router, prefix="/api/travel", tags=["streaming"])  # 🆕 SSE
+app.include_router(job_router, prefix="/api/travel", tags=["jobs"])  # 🆕 백그라운드 작업
 
 def get_frontend_path():
     return os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend")
@@ -0,0 +1,233 @@
+"""
+캐시 값 코덱
+
+크롤링 캐시에 저장되는 장소 리스트를 작은 바이너리로 직렬화합니다.
+
+- 직렬화: msgpack (미설치 시 JSON)
+- 스키마 태그: 장소 dict 리스트는 필드명을 한 번만 저장하는 행 형식으로 변환
+- 압축: zstd (미설치 시 zlib) / 끌 수 있음, 작은 값은 압축 생략
+- 버전 헤더: MAGIC + 버전 + 형식 + 압축 (헤더가 없는 기존 JSON 문자열도 그대로 읽음)
+- v2: 헤더에 저장 시각(stored_at)을 담아 stale-while-revalidate 판단에 사용
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+class CacheCodecError(ValueError):
+    """캐시 값 복원 실패"""
+
+
+class CacheCodec:
+    """버전 헤더가 붙은 캐시 값 인코더/디코더"""
+    
+    MAGIC = b"\xfeTC"
+    VERSION = 2
+    
+    # v2부터 헤더 뒤에 저장 시각 (unix 초, big-endian uint64)
+    STORED_AT = struct.Struct(">Q")
+    
+    FORMAT_JSON = ord('j')
+    FORMAT_MSGPACK = ord('m')
+    
+    COMPRESS_NONE = ord('n')
+    COMPRESS_ZLIB = ord('z')
+    COMPRESS_ZSTD = ord('s')
+    
+    # 행 형식 태그 (필드명 목록 + 값 행)
+    ROWS_TAG = "__rows__"
+    
+    # 알고리즘별 허용 압축 레벨 (CACHE_COMPRESS_LEVEL은 각 범위로 잘라서 사용)
+    ZSTD_LEVEL_RANGE = (1, 22)
+    ZLIB_LEVEL_RANGE = (0, 9)
+    
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_min_bytes: Optional[int] = None,
+        level: Optional[int] = None
+    ):
+        serializer = (serializer or os.getenv('CACHE_CODEC', 'msgpack')).lower()
+        compression = (compression or os.getenv('CACHE_COMPRESSION', 'zstd')).lower()
+        
+        if serializer == 'msgpack' and not MSGPACK_AVAILABLE:
+            print("⚠️ msgpack 미설치 - 캐시 코덱 JSON 사용")
+            serializer = 'json'
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            compression = 'zlib'
+        
+        self.serializer = serializer if serializer in ('msgpack', 'json') else 'json'
+        self.compression = compression if compression in ('zstd', 'zlib', 'none') else 'zlib'
+        self.compress_min_bytes = compress_min_bytes if compress_min_bytes is not None else \
+            int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 1024))
+        self.level = level if level is not None else int(os.getenv('CACHE_COMPRESS_LEVEL', 3))
+        self.zstd_level = self._clamp_level(self.level, self.ZSTD_LEVEL_RANGE)
+        self.zlib_level = self._clamp_level(self.level, self.ZLIB_LEVEL_RANGE)
+        
+        self._zstd_compressor = zstandard.ZstdCompressor(level=self.zstd_level) if ZSTD_AVAILABLE else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+    
+    @staticmethod
+    def _clamp_level(level: int, level_range: Tuple[int, int]) -> int:
+        low, high = level_range
+        return max(low, min(level, high))
+    
+    # ------------------------------------------------------------------
+    # 스키마 태그 (dict 리스트 ↔ 행)
+    # ------------------------------------------------------------------
+    
+    def _to_rows(self, value: Any) -> Any:
+        """같은 형태의 dict 리스트는 필드명을 한 번만 저장"""
+        if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+            return value
+        
+        fields: List[str] = []
+        seen = set()
+        for item in value:
+            for key in item:
+                if key not in seen:
+                    seen.add(key)
+                    fields.append(key)
+        
+        # 없는 필드와 None 값을 구분하기 위해 행 길이는 필드 수와 같고, 누락은 별도 인덱스로 표시
+        rows = []
+        for item in value:
+            row = [item.get(field) for field in fields]
+            missing = [i for i, field in enumerate(fields) if field not in item]
+            rows.append([row, missing] if missing else [row])
+        
+        return {self.ROWS_TAG: fields, "rows": rows}
+    
+    def _from_rows(self, value: Any) -> Any:
+        if not isinstance(value, dict) or self.ROWS_TAG not in value:
+            return value
+        
+        fields = value[self.ROWS_TAG]
+        items = []
+        for entry in value.get("rows", []):
+            row = entry[0]
+            missing = set(entry[1]) if len(entry) > 1 else ()
+            items.append({
+                field: row[i] for i, field in enumerate(fields) if i not in missing
+            })
+        return items
+    
+    # ------------------------------------------------------------------
+    # 인코딩 / 디코딩
+    # ------------------------------------------------------------------
+    
+    def encode(self, value: Any, stored_at: Optional[float] = None) -> bytes:
+        """값 → 헤더 + 저장 시각 + (압축된) 페이로드"""
+        tagged = self._to_rows(value)
+        
+        if self.serializer == 'msgpack':
+            payload = msgpack.packb(tagged, use_bin_type=True)
+            fmt = self.FORMAT_MSGPACK
+        else:
+            payload = json.dumps(tagged, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            fmt = self.FORMAT_JSON
+        
+        compression = self.COMPRESS_NONE
+        if self.compression != 'none' and len(payload) >= self.compress_min_bytes:
+            if self.compression == 'zstd':
+                payload = self._zstd_compressor.compress(payload)
+                compression = self.COMPRESS_ZSTD
+            else:
+                payload = zlib.compress(payload, self.zlib_level)
+                compression = self.COMPRESS_ZLIB
+        
+        header = self.MAGIC + bytes((self.VERSION, fmt, compression))
+        return header + self.STORED_AT.pack(int(stored_at or 0)) + payload
+    
+    def decode(self, data: Union[bytes, str, None]) -> Any:
+        """헤더를 읽어 값만 복원"""
+        return self.decode_entry(data)[0]
+    
+    def decode_entry(self, data: Union[bytes, str, None]) -> Tuple[Any, Optional[float]]:
+        """
+        헤더를 읽어 (값, 저장 시각) 복원
+        
+        헤더 없는 값은 기존 JSON 캐시로, v1 값은 저장 시각 없이 읽습니다.
+        
+        Raises:
+            CacheCodecError: 알 수 없는 버전/형식이거나 필요한 라이브러리가 없을 때
+        """
+        if data is None:
+            return None, None
+        if isinstance(data, str):
+            return json.loads(data), None
+        if not data.startswith(self.MAGIC):
+            return json.loads(data.decode('utf-8')), None
+        
+        header_end = len(self.MAGIC) + 3
+        if len(data) < header_end:
+            raise CacheCodecError("캐시 헤더가 잘렸습니다")
+        version, fmt, compression = data[len(self.MAGIC):header_end]
+        
+        if version > self.VERSION:
+            raise CacheCodecError(f"지원하지 않는 캐시 버전: {version}")
+        
+        stored_at = None
+        if version >= 2:
+            if len(data) < header_end + self.STORED_AT.size:
+                raise CacheCodecError("캐시 헤더가 잘렸습니다")
+            stored_at = self.STORED_AT.unpack_from(data, header_end)[0] or None
+            header_end += self.STORED_AT.size
+        payload = data[header_end:]
+        
+        if compression == self.COMPRESS_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise CacheCodecError("zstd 압축 캐시를 읽으려면 zstandard가 필요합니다")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif compression == self.COMPRESS_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression != self.COMPRESS_NONE:
+            raise CacheCodecError(f"알 수 없는 압축 방식: {compression}")
+        
+        if fmt == self.FORMAT_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise CacheCodecError("msgpack 캐시를 읽으려면 msgpack이 필요합니다")
+            tagged = msgpack.unpackb(payload, raw=False)
+        elif fmt == self.FORMAT_JSON:
+            tagged = json.loads(payload.decode('utf-8'))
+        else:
+            raise CacheCodecError(f"알 수 없는 직렬화 형식: {fmt}")
+        
+        return self._from_rows(tagged), stored_at
+    
+    def describe(self) -> Dict[str, Any]:
+        """현재 코덱 설정"""
+        return {
+            'version': self.VERSION,
+            'serializer': self.serializer,
+            'compression': self.compression,
+            'compress_min_bytes': self.compress_min_bytes,
+            'level': self.zstd_level if self.compression == 'zstd' else self.zlib_level
+        }
+
+
+# 싱글톤 인스턴스
+_cache_codec: Optional[CacheCodec] = None
+
+def get_cache_codec() -> CacheCodec:
+    """환경변수 설정을 따르는 공유 코덱 반환"""
+    global _cache_codec
+    if _cache_codec is None:
+        _cache_codec = CacheCodec()
+    return _cache_codec
@@ -4,49 +4,60 @@ Redis 캐시 서비스
 
 import os
 import json
-import redis
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
+
+from app.services.redis_pool import get_redis_handle
 
 class CacheService:
     def __init__(self):
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            # 연결 테스트
-            self.redis_client.ping()
-            self.enabled = True
-            print(f"✅ Redis 연결 성공: {redis_url}")
-        except Exception as e:
-            print(f"⚠️  Redis 연결 실패, 캐시 비활성화: {str(e)}")
-            self.enabled = False
-    
-    def get(self, key: str) -> Optional[Any]:
+        # 공유 커넥션 풀 사용 (연결 확인은 첫 사용 시 비동기로)
+        self._redis = get_redis_handle(redis_url, decode_responses=True)
+        self.redis_client = self._redis.client
+
+    @property
+    def enabled(self) -> bool:
+        """캐시 사용 가능 여부 (확인 전에는 사용 가능으로 간주)"""
+        return self._redis.available is not False
+
+    async def get(self, key: str) -> Optional[Any]:
         """캐시에서 데이터 조회"""
-        if not self.enabled:
+        if not await self._redis.is_available():
             return None
-        
+
         try:
-            data = self.redis_client.get(key)
+            data = await self.redis_client.get(key)
             return json.loads(data) if data else None
         except:
             return None
-    
-    def set(self, key: str, value: Any, ttl: int = 3600):
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 MGET 한 번으로 조회 (미스는 None)"""
+        if not keys or not await self._redis.is_available():
+            return {key: None for key in keys}
+
+        try:
+            values = await self.redis_client.mget(keys)
+            return {key: json.loads(data) if data else None for key, data in zip(keys, values)}
+        except:
+            return {key: None for key in keys}
+
+    async def set(self, key: str, value: Any, ttl: int = 3600):
         """캐시에 데이터 저장"""
-        if not self.enabled:
+        if not await self._redis.is_available():
             return
-        
+
         try:
-            self.redis_client.setex(key, ttl, json.dumps(value))
+            await self.redis_client.setex(key, ttl, json.dumps(value))
         except:
             pass
-    
-    def delete(self, key: str):
+
+    async def delete(self, key: str):
         """캐시에서 데이터 삭제"""
-        if not self.enabled:
+        if not await self._redis.is_available():
             return
-        
+
         try:
-            self.redis_client.delete(key)
+            await self.redis_client.delete(key)
         except:
-            pass
\ No newline at end of file
+            pass
@@ -1,35 +1,67 @@
 """
 크롤링 캐시 서비스 - 중복 크롤링 방지 및 1개월 캐시 (메모리 기반)
+
+1개월(soft TTL)이 지난 항목은 바로 지우지 않고 stale로 반환하여
+백그라운드 갱신 동안 사용하고, hard TTL이 지나야 만료됩니다.
 """
 
-import json
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional
+
+from app.services.memory_cache import BoundedMemoryCache
+
+# soft TTL: 이 기간이 지나면 stale (백그라운드 갱신 대상)
+CRAWL_SOFT_TTL = timedelta(days=float(os.getenv('CRAWL_SOFT_TTL_DAYS', 30)))
+# hard TTL: 이 기간이 지나면 완전히 만료
+CRAWL_HARD_TTL = timedelta(days=float(os.getenv('CRAWL_HARD_TTL_DAYS', 90)))
+
+class CachedPlaces(NamedTuple):
+    """캐시된 장소 리스트 + 저장 시각 (unix 초, 모르면 None)"""
+    places: List[Dict[str, Any]]
+    stored_at: Optional[float] = None
+    
+    def is_stale(self, soft_ttl_seconds: Optional[float] = None) -> bool:
+        """soft TTL이 지났는지 여부 (저장 시각을 모르는 기존 항목은 신선한 것으로 간주)"""
+        if not self.places or self.stored_at is None:
+            return False
+        if soft_ttl_seconds is None:
+            soft_ttl_seconds = CRAWL_SOFT_TTL.total_seconds()
+        return time.time() - self.stored_at > soft_ttl_seconds
+
+MISSING_ENTRY = CachedPlaces([], None)
+
+def create_crawl_memory_tier(ttl_seconds: float) -> BoundedMemoryCache:
+    """크롤링 캐시용 메모리 계층 생성 (상한은 환경변수로 조정)"""
+    return BoundedMemoryCache(
+        max_entries=int(os.getenv('CRAWL_MEMORY_CACHE_MAX_ENTRIES', 1000)),
+        max_bytes=int(float(os.getenv('CRAWL_MEMORY_CACHE_MAX_MB', 64)) * 1024 * 1024),
+        ttl_seconds=ttl_seconds
+    )
 
 class CrawlCacheService:
     def __init__(self):
-        self.cache_duration = timedelta(days=30)  # 1개월
-        self._memory_cache = {}  # 메모리 캐시
+        self.cache_duration = CRAWL_SOFT_TTL  # 1개월 (이후 stale)
+        self.hard_ttl = CRAWL_HARD_TTL
+        # 개수/바이트 상한 + TTL + LRU 메모리 캐시 (값: CachedPlaces)
+        self._memory_cache = create_crawl_memory_tier(self.hard_ttl.total_seconds())
     
-    def get_cached_data(self, search_key: str) -> List[Dict[str, Any]]:
-        """캐시된 크롤링 데이터 조회 (메모리 기반)"""
-        if search_key not in self._memory_cache:
-            return []
-        
-        cache_entry = self._memory_cache[search_key]
-        
-        # 만료 확인
-        if datetime.now() > cache_entry['expires_at']:
-            del self._memory_cache[search_key]
-            return []
-        
-        return cache_entry['data']
+    async def get_cached_data(self, search_key: str) -> List[Dict[str, Any]]:
+        """캐시된 크롤링 데이터 조회 (메모리 기반, 만료 항목은 미스)"""
+        return self._memory_cache.get(search_key, MISSING_ENTRY).places
     
-    def save_crawled_data(self, search_key: str, places_data: List[Dict[str, Any]]):
-        """크롤링 데이터를 캐시에 저장 (메모리 기반)"""
-        expires_at = datetime.now() + self.cache_duration
-        
-        # 캐시 데이터 정리
+    async def get_many(self, search_keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """여러 검색 키 일괄 조회 (미스는 빈 리스트)"""
+        entries = await self.get_many_entries(search_keys)
+        return {key: entry.places for key, entry in entries.items()}
+    
+    async def get_many_entries(self, search_keys: List[str]) -> Dict[str, CachedPlaces]:
+        """여러 검색 키 일괄 조회 (저장 시각 포함, stale 판단용)"""
+        return {key: self._memory_cache.get(key, MISSING_ENTRY) for key in search_keys}
+    
+    def _compact_places(self, places_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """캐시 데이터 정리"""
         cached_places = []
         for place in places_data:
             cached_place = {
@@ -46,40 +78,38 @@ class CrawlCacheService:
                 'blog_reviews': place.get('blog_reviews', [])
             }
             cached_places.append(cached_place)
+        return cached_places
+    
+    async def save_crawled_data(self, search_key: str, places_data: List[Dict[str, Any]]):
+        """크롤링 데이터를 캐시에 저장 (메모리 기반)"""
+        cached_places = self._compact_places(places_data)
         
-        self._memory_cache[search_key] = {
-            'data': cached_places,
-            'expires_at': expires_at,
-            'created_at': datetime.now()
-        }
+        self._memory_cache.set(search_key, CachedPlaces(cached_places, time.time()))
         
         print(f"💾 캐시 저장: {search_key} ({len(cached_places)}개 장소)")
     
+    async def set_many(self, mapping: Dict[str, List[Dict[str, Any]]]):
+        """여러 검색 키의 크롤링 데이터를 일괄 저장"""
+        for search_key, places_data in mapping.items():
+            await self.save_crawled_data(search_key, places_data)
+    
     def cleanup_expired_cache(self):
         """만료된 캐시 데이터 정리"""
-        expired_keys = []
-        current_time = datetime.now()
-        
-        for key, cache_entry in self._memory_cache.items():
-            if current_time > cache_entry['expires_at']:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self._memory_cache[key]
-        
-        return len(expired_keys)
+        return self._memory_cache.cleanup_expired()
     
     def generate_search_key(self, city: str, keyword: str) -> str:
         """검색 키 생성"""
         return f"{city}_{keyword}".lower().replace(' ', '_')
     
-    def get_cache_stats(self) -> Dict[str, Any]:
+    async def get_cache_stats(self) -> Dict[str, Any]:
         """캐시 통계 조회"""
         total_entries = len(self._memory_cache)
-        total_places = sum(len(entry['data']) for entry in self._memory_cache.values())
+        total_places = sum(len(entry.places) for entry in self._memory_cache.values())
         
         return {
+            'backend': 'memory',
             'total_cache_entries': total_entries,
             'total_cached_places': total_places,
-            'cache_keys': list(self._memory_cache.keys())
+            'cache_keys': self._memory_cache.keys(),
+            'memory_tier': self._memory_cache.get_stats()
         }
\ No newline at end of file
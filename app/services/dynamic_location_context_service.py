@@ -16,28 +16,24 @@ from app.services.naver_service import NaverService
 from app.services.google_maps_service import GoogleMapsService
 from app.services.openai_service import OpenAIService
 from app.services.blog_crawler_service import BlogCrawlerService
+from app.services.model_router import LOCATION_CONTEXT, get_model_router
+from app.services.openai_client import get_openai_client
 
 
 class DynamicLocationContextService:
     """동적 지역 컨텍스트 생성기"""
     
-    def __init__(self):
+    def __init__(self, openai_client=None):
         self.naver_service = NaverService()
         self.google_service = GoogleMapsService()
         self.blog_crawler = BlogCrawlerService()
-        # 순환 참조 방지: OpenAI 인스턴스는 필요시에만 생성
-        self._openai_service = None
+        # OpenAI 클라이언트는 필요시에만 조회 (기본: 프로세스 전역 공유 클라이언트)
+        self._openai_service = openai_client
     
     @property
     def openai_service(self):
-        """지연 로딩으로 OpenAI 서비스 초기화"""
-        if self._openai_service is None:
-            from openai import AsyncOpenAI
-            import os
-            api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                self._openai_service = AsyncOpenAI(api_key=api_key)
-        return self._openai_service
+        """공유 OpenAI 클라이언트 (API 키가 없으면 None)"""
+        return self._openai_service or get_openai_client()
     
     async def generate_location_context(
         self, 
@@ -194,7 +190,7 @@ class DynamicLocationContextService:
             return {}
     
     async def _infer_ai_characteristics(self, location_name: str) -> Dict[str, Any]:
-        """GPT-4로 지역 특성 추론"""
+        """AI로 지역 특성 추론 (location_context route)"""
         try:
             if not self.openai_service:
                 print(f"   ⚠️ OpenAI API 키 없음, AI 추론 스킵")
@@ -220,8 +216,10 @@ class DynamicLocationContextService:
 실제 정보만 제공하고, 확실하지 않으면 빈 배열로 응답하세요.
 """
             
-            response = await self.openai_service.chat.completions.create(
-                model="gpt-4",
+            # 지역 특성 분류는 빠른 모델 사용 (model_router의 location_context route)
+            response = await get_model_router().complete(
+                self.openai_service,
+                LOCATION_CONTEXT,
                 messages=[
                     {"role": "system", "content": "당신은 한국 지리 및 관광 전문가입니다."},
                     {"role": "user", "content": prompt}
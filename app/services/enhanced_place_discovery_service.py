@@ -2,7 +2,10 @@
 향상된 장소 발견 서비스 - 8단계 아키텍처 구현 + 지역 정밀도 향상
 """
 
-from typing import Dict, Any, List
+import asyncio
+import os
+import weakref
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from app.services.naver_service import NaverService
 from app.services.google_maps_service import GoogleMapsService
@@ -11,7 +14,7 @@ from app.services.weather_service import WeatherService
 from app.services.crawl_cache_service import CrawlCacheService
 # 🆕 Redis 캐시 우선 사용, 없으면 메모리 캐시 폴백
 try:
-    from app.services.redis_cache_service import RedisCacheService
+    from app.services.tiered_cache_service import get_tiered_crawl_cache
     USE_REDIS = True
 except ImportError:
     USE_REDIS = False
@@ -23,6 +26,34 @@ from app.services.hierarchical_location_extractor import HierarchicalLocationExt
 from app.services.context_aware_search_query_builder import ContextAwareSearchQueryBuilder
 from app.services.geographic_filter import GeographicFilter
 from app.services.local_context_db import LocalContextDB
+from app.services.single_flight import get_crawl_single_flight
+from app.services import pipeline_events
+from app.services.pipeline_events import PipelineEventBus
+from app.services.request_budget import (
+    STAGE_BLOG_CRAWL, STAGE_DISTRICTS, create_task_without_budget, current_budget, stage_min_seconds
+)
+
+# 🆕 진행 중인 stale 캐시 백그라운드 갱신 (검색 키 → Task, 프로세스 전역)
+_background_refreshes: Dict[str, asyncio.Task] = {}
+
+# 🆕 업스트림별 동시 요청 제한 (프로세스 전역 - 요청마다 서비스 인스턴스가 새로 생겨도 한도 공유)
+PROVIDER_CONCURRENCY = {
+    'google': ('GOOGLE_MAX_CONCURRENCY', 8),
+    'naver': ('NAVER_MAX_CONCURRENCY', 5),
+    'blog': ('BLOG_CRAWL_MAX_CONCURRENCY', 5),
+}
+_provider_semaphores = weakref.WeakKeyDictionary()  # 이벤트 루프 → {업스트림: Semaphore}
+
+
+def get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """업스트림별 공유 세마포어 (실행 중인 이벤트 루프에 처음 사용할 때 생성)"""
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        env_name, default = PROVIDER_CONCURRENCY[provider]
+        semaphore = semaphores[provider] = asyncio.Semaphore(int(os.getenv(env_name, default)))
+    return semaphore
+
 
 class EnhancedPlaceDiscoveryService:
     def __init__(self):
@@ -31,14 +62,17 @@ class EnhancedPlaceDiscoveryService:
         self.blog_crawler = BlogCrawlerService()
         self.weather_service = WeatherService()
         
-        # 🆕 Redis 우선 사용, 없으면 메모리 캐시
+        # 🆕 Redis 우선 사용 (워커 L1 메모리 + L2 Redis), 없으면 메모리 캐시
         if USE_REDIS:
-            self.cache_service = RedisCacheService()
-            print("🎯 Redis 캐시 서비스 사용")
+            self.cache_service = get_tiered_crawl_cache()
+            print("🎯 L1 메모리 + L2 Redis 캐시 서비스 사용")
         else:
             self.cache_service = CrawlCacheService()
             print("📦 메모리 캐시 서비스 사용 (폴백)")
         
+        # 🆕 동일 검색 키 동시 크롤링 병합 (프로세스 전역)
+        self.single_flight = get_crawl_single_flight(self.cache_service)
+        
         self.city_service = CityService()
         self.district_service = DistrictService()
         
@@ -48,7 +82,13 @@ class EnhancedPlaceDiscoveryService:
         self.geo_filter = GeographicFilter()
         self.local_context_db = LocalContextDB()  # 🆕 지역 맥락 DB
     
-    async def discover_places_with_weather(self, prompt: str, city: str, travel_dates: List[str]) -> Dict[str, Any]:
+    async def discover_places_with_weather(
+        self,
+        prompt: str,
+        city: str,
+        travel_dates: List[str],
+        events: Optional[PipelineEventBus] = None
+    ) -> Dict[str, Any]:
         """
         8단계 아키텍처 구현 + 지역 정밀도 향상
         
@@ -56,7 +96,9 @@ class EnhancedPlaceDiscoveryService:
         - 계층적 지역 추출 (시 > 구 > 동 > POI)
         - 컨텍스트 인지 검색 쿼리 생성
         - 지리적 필터링 (좌표 기반)
+        - 단계 완료 시 events로 이벤트 발행 (SSE/로그/지연 측정)
         """
+        events = events or PipelineEventBus()
         
         print(f"\n{'='*80}")
         print(f"🚀 향상된 장소 발견 시작")
@@ -65,6 +107,12 @@ class EnhancedPlaceDiscoveryService:
         # 🆕 Step 0: 계층적 지역 정보 추출 (비동기)
         print(f"\n📍 [Step 0] 계층적 지역 정보 추출")
         location_hierarchy = await self.location_extractor.extract_location_hierarchy(prompt)
+        await events.emit(
+            pipeline_events.LOCATION_EXTRACTED,
+            message=f"📍 지역 인식: {location_hierarchy.get('location_text') or location_hierarchy.get('city', city)}",
+            progress=10,
+            location_hierarchy=location_hierarchy
+        )
         
         # 🆕 Step 0.1: city 파라미터 오버라이드 (Auto인 경우)
         if city == "Auto" or not city:
@@ -74,121 +122,82 @@ class EnhancedPlaceDiscoveryService:
                 city = extracted_city
                 # location_hierarchy는 이미 올바른 좌표를 가지고 있음 (AI 학습 완료)
         
-        # 🆕 Step 0.5: 지역 맥락 정보 조회 (정적 DB + 동적 생성)
-        print(f"\n🏙️ [Step 0.5] 지역 맥락 DB 조회 또는 생성")
-        local_context = {}
+        # 🆕 Step 0.5 / Step 2는 Step 3와 독립적이므로 백그라운드로 먼저 시작
+        print(f"\n🏙️ [Step 0.5] 지역 맥락 DB 조회 또는 생성 (백그라운드)")
+        context_task = asyncio.create_task(self._resolve_local_context(location_hierarchy, prompt, events))
         
-        # 우선순위: neighborhood > district > city
-        target_location = location_hierarchy.get('neighborhood') or \
-                         location_hierarchy.get('district') or \
-                         location_hierarchy.get('city')
+        # 2. 날씨 정보 조회 (지정된 일자)
+        print(f"\n🌦️ [Step 2] 날씨 정보 조회 (백그라운드)")
+        weather_task = asyncio.create_task(self._get_weather_for_dates(city, travel_dates))
         
-        if target_location:
-            print(f"   🔍 타겟 지역: {target_location}")
+        try:
+            # 1. 프롬프트 분석 및 키워드 추출
+            print(f"\n🔑 [Step 1] 키워드 추출")
+            keywords = self._extract_keywords_from_prompt(prompt)
             
-            # 동적 컨텍스트 조회/생성 (비동기)
-            location_context = await self.local_context_db.get_or_create_context(target_location)
-            
-            if location_context:
-                # enrich_search_with_context 호출
-                local_context = self.local_context_db.enrich_search_with_context(
-                    location=target_location,
-                    user_request=prompt,
-                    time_context=location_hierarchy.get('context', {}).get('시간대', []),
-                    target_context=location_hierarchy.get('context', {}).get('타겟', [])
-                )
+            # 🆕 지역 맥락은 음식 키워드가 있을 때만 키워드를 확장하므로,
+            # 그 경우에만 Step 3 전에 맥락 결과를 기다림 (나머지는 Step 3와 겹쳐 실행)
+            local_context = None
+            if '맛집' in keywords or '음식' in keywords:
+                local_context = await context_task
                 
+                # 🆕 지역 맥락 기반 키워드 확장
                 if local_context.get('enriched'):
-                    print(f"   ✅ 지역 특성 매칭: {target_location}")
-                    print(f"   특성: {', '.join(local_context.get('location_characteristics', [])[:3])}")
-                    print(f"   추천 음식: {', '.join(local_context.get('recommended_cuisines', [])[:3])}")
-                    print(f"   가격대: {local_context.get('target_price_range')}")
-                    print(f"   분위기: {local_context.get('atmosphere')}")
-                else:
-                    print(f"   ℹ️ {target_location} 맥락 정보 사용 불가 (일반 검색)")
-            else:
-                print(f"   ⚠️ {target_location} 맥락 생성 실패 (일반 검색)")
-        
-        # 1. 프롬프트 분석 및 키워드 추출
-        print(f"\n🔑 [Step 1] 키워드 추출")
-        keywords = self._extract_keywords_from_prompt(prompt)
-        
-        # 🆕 지역 맥락 기반 키워드 확장
-        if local_context.get('enriched'):
-            # 추천 음식 종류를 키워드에 추가
-            if '맛집' in keywords or '음식' in keywords:
-                context_cuisines = local_context.get('recommended_cuisines', [])[:2]
-                for cuisine in context_cuisines:
-                    if cuisine not in keywords:
-                        keywords.append(cuisine)
-                        print(f"   🆕 맥락 기반 키워드 추가: {cuisine}")
-        
-        print(f"   최종 키워드: {keywords}")
-        
-        # 🆕 Step 1.5: 컨텍스트 인지 검색 쿼리 생성
-        print(f"\n🔍 [Step 1.5] 검색 쿼리 생성")
-        search_queries = self.query_builder.build_search_queries(location_hierarchy, keywords)
-        primary_queries = self.query_builder.get_primary_queries(search_queries, top_n=5)
-        
-        # 🆕 Step 1.8: 여행 일수에 따른 필요 장소 수 계산
-        days_count = len(travel_dates) if travel_dates else 1
-        if days_count == 1:
-            # 당일치기: 시간당 1-2개 × 8시간 = 8-16개
-            required_places = 16
-            places_per_keyword = 10
-        elif days_count == 2:
-            # 1박2일: 하루 8개 × 2일 = 16개 + 여유분 = 30개
-            required_places = 30
-            places_per_keyword = 15
-        elif days_count >= 3:
-            # 2박3일 이상: 하루 8개 × 일수 + 50% 여유
-            required_places = days_count * 8 * 1.5
-            places_per_keyword = 20
-        else:
-            required_places = 16
-            places_per_keyword = 10
-        
-        print(f"\n📊 여행 일수: {days_count}일, 필요 장소: {required_places}개 (키워드당 {places_per_keyword}개)")
-        
-        # 2. 날씨 정보 조회 (지정된 일자)
-        print(f"\n🌦️ [Step 2] 날씨 정보 조회")
-        weather_data = await self._get_weather_for_dates(city, travel_dates)
-        
-        # 3. 캐시 확인 후 크롤링 (중복 방지) - 🆕 정밀 검색 쿼리 사용
-        print(f"\n💾 [Step 3] 장소 데이터 수집 (캐시 + 크롤링)")
-        all_places = []
-        
-        # 기존 키워드 기반 검색 (🆕 장기 여행은 더 많이 크롤링)
-        for keyword in keywords:
-            search_key = self.cache_service.generate_search_key(city, keyword)
+                    # 추천 음식 종류를 키워드에 추가
+                    context_cuisines = local_context.get('recommended_cuisines', [])[:2]
+                    for cuisine in context_cuisines:
+                        if cuisine not in keywords:
+                            keywords.append(cuisine)
+                            print(f"   🆕 맥락 기반 키워드 추가: {cuisine}")
             
-            cached_places = self.cache_service.get_cached_data(search_key)
-            if cached_places:
-                print(f"   ✅ 캐시 사용: {search_key} ({len(cached_places)}개)")
-                all_places.extend(cached_places)
-            else:
-                print(f"   🔍 새 크롤링: {search_key} (요청: {places_per_keyword}개)")
-                new_places = await self._crawl_places_by_keyword(city, keyword, display=places_per_keyword)
-                if new_places:
-                    self.cache_service.save_crawled_data(search_key, new_places)
-                    all_places.extend(new_places)
-        
-        # 🆕 정밀 검색 쿼리 기반 추가 검색 (🆕 장기 여행은 더 많이)
-        query_count = 5 if days_count >= 2 else 3  # 1박2일 이상이면 쿼리 더 많이
-        for query_info in search_queries[:query_count]:
-            query = query_info['query']
-            search_key = self.cache_service.generate_search_key("", query)
+            print(f"   최종 키워드: {keywords}")
             
-            cached_places = self.cache_service.get_cached_data(search_key)
-            if cached_places:
-                print(f"   ✅ 캐시 사용 (정밀): {query} ({len(cached_places)}개)")
-                all_places.extend(cached_places)
+            # 🆕 Step 1.5: 컨텍스트 인지 검색 쿼리 생성
+            print(f"\n🔍 [Step 1.5] 검색 쿼리 생성")
+            search_queries = self.query_builder.build_search_queries(location_hierarchy, keywords)
+            primary_queries = self.query_builder.get_primary_queries(search_queries, top_n=5)
+            
+            # 🆕 Step 1.8: 여행 일수에 따른 필요 장소 수 계산
+            days_count = len(travel_dates) if travel_dates else 1
+            if days_count == 1:
+                # 당일치기: 시간당 1-2개 × 8시간 = 8-16개
+                required_places = 16
+                places_per_keyword = 10
+            elif days_count == 2:
+                # 1박2일: 하루 8개 × 2일 = 16개 + 여유분 = 30개
+                required_places = 30
+                places_per_keyword = 15
+            elif days_count >= 3:
+                # 2박3일 이상: 하루 8개 × 일수 + 50% 여유
+                required_places = days_count * 8 * 1.5
+                places_per_keyword = 20
             else:
-                print(f"   🔍 새 크롤링 (정밀): {query} (요청: {places_per_keyword}개)")
-                new_places = await self._crawl_places_by_precise_query(query, display=places_per_keyword)
-                if new_places:
-                    self.cache_service.save_crawled_data(search_key, new_places)
-                    all_places.extend(new_places)
+                required_places = 16
+                places_per_keyword = 10
+            
+            print(f"\n📊 여행 일수: {days_count}일, 필요 장소: {required_places}개 (키워드당 {places_per_keyword}개)")
+            
+            # 3. 캐시 확인 후 크롤링 (중복 방지) - 🆕 정밀 검색 쿼리 사용
+            print(f"\n💾 [Step 3] 장소 데이터 수집 (캐시 + 크롤링)")
+            
+            # 🆕 정밀 검색 쿼리 기반 추가 검색 (🆕 장기 여행은 더 많이)
+            query_count = 5 if days_count >= 2 else 3  # 1박2일 이상이면 쿼리 더 많이
+            cache_usage = {"cached": 0, "new_crawl": 0}
+            all_places = await self._collect_places(
+                city, keywords, search_queries[:query_count], places_per_keyword,
+                cache_usage=cache_usage,
+                events=events
+            )
+            
+            # Step 0.5 / Step 2 결과 합류
+            if local_context is None:
+                local_context = await context_task
+            weather_data = await weather_task
+        finally:
+            # 🆕 어느 단계에서 실패/취소되든 (CancelledError 포함) 끝나지 않은 백그라운드 작업 정리
+            for task in (context_task, weather_task):
+                if not task.done():
+                    task.cancel()
         
         print(f"   📊 총 수집된 장소: {len(all_places)}개")
         
@@ -218,6 +227,13 @@ class EnhancedPlaceDiscoveryService:
         )
         
         print(f"   ✅ 지리적 필터링 완료: {len(geo_filtered_places)}개")
+        await events.emit(
+            pipeline_events.GEO_FILTERED,
+            message=f"🗺️ 반경 내 장소 {len(geo_filtered_places)}개 (수집 {len(all_places)}개)",
+            progress=45,
+            collected=len(all_places),
+            filtered=len(geo_filtered_places)
+        )
         
         # 🆕 장소가 0개면 명확한 에러 메시지 반환 (디폴트 값 대신)
         if len(geo_filtered_places) == 0:
@@ -243,16 +259,23 @@ class EnhancedPlaceDiscoveryService:
         # 5. 장소 검증 (할루시네이션 제거)
         print(f"\n✅ [Step 5] 장소 검증")
         verified_places = await self._verify_recommended_places(ai_recommendations)
+        await events.emit(
+            pipeline_events.PLACES_VERIFIED,
+            message=f"✅ 검증된 장소 {len(verified_places)}개",
+            progress=50,
+            verified=len(verified_places)
+        )
         
         # 6. 최적 동선 계산
         print(f"\n🛣️ [Step 6] 최적 동선 계산")
         optimized_route = await self._calculate_optimal_route(verified_places, city)
         
-        # 7. 장기 여행시 구역별 세분화
+        # 7. 장기 여행시 구역별 세분화 (🆕 선택 단계: 시간 예산이 부족하면 건너뜀)
         if len(travel_dates) > 1:
             print(f"\n📅 [Step 7] 구역별 세분화 (다일 여행)")
-            district_recommendations = await self._get_district_recommendations(city, len(travel_dates))
-            optimized_route = self._merge_with_districts(optimized_route, district_recommendations)
+            if current_budget().allows(STAGE_DISTRICTS, stage_min_seconds(STAGE_DISTRICTS, 15)):
+                district_recommendations = await self._get_district_recommendations(city, len(travel_dates))
+                optimized_route = self._merge_with_districts(optimized_route, district_recommendations)
         
         print(f"\n{'='*80}")
         print(f"✨ 장소 발견 완료!")
@@ -270,9 +293,231 @@ class EnhancedPlaceDiscoveryService:
             "verified_places": verified_places,
             "optimized_route": optimized_route,
             "travel_dates": travel_dates,
-            "cache_usage": self._get_cache_stats(keywords, city)
+            "cache_usage": cache_usage
         }
     
+    async def _resolve_local_context(
+        self,
+        location_hierarchy: Dict[str, Any],
+        prompt: str,
+        events: Optional[PipelineEventBus] = None
+    ) -> Dict[str, Any]:
+        """Step 0.5: 지역 맥락 정보 조회 (정적 DB + 동적 생성)"""
+        local_context = {}
+        
+        # 우선순위: neighborhood > district > city
+        target_location = location_hierarchy.get('neighborhood') or \
+                         location_hierarchy.get('district') or \
+                         location_hierarchy.get('city')
+        
+        if target_location:
+            print(f"   🔍 타겟 지역: {target_location}")
+            
+            # 동적 컨텍스트 조회/생성 (비동기)
+            location_context = await self.local_context_db.get_or_create_context(target_location)
+            
+            if location_context:
+                # enrich_search_with_context 호출
+                local_context = self.local_context_db.enrich_search_with_context(
+                    location=target_location,
+                    user_request=prompt,
+                    time_context=location_hierarchy.get('context', {}).get('시간대', []),
+                    target_context=location_hierarchy.get('context', {}).get('타겟', [])
+                )
+                
+                if local_context.get('enriched'):
+                    print(f"   ✅ 지역 특성 매칭: {target_location}")
+                    print(f"   특성: {', '.join(local_context.get('location_characteristics', [])[:3])}")
+                    print(f"   추천 음식: {', '.join(local_context.get('recommended_cuisines', [])[:3])}")
+                    print(f"   가격대: {local_context.get('target_price_range')}")
+                    print(f"   분위기: {local_context.get('atmosphere')}")
+                else:
+                    print(f"   ℹ️ {target_location} 맥락 정보 사용 불가 (일반 검색)")
+            else:
+                print(f"   ⚠️ {target_location} 맥락 생성 실패 (일반 검색)")
+        
+        if events is not None:
+            await events.emit(
+                pipeline_events.CONTEXT_RESOLVED,
+                message=f"🏙️ 지역 맥락 {'적용' if local_context.get('enriched') else '없음 (일반 검색)'}",
+                progress=15,
+                enriched=bool(local_context.get('enriched'))
+            )
+        return local_context
+    
+    async def _collect_places(
+        self,
+        city: str,
+        keywords: List[str],
+        precise_queries: List[Dict[str, Any]],
+        places_per_keyword: int,
+        cache_usage: Optional[Dict[str, int]] = None,
+        events: Optional[PipelineEventBus] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        🆕 Step 3: 키워드 + 정밀 쿼리 장소 수집을 한 번의 배치로 처리
+        
+        1) 모든 검색 키의 캐시를 get_many 한 번으로 조회하고
+        2) 캐시 미스만 병렬로 크롤링한 뒤 set_many 한 번으로 저장하고
+        3) 키워드 → 정밀 쿼리 순서대로 병합합니다.
+        
+        soft TTL이 지난 캐시는 그대로 사용하고 백그라운드에서 다시 크롤링합니다.
+        cache_usage를 넘기면 키워드 키의 캐시 히트/미스를 조회 시점에 기록합니다.
+        events를 넘기면 검색 키마다 수집이 끝나는 즉시 query_crawled 이벤트를 발행합니다.
+        """
+        # (search_key, 크롤링 코루틴 팩토리, 로그 라벨) 목록 - 병합 순서를 결정
+        jobs = []
+        keyword_keys = set()
+        for keyword in keywords:
+            search_key = self.cache_service.generate_search_key(city, keyword)
+            keyword_keys.add(search_key)
+            jobs.append((
+                search_key,
+                lambda keyword=keyword: self._crawl_places_by_keyword(city, keyword, display=places_per_keyword),
+                search_key
+            ))
+        for query_info in precise_queries:
+            query = query_info['query']
+            search_key = self.cache_service.generate_search_key("", query)
+            jobs.append((
+                search_key,
+                lambda query=query: self._crawl_places_by_precise_query(query, display=places_per_keyword),
+                f"{query} (정밀)"
+            ))
+        
+        # 1) 캐시 일괄 조회 (MGET 1회)
+        unique_keys = list(dict.fromkeys(search_key for search_key, _, _ in jobs))
+        cached = await self.cache_service.get_many_entries(unique_keys)
+        
+        labels = {}
+        for search_key, _, label in jobs:
+            labels.setdefault(search_key, label)
+        progress = {'done': 0, 'total': len(unique_keys)}
+        
+        async def on_collected(search_key: str, places: List[Dict[str, Any]], source: str):
+            if events is None:
+                return
+            progress['done'] += 1
+            await events.emit(
+                pipeline_events.QUERY_CRAWLED,
+                message=f"🔍 '{labels[search_key]}' {len(places)}개 ({source})",
+                progress=20 + int(25 * progress['done'] / max(progress['total'], 1)),
+                search_key=search_key,
+                source=source,
+                count=len(places),
+                done=progress['done'],
+                total=progress['total']
+            )
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        crawl_jobs = {}
+        for search_key, crawl, label in jobs:
+            if search_key in results or search_key in crawl_jobs:
+                continue
+            entry = cached.get(search_key)
+            cached_places = entry.places if entry else []
+            if cache_usage is not None and search_key in keyword_keys:
+                cache_usage["cached" if cached_places else "new_crawl"] += 1
+            if cached_places:
+                results[search_key] = cached_places
+                if entry.is_stale():
+                    # 🆕 stale-while-revalidate: 지금은 기존 데이터 사용, 갱신은 백그라운드
+                    print(f"   ♻️ 오래된 캐시 사용 + 백그라운드 갱신: {label} ({len(cached_places)}개)")
+                    self._refresh_in_background(search_key, crawl)
+                    if cache_usage is not None and search_key in keyword_keys:
+                        cache_usage["stale"] = cache_usage.get("stale", 0) + 1
+                    await on_collected(search_key, cached_places, 'stale')
+                else:
+                    print(f"   ✅ 캐시 사용: {label} ({len(cached_places)}개)")
+                    await on_collected(search_key, cached_places, 'cache')
+            else:
+                print(f"   🔍 새 크롤링: {label} (요청: {places_per_keyword}개)")
+                crawl_jobs[search_key] = crawl
+        
+        # 2) 캐시 미스 병렬 크롤링 (🆕 같은 키를 크롤링 중인 다른 요청이 있으면 합류)
+        if crawl_jobs:
+            results.update(await self._crawl_and_store(crawl_jobs, on_collected))
+        
+        # 3) 원래 순서대로 병합
+        all_places = []
+        for search_key, _, _ in jobs:
+            all_places.extend(results.get(search_key, []))
+        
+        return all_places
+    
+    async def _crawl_and_store(self, crawl_jobs: Dict[str, Any], on_collected=None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        검색 키별 크롤링을 병렬 실행 (저장은 키마다 single-flight 안에서)
+        
+        on_collected(search_key, places, 'crawl')는 키마다 크롤링이 끝나는 즉시 호출됩니다.
+        """
+        async def crawl_one(search_key: str, crawl):
+            new_places = await self._crawl_single_flight(search_key, crawl)
+            if on_collected is not None:
+                await on_collected(search_key, new_places or [], 'crawl')
+            return new_places or []
+        
+        crawled = await asyncio.gather(*(
+            crawl_one(search_key, crawl)
+            for search_key, crawl in crawl_jobs.items()
+        ))
+        return dict(zip(crawl_jobs.keys(), crawled))
+    
+    def _refresh_in_background(self, search_key: str, crawl):
+        """
+        🆕 stale 캐시 백그라운드 갱신 (키당 하나만 실행)
+        
+        갱신이 실패해도 기존 캐시는 hard TTL까지 계속 사용됩니다.
+        응답 뒤에도 계속되는 작업이므로 요청의 시간 예산 없이 실행합니다.
+        """
+        task = _background_refreshes.get(search_key)
+        if task is not None and not task.done():
+            return
+        
+        async def refresh():
+            try:
+                results = await self._crawl_and_store({search_key: crawl})
+                print(f"   ♻️ 백그라운드 갱신 완료: {search_key} ({len(results.get(search_key, []))}개)")
+            except Exception as e:
+                print(f"   ⚠️ 백그라운드 갱신 실패: {search_key} ({e})")
+        
+        def forget(done_task):
+            if _background_refreshes.get(search_key) is done_task:
+                del _background_refreshes[search_key]
+        
+        task = create_task_without_budget(refresh())
+        _background_refreshes[search_key] = task
+        task.add_done_callback(forget)
+    
+    async def _crawl_single_flight(self, search_key: str, crawl) -> List[Dict[str, Any]]:
+        """
+        🆕 검색 키 단위 single-flight 크롤링
+        
+        동시에 같은 키를 요청한 호출자들은 하나의 크롤링 결과를 공유합니다.
+        결과는 작업이 끝나기 전에 캐시에 저장하므로, 작업이 끝난 직후 들어온 요청은 캐시에서 읽습니다.
+        """
+        async def crawl_and_save():
+            # 직전 요청이 방금 저장했을 수 있으므로 캐시 재확인
+            cached_places = await self.cache_service.get_cached_data(search_key)
+            if cached_places:
+                return cached_places
+            
+            new_places = await crawl()
+            if new_places:
+                if self.single_flight.shares_via_cache:
+                    # 워커 간 병합은 캐시 폴링으로 결과를 전달하므로 락 해제 전에 L1 + L2 저장
+                    await self.cache_service.save_crawled_data(search_key, new_places)
+                else:
+                    # L1(메모리)은 즉시 반영, L2 저장은 write-behind로 다른 키와 모아서 처리
+                    await self.cache_service.set_many({search_key: new_places})
+            return new_places
+        
+        return await self.single_flight.do(
+            search_key,
+            crawl_and_save,
+            load_cached=lambda: self.cache_service.get_cached_data(search_key)
+        )
+    
     async def _get_weather_for_dates(self, city: str, dates: List[str]) -> Dict[str, Any]:
         """지정된 일자들의 날씨 정보"""
         weather_code = self.city_service.get_weather_code(city)
@@ -292,36 +537,72 @@ class EnhancedPlaceDiscoveryService:
         # 네이버 검색 (🆕 display 파라미터 사용)
         naver_places = await self.naver_service.search_places(search_query, display=display)
         
-        enhanced_places = []
-        for place in naver_places:
-            place_name = place.get('name', '')
+        # ✅ 각 장소별로 개별 블로그 검색 (🆕 장소별 병렬 보강)
+        return await self._enrich_places(naver_places, blog_display=5, blog_url_count=3)
+    
+    async def _enrich_places(self, naver_places: List[Dict], blog_display: int, blog_url_count: int) -> List[Dict[str, Any]]:
+        """
+        🆕 네이버 장소 목록을 구글/블로그 정보로 병렬 보강
+        
+        장소별 작업은 동시에 실행하되 업스트림별 세마포어로 동시 요청 수를 제한합니다.
+        asyncio.gather는 입력 순서대로 결과를 돌려주므로 결과 순서는 네이버 검색 순서와 같습니다.
+        """
+        tasks = [
+            self._enrich_place(place, blog_display, blog_url_count)
+            for place in naver_places
+        ]
+        return list(await asyncio.gather(*tasks))
+    
+    async def _enrich_place(self, place: Dict[str, Any], blog_display: int, blog_url_count: int) -> Dict[str, Any]:
+        """단일 장소 보강: 구글 상세 + 블로그 후기 검색 + 블로그 본문 크롤링"""
+        place_name = place.get('name', '')
+        
+        async def fetch_google():
+            async with get_provider_semaphore('google'):
+                return await self.google_service.get_place_details(
+                    place_name, place.get('address', '')
+                )
+        
+        async def fetch_blogs():
+            async with get_provider_semaphore('naver'):
+                blog_reviews = await self.naver_service.search_blogs(f"{place_name} 후기", display=blog_display)
+            print(f"📝 {place_name}: 블로그 후기 {len(blog_reviews)}개 수집")
             
-            # 구글 정보 추가
-            google_details = await self.google_service.get_place_details(
-                place_name, place.get('address', '')
-            )
+            # 블로그 크롤링 (🆕 선택 단계: 시간 예산이 부족하면 후기 검색 결과만 사용)
+            if not blog_reviews:
+                return blog_reviews, [], False
+            budget = current_budget()
+            if not budget.allows(STAGE_BLOG_CRAWL, stage_min_seconds(STAGE_BLOG_CRAWL, 5)):
+                return blog_reviews, [], True
             
-            # ✅ 각 장소별로 개별 블로그 검색
-            blog_reviews = await self.naver_service.search_blogs(f"{place_name} 후기", display=5)
-            print(f"📝 {place_name}: 블로그 후기 {len(blog_reviews)}개 수집")
+            blog_urls = [blog.get('link') for blog in blog_reviews[:blog_url_count]]
             
-            # 블로그 크롤링
-            blog_contents = []
-            if blog_reviews:
-                blog_urls = [blog.get('link') for blog in blog_reviews[:3]]
-                blog_contents = await self.blog_crawler.get_multiple_blog_contents(blog_urls)
+            async def crawl_contents():
+                async with get_provider_semaphore('blog'):
+                    return await self.blog_crawler.get_multiple_blog_contents(blog_urls)
             
-            enhanced_place = {
-                **place,
-                'google_info': google_details,
-                'blog_reviews': blog_reviews,  # ✅ 장소별 개별 후기
-                'blog_contents': blog_contents,
-                'verified': bool(place.get('name') and google_details.get('name')),
-                'crawl_timestamp': datetime.now().isoformat()
-            }
-            enhanced_places.append(enhanced_place)
+            blog_contents = await budget.run(STAGE_BLOG_CRAWL, crawl_contents())
+            if blog_contents is None:
+                return blog_reviews, [], True
+            return blog_reviews, blog_contents, False
+        
+        # 구글 조회와 블로그 체인은 서로 독립적이므로 동시에 실행
+        google_details, (blog_reviews, blog_contents, blog_skipped) = await asyncio.gather(
+            fetch_google(), fetch_blogs()
+        )
         
-        return enhanced_places
+        enriched = {
+            **place,
+            'google_info': google_details,
+            'blog_reviews': blog_reviews,  # ✅ 장소별 개별 후기
+            'blog_contents': blog_contents,
+            'verified': bool(place.get('name') and google_details.get('name')),
+            'crawl_timestamp': datetime.now().isoformat()
+        }
+        if blog_skipped:
+            # 본문 크롤링만 건너뜀 - 캐시에는 본문 없이 네이버/구글 정보와 후기 목록만 저장되므로 그대로 캐시
+            enriched['blog_crawl_skipped'] = True
+        return enriched
     
     async def _ai_analyze_with_weather(self, places: List[Dict], weather_data: Dict, prompt: str) -> List[Dict]:
         """AI가 날씨를 고려하여 장소 분석 및 추천"""
@@ -413,17 +694,38 @@ class EnhancedPlaceDiscoveryService:
         return result
     
     async def _get_district_recommendations(self, city: str, days_count: int) -> Dict[str, List]:
-        """장기 여행시 구역별 세분화 추천"""
+        """
+        장기 여행시 구역별 세분화 추천
+        
+        🆕 시간 예산을 구역마다 확인하고, 부족하면 그때까지 수집한 구역만 반환합니다.
+        """
         districts = self.district_service.get_districts_by_city(city)
         recommendations = {}
+        budget = current_budget()
         
         for district_name, district_info in districts.items():
+            spare = budget.spare()
+            if spare is not None and spare < stage_min_seconds(STAGE_DISTRICTS, 15):
+                budget.truncate(
+                    STAGE_DISTRICTS,
+                    f"남은 예산 {spare:.1f}초",
+                    completed=len(recommendations),
+                    total=len(districts)
+                )
+                break
+            
             # 각 구역별로 관광지/맛집/호텔 크롤링
-            attractions = await self._crawl_places_by_keyword(city, f"{district_name} 관광지")
-            restaurants = await self._crawl_places_by_keyword(city, f"{district_name} 맛집")
+            crawled = await budget.run(STAGE_DISTRICTS, asyncio.gather(
+                self._crawl_places_by_keyword(city, f"{district_name} 관광지"),
+                self._crawl_places_by_keyword(city, f"{district_name} 맛집"),
+                *([self._crawl_places_by_keyword(city, f"{district_name} 호텔")] if days_count > 2 else [])
+            ))
+            if crawled is None:
+                break
+            attractions, restaurants = crawled[0], crawled[1]
             
             if days_count > 2:  # 2박 이상시 호텔 정보도 추가
-                hotels = await self._crawl_places_by_keyword(city, f"{district_name} 호텔")
+                hotels = crawled[2]
                 recommendations[district_name] = {
                     "attractions": attractions[:5],
                     "restaurants": restaurants[:5], 
@@ -477,18 +779,6 @@ class EnhancedPlaceDiscoveryService:
         
         return keywords if keywords else ['관광지', '맛집']
     
-    def _get_cache_stats(self, keywords: List[str], city: str) -> Dict:
-        """캐시 사용 통계"""
-        stats = {"cached": 0, "new_crawl": 0}
-        for keyword in keywords:
-            search_key = self.cache_service.generate_search_key(city, keyword)
-            cached_data = self.cache_service.get_cached_data(search_key)
-            if cached_data:
-                stats["cached"] += 1
-            else:
-                stats["new_crawl"] += 1
-        return stats
-    
     async def _crawl_places_by_precise_query(self, query: str, display: int = 15) -> List[Dict[str, Any]]:
         """
         🆕 정밀 검색 쿼리로 장소 크롤링
@@ -503,32 +793,5 @@ class EnhancedPlaceDiscoveryService:
         # 네이버 검색
         naver_places = await self.naver_service.search_places(query, display=display)
         
-        enhanced_places = []
-        for place in naver_places:
-            place_name = place.get('name', '')
-            
-            # 구글 정보 추가
-            google_details = await self.google_service.get_place_details(
-                place_name, place.get('address', '')
-            )
-            
-            # 블로그 검색 (개별)
-            blog_reviews = await self.naver_service.search_blogs(f"{place_name} 후기", display=3)
-            
-            # 블로그 크롤링
-            blog_contents = []
-            if blog_reviews:
-                blog_urls = [blog.get('link') for blog in blog_reviews[:2]]
-                blog_contents = await self.blog_crawler.get_multiple_blog_contents(blog_urls)
-            
-            enhanced_place = {
-                **place,
-                'google_info': google_details,
-                'blog_reviews': blog_reviews,
-                'blog_contents': blog_contents,
-                'verified': bool(place.get('name') and google_details.get('name')),
-                'crawl_timestamp': datetime.now().isoformat()
-            }
-            enhanced_places.append(enhanced_place)
-        
-        return enhanced_places
\ No newline at end of file
+        # 블로그 검색 (개별, 🆕 장소별 병렬 보강)
+        return await self._enrich_places(naver_places, blog_display=3, blog_url_count=2)
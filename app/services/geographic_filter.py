@@ -3,11 +3,123 @@
 
 좌표 기반으로 검색 결과를 필터링하여
 요청 지역 외의 장소를 제거합니다.
+
+장소 리스트에서 좌표/평점을 한 번만 열(column)로 뽑아 거리와 점수를 한꺼번에 계산합니다.
+- NumPy 설치 시: 벡터화된 haversine + 반경 마스크 + 종합 점수
+- 미설치 시 (또는 장소가 적을 때): 같은 공식을 파이썬 루프로 계산
+- 중심점 하나에 대한 반경 필터는 모든 장소를 한 번씩 읽어야 하므로 색인 없이 한 번에 계산합니다.
+  여러 지점에서 반복 조회할 때는 app.utils.spatial_index.SpatialIndex를 사용합니다.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from math import radians, sin, cos, sqrt, atan2
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from app.utils.spatial_index import EARTH_RADIUS_M
+
+EARTH_RADIUS_KM = EARTH_RADIUS_M / 1000
+
+# 이보다 적은 장소는 배열 변환 비용이 더 커서 파이썬 루프로 계산
+VECTORIZE_MIN_PLACES = 32
+
+
+def _use_numpy(size: int) -> bool:
+    return NUMPY_AVAILABLE and size >= VECTORIZE_MIN_PLACES
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_coordinates(place: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    장소 좌표 추출 (lat/lng → google_info → 네이버 mapx/mapy 순)
+    
+    문자열 좌표는 숫자로 변환하고, 변환할 수 없으면 None을 반환합니다.
+    """
+    google_info = place.get('google_info') or {}
+    lat = place.get('lat') or google_info.get('lat') or place.get('mapx')  # 네이버 API
+    lng = place.get('lng') or google_info.get('lng') or place.get('mapy')  # 네이버 API
+    
+    # 네이버 좌표 문자열 (카텍좌표 → WGS84, 현재는 그대로 사용)
+    if isinstance(lat, str):
+        lat = _to_float(lat)
+    if isinstance(lng, str):
+        lng = _to_float(lng)
+    return lat, lng
+
+
+def extract_rating(place: Dict[str, Any]) -> float:
+    """장소 평점 추출 (rating → google_info.rating, 없으면 0)"""
+    rating = place.get('rating') or (place.get('google_info') or {}).get('rating') or 0
+    return _to_float(rating) or 0.0
+
+
+def haversine_km(
+    center_lat: float,
+    center_lng: float,
+    lats: Sequence[float],
+    lngs: Sequence[float]
+) -> List[float]:
+    """중심점에서 여러 좌표까지의 대원 거리 (km, 입력 순서)"""
+    if _use_numpy(len(lats)):
+        lat1 = np.radians(center_lat)
+        lat2 = np.radians(np.asarray(lats, dtype=float))
+        dlat = lat2 - lat1
+        dlng = np.radians(np.asarray(lngs, dtype=float)) - np.radians(center_lng)
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+        return (EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).tolist()
+    
+    # 중심점 라디안 변환은 한 번만
+    lat1 = radians(center_lat)
+    lng1 = radians(center_lng)
+    cos_lat1 = cos(lat1)
+    distances = []
+    for lat, lng in zip(lats, lngs):
+        lat2 = radians(lat)
+        a = sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((radians(lng) - lng1) / 2) ** 2
+        distances.append(EARTH_RADIUS_KM * 2 * atan2(sqrt(a), sqrt(1 - a)))
+    return distances
+
+
+def distance_scores(distances: Sequence[float]) -> List[float]:
+    """거리 점수 (0~10점, 가장 먼 장소가 0점)"""
+    if not distances:
+        return []
+    if _use_numpy(len(distances)):
+        values = np.asarray(distances, dtype=float)
+        max_distance = values.max() or 1  # 0으로 나누기 방지
+        return (10 * (1 - values / max_distance)).tolist()
+    
+    max_distance = max(distances) or 1  # 0으로 나누기 방지
+    return [10 * (1 - distance / max_distance) for distance in distances]
+
+
+def combined_scores(
+    distance_score_values: Sequence[float],
+    ratings: Sequence[float],
+    distance_weight: float,
+    rating_weight: float
+) -> List[float]:
+    """거리 점수와 평점(0~10점으로 정규화)의 가중 합"""
+    if _use_numpy(len(ratings)):
+        rating_values = np.asarray(ratings, dtype=float)
+        normalized = np.where(rating_values > 0, rating_values / 5.0 * 10, 0.0)
+        return (np.asarray(distance_score_values, dtype=float) * distance_weight + normalized * rating_weight).tolist()
+    
+    return [
+        score * distance_weight + ((rating / 5.0) * 10 if rating > 0 else 0) * rating_weight
+        for score, rating in zip(distance_score_values, ratings)
+    ]
+
 
 class GeographicFilter:
     """좌표 기반 실시간 필터링"""
@@ -37,54 +149,26 @@ class GeographicFilter:
             print(f"⚠️ 중심 좌표가 없어 지리적 필터링을 건너뜁니다.")
             return places
         
-        filtered = []
-        excluded = []
-        
+        # 좌표 열 추출 (좌표가 없는 장소는 제외)
+        located = []
+        lats = []
+        lngs = []
         for place in places:
-            # 장소 좌표 추출 (여러 소스에서 시도)
-            place_lat = (
-                place.get('lat') or 
-                place.get('google_info', {}).get('lat') or
-                place.get('mapx')  # 네이버 API
-            )
-            place_lng = (
-                place.get('lng') or 
-                place.get('google_info', {}).get('lng') or
-                place.get('mapy')  # 네이버 API
-            )
-            
-            # 네이버 좌표 변환 (카텍좌표 → WGS84)
-            if isinstance(place_lat, str):
-                try:
-                    place_lat = self._convert_naver_coord(float(place_lat), 'lat')
-                except:
-                    place_lat = None
-            
-            if isinstance(place_lng, str):
-                try:
-                    place_lng = self._convert_naver_coord(float(place_lng), 'lng')
-                except:
-                    place_lng = None
-            
+            place_lat, place_lng = extract_coordinates(place)
             if not (place_lat and place_lng):
-                # 좌표가 없는 장소는 제외
                 print(f"   ⚠️ 좌표 없음: {place.get('name', 'Unknown')}")
                 continue
-            
-            # 거리 계산
-            distance = self._haversine_distance(
-                center_lat, center_lng, place_lat, place_lng
-            )
-            
-            # 반경 내 여부 확인
-            if distance <= radius_km:
-                place['distance_from_center_km'] = round(distance, 2)
-                place['within_requested_area'] = True
-                filtered.append(place)
-            else:
-                place['distance_from_center_km'] = round(distance, 2)
-                place['within_requested_area'] = False
-                excluded.append(place)
+            located.append(place)
+            lats.append(place_lat)
+            lngs.append(place_lng)
+        
+        # 거리 계산 + 반경 내 여부 확인 (한 번에)
+        filtered = []
+        excluded = []
+        for place, distance in zip(located, haversine_km(center_lat, center_lng, lats, lngs)):
+            place['distance_from_center_km'] = round(distance, 2)
+            place['within_requested_area'] = distance <= radius_km
+            (filtered if place['within_requested_area'] else excluded).append(place)
         
         # 로깅
         print(f"\n📍 지리적 필터링 결과 ({location_text}):")
@@ -115,25 +199,7 @@ class GeographicFilter:
         
         지구를 구로 가정하여 두 점 사이의 대원 거리(great-circle distance) 계산
         """
-        R = 6371  # 지구 반지름 (km)
-        
-        # 라디안 변환
-        lat1_rad = radians(lat1)
-        lng1_rad = radians(lng1)
-        lat2_rad = radians(lat2)
-        lng2_rad = radians(lng2)
-        
-        # 차이 계산
-        dlat = lat2_rad - lat1_rad
-        dlng = lng2_rad - lng1_rad
-        
-        # Haversine 공식
-        a = sin(dlat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlng/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        distance = R * c
-        
-        return distance
+        return haversine_km(lat1, lng1, [lat2], [lng2])[0]
     
     def _convert_naver_coord(self, coord: float, coord_type: str) -> float:
         """
@@ -155,20 +221,9 @@ class GeographicFilter:
         
         Score = 10 * (1 - distance / max_distance)
         """
-        if not places:
-            return places
-        
-        max_distance = max(p.get('distance_from_center_km', 0) for p in places)
-        
-        if max_distance == 0:
-            max_distance = 1  # 0으로 나누기 방지
-        
-        for place in places:
-            distance = place.get('distance_from_center_km', 0)
-            
-            # 거리 점수 (0~10점)
-            distance_score = 10 * (1 - distance / max_distance)
-            place['distance_score'] = round(distance_score, 2)
+        distances = [place.get('distance_from_center_km', 0) for place in places]
+        for place, score in zip(places, distance_scores(distances)):
+            place['distance_score'] = round(score, 2)
         
         return places
     
@@ -189,29 +244,14 @@ class GeographicFilter:
         Returns:
             재정렬된 장소 리스트
         """
-        # 거리 점수 추가
-        places = self.add_distance_scores(places)
+        # 거리/평점 열을 한 번만 추출해 거리 점수와 종합 점수를 함께 계산
+        distances = [place.get('distance_from_center_km', 0) for place in places]
+        ratings = [extract_rating(place) for place in places]
+        scores = [round(score, 2) for score in distance_scores(distances)]
+        finals = combined_scores(scores, ratings, distance_weight, rating_weight)
         
-        for place in places:
-            # 평점 추출 (여러 소스 시도)
-            rating = (
-                place.get('rating') or
-                place.get('google_info', {}).get('rating') or
-                0
-            )
-            
-            # 평점 정규화 (0~10점)
-            normalized_rating = (rating / 5.0) * 10 if rating > 0 else 0
-            
-            # 거리 점수
-            distance_score = place.get('distance_score', 5)
-            
-            # 종합 점수
-            final_score = (
-                distance_score * distance_weight +
-                normalized_rating * rating_weight
-            )
-            
+        for place, score, final_score in zip(places, scores, finals):
+            place['distance_score'] = score
             place['final_score'] = round(final_score, 2)
         
         # 종합 점수로 정렬
@@ -0,0 +1,117 @@
+"""
+공유 HTTP 클라이언트 레지스트리
+
+애플리케이션 수명 동안 하나의 aiohttp 세션(커넥션 풀)을 유지하여
+API 호출마다 DNS 조회/TLS 핸드셰이크를 반복하지 않도록 합니다.
+FastAPI lifespan에서 시작되고 종료 시 닫힙니다.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from app.services.ssl_helper import create_ssl_context
+
+
+class HttpClientRegistry:
+    """프로세스 전역 aiohttp 세션 관리자"""
+
+    def __init__(self):
+        # 커넥션 풀 설정 (환경변수로 조정 가능)
+        self.pool_limit = int(os.getenv('HTTP_POOL_LIMIT', 100))
+        self.pool_limit_per_host = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 20))
+        self.keepalive_timeout = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+        self.dns_cache_ttl = int(os.getenv('HTTP_DNS_CACHE_TTL', 300))
+
+        # 기본 타임아웃 (호출부에서 timeout=을 넘기면 그 값이 우선)
+        self.timeout_total = float(os.getenv('HTTP_TIMEOUT_TOTAL', 15))
+        self.timeout_connect = float(os.getenv('HTTP_TIMEOUT_CONNECT', 5))
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """커넥션 풀 + DNS 캐시 + keep-alive가 설정된 세션 생성"""
+        connector = aiohttp.TCPConnector(
+            ssl=create_ssl_context(),
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.timeout_total,
+            connect=self.timeout_connect
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        공유 세션 반환 (없거나 닫혔으면 생성)
+
+        이벤트 루프가 바뀐 경우(스크립트에서 asyncio.run 반복 호출 등)에는
+        이전 루프에 묶인 커넥터를 재사용할 수 없으므로 새로 만듭니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self._retire_session(self._session, self._loop)
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    @staticmethod
+    def _retire_session(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """
+        다른 이벤트 루프에 묶인 이전 세션 정리
+
+        그 루프가 (다른 스레드에서) 아직 돌고 있으면 그 루프에서 닫고,
+        이미 멈췄거나 닫혔으면 비동기 close를 실행할 수 없으므로 커넥터를 떼어 내고 기록합니다.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            print("🌐 이전 이벤트 루프의 HTTP 세션 종료 예약")
+            return
+        connector = session.connector
+        session.detach()
+        if connector is not None and not connector.closed:
+            connector.close()  # 전송 계층은 즉시 닫힘 (이전 루프의 대기 객체는 기다리지 않음)
+        print("⚠️ 이전 이벤트 루프의 HTTP 세션 폐기 (루프가 종료되어 커넥터만 정리)")
+
+    @asynccontextmanager
+    async def borrow(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """공유 세션을 빌려줌 (컨텍스트 종료 시 세션을 닫지 않음)"""
+        yield self.get_session()
+
+    async def startup(self):
+        """애플리케이션 시작 시 세션 생성"""
+        self.get_session()
+        print(f"🌐 공유 HTTP 풀 시작 (전체 {self.pool_limit}, 호스트당 {self.pool_limit_per_host})")
+
+    async def close(self):
+        """애플리케이션 종료 시 세션 및 커넥션 정리"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            print("🌐 공유 HTTP 풀 종료")
+        self._session = None
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 설정 및 상태"""
+        return {
+            'active': self._session is not None and not self._session.closed,
+            'pool_limit': self.pool_limit,
+            'pool_limit_per_host': self.pool_limit_per_host,
+            'keepalive_timeout': self.keepalive_timeout,
+            'dns_cache_ttl': self.dns_cache_ttl,
+            'timeout_total': self.timeout_total,
+            'timeout_connect': self.timeout_connect
+        }
+
+
+# 싱글톤 인스턴스
+http_client_registry = HttpClientRegistry()
@@ -19,13 +19,16 @@ import re
 from openai import AsyncOpenAI
 import os
 
+from app.services.model_router import LOCATION_INFO, get_model_router
+from app.services.openai_client import get_openai_client
+
 
 class IntelligentLocationResolver:
     """AI 기반 지능형 지역 해석기"""
     
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.client = AsyncOpenAI(api_key=api_key) if api_key else None
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # 공유 OpenAI 클라이언트 (API 키가 없으면 None)
+        self.client = client or get_openai_client()
         
         # 학습 캐시 (런타임 메모리)
         self.learned_locations = {}
@@ -146,8 +149,10 @@ class IntelligentLocationResolver:
 4. JSON만 출력 (설명 없이)
 """
             
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
+            # 지역 정보 추출은 빠른 모델 사용 (model_router의 location_info route)
+            response = await get_model_router().complete(
+                self.client,
+                LOCATION_INFO,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
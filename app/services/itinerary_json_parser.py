@@ -0,0 +1,235 @@
+"""
+일정 JSON 파서
+
+GPT 응답을 전부 json.loads 한 번에 의존하지 않고 단계적으로 복구합니다.
+
+1. 그대로 파싱 (complete)
+2. 코드 펜스, 주석(//, /* */, #), 끝 쉼표, 앞뒤 설명 문장 제거 후 파싱 (repaired)
+3. max_tokens로 잘린 응답은 닫힌 schedule 항목만 살려서 사용 (salvaged)
+
+ScheduleItemStreamParser는 스트리밍 중 schedule 항목이 닫히는 즉시 꺼내 주며,
+같은 파서로 잘린 응답의 부분 결과도 복구합니다.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# 파싱 결과 상태
+PARSE_COMPLETE = 'complete'
+PARSE_REPAIRED = 'repaired'
+PARSE_SALVAGED = 'salvaged'
+PARSE_FAILED = 'failed'
+
+# 배열 직전의 객체 키 ("schedule": [)
+_KEY_BEFORE_ARRAY = re.compile(r'"([^"\\]+)"\s*:\s*$')
+
+
+def clean_json_text(text: str) -> str:
+    """
+    JSON 앞뒤/사이의 잡음 제거
+    
+    - ```json 코드 펜스
+    - 문자열 밖의 // 주석, /* */ 주석, # 주석 (프롬프트 예시를 그대로 따라 쓴 경우)
+    - 닫는 괄호 앞의 끝 쉼표
+    """
+    text = text.strip()
+    if text.startswith('```'):
+        first_newline = text.find('\n')
+        text = text[first_newline + 1:] if first_newline >= 0 else ''
+        if text.rstrip().endswith('```'):
+            text = text.rstrip()[:-3]
+    
+    out: List[str] = []
+    in_string = False
+    escape = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif text.startswith('//', i) or ch == '#':
+            newline = text.find('\n', i)
+            i = len(text) if newline < 0 else newline
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        elif ch in '}]':
+            k = len(out) - 1
+            while k >= 0 and out[k].isspace():
+                k -= 1
+            if k >= 0 and out[k] == ',':
+                del out[k]
+            out.append(ch)
+        else:
+            out.append(ch)
+        i += 1
+    
+    return ''.join(out)
+
+
+def _loads_lenient(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(clean_json_text(text))
+
+
+class ScheduleItemStreamParser:
+    """
+    스트리밍 응답에서 완성된 schedule 항목을 순서대로 추출
+    
+    {"schedule": [ {...}, {...} ]} 구조에서 schedule 배열 안의 객체가 닫히는 즉시
+    해당 객체만 파싱합니다. 최상위가 배열인 응답도 항목 배열로 취급합니다.
+    문자열 안의 괄호와 문자열 밖의 주석은 무시합니다.
+    """
+    
+    def __init__(self, array_key: str = 'schedule'):
+        self.array_key = array_key
+        self.buffer = ""
+        self.items: List[Dict[str, Any]] = []
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._array_depth: Optional[int] = None  # schedule 배열이 열린 후의 스택 깊이
+        self._item_start: Optional[int] = None
+    
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """새 토큰을 추가하고 이번에 완성된 항목 목록 반환"""
+        self.buffer += text
+        items = []
+        
+        while self._pos < len(self.buffer):
+            ch = self.buffer[self._pos]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '/#':
+                # 주석은 끝(줄바꿈, */)이 도착할 때까지 대기
+                skip_to = self._comment_end(ch)
+                if skip_to is None:
+                    break
+                self._pos = skip_to
+                continue
+            elif ch in '{[':
+                if ch == '[' and self._array_depth is None and self._is_schedule_array():
+                    self._array_depth = len(self._stack) + 1
+                elif ch == '{' and self._array_depth is not None and len(self._stack) == self._array_depth:
+                    self._item_start = self._pos
+                self._stack.append(ch)
+            elif ch in '}]' and self._stack:
+                self._stack.pop()
+                if ch == '}' and self._item_start is not None and len(self._stack) == self._array_depth:
+                    try:
+                        item = _loads_lenient(self.buffer[self._item_start:self._pos + 1])
+                        if isinstance(item, dict):
+                            items.append(item)
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+            
+            self._pos += 1
+        
+        self.items.extend(items)
+        return items
+    
+    def _is_schedule_array(self) -> bool:
+        """지금 열리는 배열이 항목 배열인지 (최상위 배열 또는 최상위 객체의 schedule 키)"""
+        if not self._stack:
+            return True
+        if len(self._stack) != 1:
+            return False
+        match = _KEY_BEFORE_ARRAY.search(self.buffer, max(0, self._pos - 64), self._pos)
+        return bool(match) and match.group(1) == self.array_key
+    
+    def _comment_end(self, ch: str) -> Optional[int]:
+        """주석이면 주석 다음 위치, 주석이 아니면 현재 다음 위치, 판단 불가면 None"""
+        if ch == '/':
+            if self._pos + 1 >= len(self.buffer):
+                return None
+            next_ch = self.buffer[self._pos + 1]
+            if next_ch == '*':
+                end = self.buffer.find('*/', self._pos + 2)
+                return None if end < 0 else end + 2
+            if next_ch != '/':
+                return self._pos + 1
+        newline = self.buffer.find('\n', self._pos)
+        return None if newline < 0 else newline
+
+
+class ParsedItinerary(NamedTuple):
+    """일정 JSON 파싱 결과 (data는 {'schedule': [...], ...} 또는 None)"""
+    data: Optional[Dict[str, Any]]
+    status: str
+    
+    @property
+    def is_partial(self) -> bool:
+        return self.status == PARSE_SALVAGED
+
+
+def _as_itinerary(value: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, list):
+        return {'schedule': [item for item in value if isinstance(item, dict)]}
+    return None
+
+
+def parse_itinerary_json(content: Optional[str]) -> ParsedItinerary:
+    """
+    GPT 일정 응답 파싱 (그대로 → 정리 후 → 닫힌 항목만 복구)
+    
+    Returns:
+        ParsedItinerary(data, status) - 모두 실패하면 (None, 'failed')
+    """
+    if not content:
+        return ParsedItinerary(None, PARSE_FAILED)
+    
+    try:
+        data = _as_itinerary(json.loads(content))
+        if data is not None:
+            return ParsedItinerary(data, PARSE_COMPLETE)
+    except json.JSONDecodeError:
+        pass
+    
+    # 앞뒤 설명 문장 제거: 첫 여는 괄호 ~ 그에 맞는 마지막 닫는 괄호
+    cleaned = clean_json_text(content)
+    starts = [i for i in (cleaned.find('{'), cleaned.find('[')) if i >= 0]
+    if starts:
+        start = min(starts)
+        end = cleaned.rfind('}' if cleaned[start] == '{' else ']')
+        if end > start:
+            try:
+                data = _as_itinerary(json.loads(cleaned[start:end + 1]))
+                if data is not None:
+                    return ParsedItinerary(data, PARSE_REPAIRED)
+            except json.JSONDecodeError:
+                pass
+    
+    # 잘린 응답: 닫힌 schedule 항목만 사용
+    parser = ScheduleItemStreamParser()
+    parser.feed(content)
+    if parser.items:
+        return ParsedItinerary({'schedule': parser.items}, PARSE_SALVAGED)
+    
+    return ParsedItinerary(None, PARSE_FAILED)
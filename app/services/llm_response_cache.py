@@ -0,0 +1,155 @@
+"""
+LLM 응답 캐시
+
+같은 모델 + 같은 메시지 + 같은 파라미터로 요청한 chat completion 결과를 저장해
+반복/재시도 요청은 토큰 비용 없이 즉시 응답합니다.
+
+- 키: 모델명 + 정규화된 메시지 + 샘플링 파라미터의 SHA-256 (내용 주소 방식)
+- 저장소: Redis (REDIS_URL, 워커 간 공유) / 연결 불가 시 BoundedMemoryCache
+- TTL: LLM_CACHE_TTL_SECONDS (기본 24시간)
+- 우회: LLM_CACHE_ENABLED=false 로 전체 비활성화, 요청 단위로는 bypass=True
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.memory_cache import BoundedMemoryCache
+from app.services.redis_pool import get_redis_handle
+
+# 키 형식이 바뀌면 버전을 올려 기존 항목을 자연 만료시킴
+KEY_PREFIX = "llm:v1:"
+
+# 응답 내용에 영향을 주지 않는 파라미터 (키에서 제외)
+_NON_SEMANTIC_PARAMS = {'stream', 'timeout', 'user'}
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    메시지 정규화
+    
+    f-string 프롬프트의 들여쓰기/줄 끝 공백/줄바꿈 차이만 있는 요청이 같은 키가 되도록
+    각 줄의 끝 공백을 제거하고 CRLF를 LF로 통일합니다.
+    """
+    normalized = []
+    for message in messages:
+        content = str(message.get('content') or '').replace('\r\n', '\n')
+        content = '\n'.join(line.rstrip() for line in content.split('\n')).strip()
+        normalized.append({'role': message.get('role', 'user'), 'content': content})
+    return normalized
+
+
+def make_cache_key(model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> str:
+    """모델 + 정규화된 메시지 + 파라미터 → 캐시 키"""
+    semantic_params = {
+        key: value for key, value in (params or {}).items()
+        if key not in _NON_SEMANTIC_PARAMS and value is not None
+    }
+    canonical = json.dumps(
+        {'model': model, 'messages': normalize_messages(messages), 'params': semantic_params},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return KEY_PREFIX + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """chat completion 응답 캐시 (Redis + 메모리 폴백)"""
+    
+    def __init__(self):
+        self.enabled = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+        self.ttl_seconds = int(os.getenv('LLM_CACHE_TTL_SECONDS', 86400))
+        
+        self._redis = None
+        if os.getenv('LLM_CACHE_BACKEND', 'redis').lower() == 'redis':
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            self._redis = get_redis_handle(redis_url, decode_responses=True)
+        
+        self._memory = BoundedMemoryCache(
+            max_entries=int(os.getenv('LLM_CACHE_MEMORY_MAX_ENTRIES', 200)),
+            max_bytes=int(float(os.getenv('LLM_CACHE_MEMORY_MAX_MB', 16)) * 1024 * 1024),
+            ttl_seconds=self.ttl_seconds
+        )
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0, 'errors': 0}
+    
+    async def _redis_available(self) -> bool:
+        return self._redis is not None and await self._redis.is_available()
+    
+    async def get(self, key: str, bypass: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 응답 조회
+        
+        Returns:
+            {'content', 'model', 'usage', 'stored_at'} 또는 None (미스/비활성/우회)
+        """
+        if not self.enabled or bypass:
+            self.stats['bypassed'] += 1
+            return None
+        
+        entry = self._memory.get(key)
+        if entry is None and await self._redis_available():
+            try:
+                raw = await self._redis.client.get(key)
+                if raw:
+                    entry = json.loads(raw)
+                    self._memory.set(key, entry)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self._redis.mark_failed()
+                print(f"   ⚠️ LLM 캐시 조회 오류: {e}")
+        
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        
+        self.stats['hits'] += 1
+        return entry
+    
+    async def set(self, key: str, content: str, model: str, usage: Optional[Dict[str, Any]] = None):
+        """응답 저장 (빈 응답은 저장하지 않음)"""
+        if not self.enabled or not content:
+            return
+        
+        entry = {'content': content, 'model': model, 'usage': usage or {}, 'stored_at': time.time()}
+        self._memory.set(key, entry)
+        self.stats['stores'] += 1
+        
+        if await self._redis_available():
+            try:
+                await self._redis.client.setex(key, self.ttl_seconds, json.dumps(entry, ensure_ascii=False))
+            except Exception as e:
+                self.stats['errors'] += 1
+                self._redis.mark_failed()
+                print(f"   ⚠️ LLM 캐시 저장 오류: {e}")
+    
+    async def delete(self, key: str):
+        self._memory.delete(key)
+        if await self._redis_available():
+            try:
+                await self._redis.client.delete(key)
+            except Exception:
+                pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            'enabled': self.enabled,
+            'backend': 'redis' if self._redis is not None and self._redis.available else 'memory',
+            'ttl_seconds': self.ttl_seconds,
+            'hit_rate': round(self.stats['hits'] / total * 100, 2) if total else 0.0,
+            **self.stats,
+            'memory_tier': self._memory.get_stats()
+        }
+
+
+# 싱글톤 인스턴스 (워커 내 모든 요청이 메모리 계층 공유)
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+def get_llm_response_cache() -> LLMResponseCache:
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache()
+    return _llm_response_cache
@@ -0,0 +1,159 @@
+"""
+프로세스 내 메모리 캐시 계층
+
+개수/바이트 상한과 TTL이 있는 LRU 캐시입니다.
+오래 실행되는 워커에서 메모리 캐시가 끝없이 커지지 않도록
+CrawlCacheService와 RedisCacheService의 메모리 폴백이 사용합니다.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """값의 대략적인 바이트 크기 (JSON 직렬화 길이 기준)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return len(repr(value).encode('utf-8'))
+
+
+class BoundedMemoryCache:
+    """
+    개수/바이트 상한 + TTL + LRU 축출 메모리 캐시
+    
+    - 조회 시 만료된 항목은 제거하고 미스로 처리
+    - 저장 후 상한을 넘으면 가장 오래 사용되지 않은 항목부터 축출
+    - 히트율/축출 수/사용 바이트를 get_stats()로 제공
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof or estimate_size
+        
+        # key → (value, expires_at, size)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+    
+    def _is_expired(self, entry: tuple, now: Optional[float] = None) -> bool:
+        expires_at = entry[1]
+        return expires_at is not None and (now or time.monotonic()) > expires_at
+    
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """조회 (히트 시 최근 사용으로 갱신)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        if self._is_expired(entry):
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """저장 (상한 초과 시 LRU 축출)"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value)
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        # 단일 항목이 바이트 상한보다 크면 저장하지 않음
+        if self.max_bytes and size > self.max_bytes:
+            return
+        
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        self._evict()
+    
+    def delete(self, key: str) -> bool:
+        if key in self._entries:
+            self._remove(key)
+            return True
+        return False
+    
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+        return count
+    
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+    
+    def values(self) -> List[Any]:
+        """만료되지 않은 값 목록 (통계용, LRU 순서는 바꾸지 않음)"""
+        now = time.monotonic()
+        return [entry[0] for entry in self._entries.values() if not self._is_expired(entry, now)]
+    
+    def _evict(self):
+        """상한을 넘는 동안 가장 오래된 항목 축출 (만료 항목 우선)"""
+        if not self._over_limit():
+            return
+        
+        self.cleanup_expired()
+        while self._entries and self._over_limit():
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def _over_limit(self) -> bool:
+        return (self.max_entries and len(self._entries) > self.max_entries) or \
+               (self.max_bytes and self._bytes > self.max_bytes)
+    
+    def cleanup_expired(self) -> int:
+        """만료된 항목 일괄 제거"""
+        now = time.monotonic()
+        expired_keys = [key for key, entry in self._entries.items() if self._is_expired(entry, now)]
+        for key in expired_keys:
+            self._remove(key)
+        self.expirations += len(expired_keys)
+        return len(expired_keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """히트율, 축출 수, 사용 바이트 등"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 2) if total else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
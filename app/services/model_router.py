@@ -0,0 +1,214 @@
+"""
+OpenAI 모델 라우팅
+
+호출 용도(route)별로 모델/타임아웃/지연 SLO를 한 곳에서 관리합니다.
+
+- itinerary: 최종 일정 생성 (큰 모델)
+- location_info: 지역 정보 추출 (IntelligentLocationResolver, 빠른 모델)
+- location_context: 지역 특성 분류 (DynamicLocationContextService, 빠른 모델)
+
+각 route는 환경변수로 덮어쓸 수 있습니다.
+    LLM_ROUTE_<NAME>_MODEL, LLM_ROUTE_<NAME>_FALLBACK,
+    LLM_ROUTE_<NAME>_TIMEOUT (초), LLM_ROUTE_<NAME>_SLO_MS
+
+기본 모델이 SLO를 넘기거나 타임아웃되면 LLM_ROUTE_DEGRADE_SECONDS 동안
+대체(fallback) 모델로 전환하고, 이후 다시 기본 모델을 시도합니다.
+route별 호출 수, 토큰 사용량, 지연 시간을 get_stats()로 제공합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+ITINERARY = 'itinerary'
+LOCATION_INFO = 'location_info'
+LOCATION_CONTEXT = 'location_context'
+
+
+class ModelRoute(NamedTuple):
+    """route 설정"""
+    name: str
+    model: str
+    fallback_model: Optional[str]
+    timeout: float
+    slo_ms: float
+
+
+# 기본 설정: (모델, 대체 모델, 타임아웃 초, 지연 SLO ms)
+_DEFAULT_ROUTES = {
+    ITINERARY: ('gpt-4', 'gpt-4o-mini', 90.0, 40000),
+    LOCATION_INFO: ('gpt-4o-mini', 'gpt-3.5-turbo', 10.0, 4000),
+    LOCATION_CONTEXT: ('gpt-4o-mini', 'gpt-3.5-turbo', 10.0, 4000),
+}
+
+
+def _load_route(name: str) -> ModelRoute:
+    model, fallback, timeout, slo_ms = _DEFAULT_ROUTES.get(name, _DEFAULT_ROUTES[LOCATION_INFO])
+    prefix = f"LLM_ROUTE_{name.upper()}_"
+    fallback = os.getenv(prefix + 'FALLBACK', fallback or '')
+    return ModelRoute(
+        name=name,
+        model=os.getenv(prefix + 'MODEL', model),
+        fallback_model=fallback or None,
+        timeout=float(os.getenv(prefix + 'TIMEOUT', timeout)),
+        slo_ms=float(os.getenv(prefix + 'SLO_MS', slo_ms))
+    )
+
+
+class ModelRouter:
+    """route별 모델 선택 + SLO 기반 대체 모델 전환 + 토큰 집계"""
+    
+    def __init__(self):
+        self.degrade_seconds = float(os.getenv('LLM_ROUTE_DEGRADE_SECONDS', 60))
+        self._routes: Dict[str, ModelRoute] = {}
+        self._degraded_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+    
+    def route(self, name: str) -> ModelRoute:
+        if name not in self._routes:
+            self._routes[name] = _load_route(name)
+        return self._routes[name]
+    
+    def select_model(self, name: str) -> str:
+        """현재 사용할 모델 (기본 모델이 SLO 위반 상태면 대체 모델)"""
+        route = self.route(name)
+        if route.fallback_model and time.monotonic() < self._degraded_until.get(name, 0):
+            return route.fallback_model
+        return route.model
+    
+    def _route_stats(self, name: str) -> Dict[str, Any]:
+        if name not in self._stats:
+            self._stats[name] = {
+                'calls': 0, 'fallback_calls': 0, 'timeouts': 0, 'errors': 0,
+                'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0,
+                'latency_ms_total': 0.0, 'last_latency_ms': 0.0, 'models': {}
+            }
+        return self._stats[name]
+    
+    def record(
+        self,
+        name: str,
+        model: str,
+        latency_ms: float,
+        usage: Any = None,
+        timed_out: bool = False,
+        failed: bool = False
+    ):
+        """
+        호출 결과 기록
+        
+        기본 모델이 SLO를 넘겼거나 타임아웃되면 degrade_seconds 동안 대체 모델로 전환합니다.
+        """
+        route = self.route(name)
+        stats = self._route_stats(name)
+        stats['calls'] += 1
+        stats['models'][model] = stats['models'].get(model, 0) + 1
+        stats['latency_ms_total'] += latency_ms
+        stats['last_latency_ms'] = round(latency_ms, 1)
+        if model != route.model:
+            stats['fallback_calls'] += 1
+        if timed_out:
+            stats['timeouts'] += 1
+        elif failed:
+            stats['errors'] += 1
+        
+        if usage is not None:
+            for field in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+                value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, None)
+                stats[field] += value or 0
+        
+        if model == route.model and route.fallback_model and (timed_out or latency_ms > route.slo_ms):
+            self._degraded_until[name] = time.monotonic() + self.degrade_seconds
+            reason = "타임아웃" if timed_out else f"SLO 초과 ({latency_ms:.0f}ms > {route.slo_ms:.0f}ms)"
+            print(f"   🐢 {name} {model} {reason} → {self.degrade_seconds:.0f}초간 {route.fallback_model} 사용")
+    
+    def is_fallback(self, name: str, model: str) -> bool:
+        """route의 기본 모델이 아닌 모델인지 (대체 모델 응답 판별용)"""
+        return model != self.route(name).model
+    
+    async def complete(
+        self,
+        client,
+        name: str,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **params: Any
+    ):
+        """
+        route 설정으로 chat completion 호출 (비스트리밍)
+        
+        타임아웃 시 대체 모델이 있으면 대체 모델로 한 번 더 시도합니다.
+        model을 지정하면 select_model() 대신 그 모델로 시작합니다.
+        
+        Raises:
+            asyncio.TimeoutError: 대체 모델까지 타임아웃된 경우
+        """
+        response, _ = await self.complete_with_model(client, name, messages, model=model, **params)
+        return response
+    
+    async def complete_with_model(
+        self,
+        client,
+        name: str,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **params: Any
+    ) -> Tuple[Any, str]:
+        """
+        complete()와 같지만 (응답, 실제로 응답한 모델)을 반환
+        
+        타임아웃으로 대체 모델이 응답했을 수 있으므로, 응답을 모델별로 캐시하는 쪽은 이 값을 사용합니다.
+        """
+        route = self.route(name)
+        model = model or self.select_model(name)
+        
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(model=model, messages=messages, **params),
+                    timeout=route.timeout
+                )
+            except asyncio.TimeoutError:
+                self.record(name, model, (time.perf_counter() - started) * 1000, timed_out=True)
+                if model != route.fallback_model and route.fallback_model:
+                    print(f"   ⏱️ {name} {model} 타임아웃 ({route.timeout:g}초) → {route.fallback_model} 재시도")
+                    model = route.fallback_model
+                    continue
+                raise
+            except Exception:
+                self.record(name, model, (time.perf_counter() - started) * 1000, failed=True)
+                raise
+            
+            self.record(name, model, (time.perf_counter() - started) * 1000, usage=getattr(response, 'usage', None))
+            return response, model
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """route별 설정, 호출 수, 토큰 사용량, 평균 지연"""
+        now = time.monotonic()
+        result = {}
+        for name in set(_DEFAULT_ROUTES) | set(self._stats):
+            route = self.route(name)
+            stats = dict(self._route_stats(name))
+            latency_total = stats.pop('latency_ms_total')
+            stats['avg_latency_ms'] = round(latency_total / stats['calls'], 1) if stats['calls'] else 0.0
+            result[name] = {
+                'model': route.model,
+                'fallback_model': route.fallback_model,
+                'timeout': route.timeout,
+                'slo_ms': route.slo_ms,
+                'degraded': now < self._degraded_until.get(name, 0),
+                **stats
+            }
+        return result
+
+
+# 싱글톤 인스턴스 (프로세스 내 SLO 상태/토큰 집계 공유)
+_model_router: Optional[ModelRouter] = None
+
+def get_model_router() -> ModelRouter:
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter()
+    return _model_router
@@ -0,0 +1,221 @@
+"""
+공유 AsyncOpenAI 클라이언트
+
+요청마다 AsyncOpenAI(=httpx 커넥션 풀)를 새로 만들지 않고 프로세스 전역 클라이언트 하나를
+OpenAIService, IntelligentLocationResolver, DynamicLocationContextService가 함께 사용합니다.
+
+- 커넥션 풀: OPENAI_POOL_LIMIT / OPENAI_POOL_KEEPALIVE / OPENAI_KEEPALIVE_EXPIRY
+- 재시도: 429/5xx, 연결 오류 시 지터가 있는 지수 백오프 (Retry-After 헤더 우선)
+- 데드라인: 재시도를 포함한 요청 전체 시간 상한 (OPENAI_REQUEST_DEADLINE, request_deadline()으로 축소)
+
+재시도는 httpx 전송 계층에서 처리하므로 스트리밍/비스트리밍 호출 모두 적용되며,
+SDK 자체 재시도(max_retries)는 중복되지 않도록 끕니다.
+"""
+
+import asyncio
+import contextvars
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 현재 요청의 데드라인 (time.monotonic() 기준 절대 시각)
+_request_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    'openai_request_deadline', default=None
+)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    블록 안의 OpenAI 호출에 데드라인 적용 (기존 데드라인보다 짧을 때만)
+    
+    사용 예:
+        with request_deadline(20):
+            await client.chat.completions.create(...)
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _request_deadline.get()
+    token = _request_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+class _RetryingTransport(httpx.AsyncHTTPTransport):
+    """429/5xx/연결 오류를 지수 백오프 + 지터로 재시도하는 httpx 전송 계층"""
+    
+    def __init__(self, registry: "OpenAIClientRegistry", **kwargs: Any):
+        super().__init__(**kwargs)
+        self.registry = registry
+    
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Retry-After 헤더가 있으면 그 값, 없으면 full jitter 지수 백오프"""
+        if response is not None:
+            retry_after = response.headers.get('retry-after')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.registry.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.registry.backoff_max, self.registry.backoff_base * (2 ** attempt)))
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        registry = self.registry
+        deadline = time.monotonic() + registry.deadline
+        context_deadline = _request_deadline.get()
+        if context_deadline is not None:
+            deadline = min(deadline, context_deadline)
+        
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                registry.stats['deadline_exceeded'] += 1
+                raise httpx.TimeoutException("OpenAI 요청 데드라인 초과", request=request)
+            self._clamp_timeout(request, remaining)
+            
+            response = None
+            try:
+                response = await super().handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+                if attempt >= registry.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= registry.max_retries:
+                    return response
+            
+            delay = self._backoff(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                # 데드라인 안에 재시도할 수 없으면 마지막 결과를 그대로 전달
+                if response is not None:
+                    return response
+                registry.stats['deadline_exceeded'] += 1
+                raise httpx.TimeoutException("OpenAI 요청 데드라인 초과", request=request)
+            
+            if response is not None:
+                await response.aclose()
+            attempt += 1
+            registry.stats['retries'] += 1
+            status = response.status_code if response is not None else 'connect'
+            print(f"   🔁 OpenAI 재시도 {attempt}/{registry.max_retries} ({status}), {delay:.1f}초 대기")
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _clamp_timeout(request: httpx.Request, remaining: float):
+        """요청 타임아웃을 남은 데드라인 이하로 제한"""
+        timeout = dict(request.extensions.get('timeout') or {})
+        for key in ('connect', 'read', 'write', 'pool'):
+            current = timeout.get(key)
+            timeout[key] = remaining if current is None else min(current, remaining)
+        request.extensions['timeout'] = timeout
+
+
+class OpenAIClientRegistry:
+    """프로세스 전역 AsyncOpenAI 클라이언트 관리자"""
+    
+    def __init__(self):
+        # 커넥션 풀 설정 (환경변수로 조정 가능)
+        self.pool_limit = int(os.getenv('OPENAI_POOL_LIMIT', 50))
+        self.pool_keepalive = int(os.getenv('OPENAI_POOL_KEEPALIVE', 20))
+        self.keepalive_expiry = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', 60))
+        self.connect_timeout = float(os.getenv('OPENAI_CONNECT_TIMEOUT', 5))
+        
+        # 재시도/데드라인
+        self.max_retries = int(os.getenv('OPENAI_MAX_RETRIES', 3))
+        self.backoff_base = float(os.getenv('OPENAI_BACKOFF_BASE', 0.5))
+        self.backoff_max = float(os.getenv('OPENAI_BACKOFF_MAX', 8))
+        self.deadline = float(os.getenv('OPENAI_REQUEST_DEADLINE', 120))
+        
+        self.stats = {'clients_created': 0, 'retries': 0, 'deadline_exceeded': 0}
+        self._client: Optional[AsyncOpenAI] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _create_client(self, api_key: str) -> AsyncOpenAI:
+        """튜닝된 커넥션 풀 + 재시도 전송 계층을 가진 클라이언트 생성"""
+        limits = httpx.Limits(
+            max_connections=self.pool_limit,
+            max_keepalive_connections=self.pool_keepalive,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        http_client = httpx.AsyncClient(
+            transport=_RetryingTransport(self, limits=limits),
+            timeout=httpx.Timeout(self.deadline, connect=self.connect_timeout)
+        )
+        self.stats['clients_created'] += 1
+        return AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+    
+    def get_client(self) -> Optional[AsyncOpenAI]:
+        """
+        공유 클라이언트 반환 (OPENAI_API_KEY가 없으면 None)
+        
+        이벤트 루프가 바뀐 경우에는 이전 루프에 묶인 커넥션을 재사용할 수 없으므로 새로 만듭니다.
+        """
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._client is None or (loop is not None and self._loop is not None and self._loop is not loop):
+            if self._client is not None:
+                self._retire_client(self._client, self._loop)
+            self._client = self._create_client(api_key)
+            self._loop = loop
+        elif self._loop is None:
+            self._loop = loop
+        return self._client
+    
+    @staticmethod
+    def _retire_client(client: AsyncOpenAI, loop: Optional[asyncio.AbstractEventLoop]):
+        """
+        다른 이벤트 루프에 묶인 이전 클라이언트 정리
+        
+        그 루프가 (다른 스레드에서) 아직 돌고 있으면 그 루프에서 닫고,
+        이미 멈췄거나 닫혔으면 httpx 커넥션을 닫을 방법이 없으므로 참조만 버리고 기록합니다.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+            print("🤖 이전 이벤트 루프의 OpenAI 클라이언트 종료 예약")
+            return
+        print("⚠️ 이전 이벤트 루프의 OpenAI 클라이언트 폐기 (루프가 종료되어 커넥션을 닫지 못함)")
+    
+    async def close(self):
+        """애플리케이션 종료 시 커넥션 정리"""
+        if self._client is not None:
+            await self._client.close()
+            print("🤖 공유 OpenAI 클라이언트 종료")
+        self._client = None
+        self._loop = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 설정 및 재시도 통계"""
+        return {
+            'active': self._client is not None,
+            'pool_limit': self.pool_limit,
+            'pool_keepalive': self.pool_keepalive,
+            'max_retries': self.max_retries,
+            'deadline': self.deadline,
+            **self.stats
+        }
+
+
+# 싱글톤 인스턴스
+openai_client_registry = OpenAIClientRegistry()
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """공유 AsyncOpenAI 클라이언트 (API 키가 없으면 None)"""
+    return openai_client_registry.get_client()
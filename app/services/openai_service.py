@@ -6,7 +6,12 @@ GPT-4를 활용한 맞춤형 여행 계획 생성
 
 import os
 import json
-from typing import Dict, Any, List
+import time
+import asyncio
+import itertools
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from openai import AsyncOpenAI
 
 # 환경변수 로드
@@ -28,18 +33,49 @@ from app.services.city_service import CityService
 from app.services.district_service import DistrictService
 from app.services.enhanced_place_discovery_service import EnhancedPlaceDiscoveryService
 from app.services.place_category_service import PlaceCategoryService
+from app.services import pipeline_events
+from app.services.pipeline_events import PipelineEventBus
+from app.services.llm_response_cache import get_llm_response_cache, make_cache_key
+from app.services.itinerary_json_parser import (
+    PARSE_FAILED, ParsedItinerary, ScheduleItemStreamParser, parse_itinerary_json
+)
+from app.services.prompt_builder import SYSTEM, USER, PromptBuilder, compact_place_line
+from app.services.model_router import ITINERARY, get_model_router
+from app.services.openai_client import get_openai_client
+from app.services.place_matcher import MATCH_CONTAINED, MATCH_EXACT, MATCH_FUZZY, VerifiedPlaceMatcher, match_key
+
+
+# response_format={"type": "json_object"}을 지원하는 모델
+JSON_MODE_MODEL_PREFIXES = (
+    'gpt-4o', 'gpt-4.1', 'gpt-4-turbo', 'gpt-4-1106', 'gpt-4-0125',
+    'gpt-3.5-turbo-1106', 'gpt-3.5-turbo-0125', 'o1', 'o3', 'o4'
+)
+
 
 class OpenAIService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # 프로세스 전역 클라이언트 공유 (요청마다 커넥션 풀을 새로 만들지 않음)
+        self.client = client or get_openai_client()
+        if not self.client:
             print("Warning: OPENAI_API_KEY not found, using mock data")
-            self.client = None
-        else:
-            self.client = AsyncOpenAI(api_key=api_key)
     
-    async def generate_detailed_itinerary(self, prompt: str, trip_details: Dict[str, Any] = None) -> Dict[str, Any]:
-        """상세한 30분 단위 여행 일정 생성 (실제 장소 데이터 기반)"""
+    async def generate_detailed_itinerary(
+        self,
+        prompt: str,
+        trip_details: Dict[str, Any] = None,
+        events: Optional[PipelineEventBus] = None,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        상세한 30분 단위 여행 일정 생성 (실제 장소 데이터 기반)
+        
+        Args:
+            prompt: 자연어 여행 요청
+            trip_details: UI 설정값
+            events: 파이프라인 이벤트 버스 (구독자가 있으면 GPT 응답을 스트리밍하여 토큰/일정 항목도 전달)
+            bypass_cache: True면 LLM 응답 캐시를 건너뛰고 새로 생성
+        """
+        events = events or PipelineEventBus()
         
         if not self.client:
             return self._generate_mock_itinerary(prompt, trip_details)
@@ -65,8 +101,17 @@ class OpenAIService:
         print(f"📍 UI 설정 반영: {city}, {travel_style}, {start_time}~{end_time}")
         
         # 8단계 향상된 장소 발견 서비스 사용
+        await events.emit(pipeline_events.DISCOVERY_STARTED, message='🔍 장소 수집 및 검증 중...', progress=5)
         enhanced_discovery = EnhancedPlaceDiscoveryService()
-        discovered_data = await enhanced_discovery.discover_places_with_weather(prompt, city, travel_dates)
+        discovered_data = await enhanced_discovery.discover_places_with_weather(prompt, city, travel_dates, events=events)
+        await events.emit(
+            pipeline_events.PLACES_DISCOVERED,
+            message=f"✅ 장소 발견 완료 (검증 {len(discovered_data.get('verified_places', []))}개)",
+            progress=55,
+            total_places_found=discovered_data.get('total_places_found', 0),
+            verified_places=len(discovered_data.get('verified_places', [])),
+            cache_usage=discovered_data.get('cache_usage', {})
+        )
         
         # 2. 날씨 정보 조회
         weather_service = WeatherService()
@@ -136,8 +181,7 @@ class OpenAIService:
             city, travel_style, duration_hours, start_location_coords
         )
         
-        # 8단계 처리 결과를 기반으로 컨텍스트 생성
-        location_context = self._build_enhanced_context(discovered_data)
+        # 여행 스타일 가이드
         style_context = self._get_style_specific_context(travel_style)
         
         # 🆕 계층적 지역 정보 추출
@@ -157,7 +201,7 @@ class OpenAIService:
         context_atmosphere = local_context.get('atmosphere', '') if local_context.get('enriched') else ''
         context_best_for = ', '.join(local_context.get('best_for', [])[:2]) if local_context.get('enriched') else ''
         
-        # 🆕 여행 기간 계산 (system_prompt보다 먼저 계산!)
+        # 🆕 여행 기간 계산 (프롬프트 조립보다 먼저 계산!)
         start_date_val = trip_details.get('start_date') if trip_details else None
         end_date_val = trip_details.get('end_date') if trip_details else None
         
@@ -196,229 +240,461 @@ class OpenAIService:
         
         poi_text = f" (특히 {', '.join(requested_poi[:2])} 근처)" if requested_poi else ""
         
-        system_prompt = f"""
-당신은 한국 여행 전문가입니다. 사용자의 요청에 따라 30분 단위로 상세한 여행 일정을 생성해주세요.
-
-**🎯 지리적 제약 (CRITICAL - 가장 중요) 🎯**
-요청 지역: {geographic_constraint}{poi_text}
-중심 좌표: ({center_lat:.4f}, {center_lng:.4f})
-검색 반경: {search_radius_km}km 이내
-위치 정밀도: {location_hierarchy.get('location_specificity', 'medium')}
-
-{'**🏙️ 지역 특성 정보 (맥락 기반 추천) 🏙️**' if local_context.get('enriched') else ''}
-{f'지역 특성: {context_characteristics}' if context_characteristics else ''}
-{f'추천 음식: {context_cuisines}' if context_cuisines else ''}
-{f'분위기: {context_atmosphere}' if context_atmosphere else ''}
-{f'최적 용도: {context_best_for}' if context_best_for else ''}
-{f'가격대: {local_context.get("target_price_range")}' if local_context.get('enriched') else ''}
-
-**❌ 절대 금지 사항 (위반 시 응답 거부):**
-1. {geographic_constraint} 외 다른 지역 장소 추천 절대 금지
-   {f'예시: {requested_neighborhood} 요청 시, 다른 동 ({self._get_example_other_districts(requested_city, requested_district, requested_neighborhood)}) 추천 절대 금지' if requested_neighborhood else ''}
-   
-2. 반경 {search_radius_km}km 초과 장소 금지
-   모든 장소는 중심점 ({center_lat:.4f}, {center_lng:.4f})으로부터 {search_radius_km}km 이내여야 함
-   
-3. 다른 도시 장소 절대 금지
-   {requested_city} 외 다른 도시 (예: 강남/종로/홍대 등 {requested_city} 외 지역) 추천 금지
-
-**🚨 절대 규칙 - 할루시네이션 금지 🚨**
-1. **실제 존재하는 장소만**: 가상의 장소, 추측한 장소 절대 금지
-2. **검증된 장소만**: 유명한 체인점, 관광명소, 검증된 맛집만 추천
-3. **정확한 주소**: 구체적인 주소 (구/동까지 포함) 필수
-4. **중복 금지**: 같은 장소나 유사한 장소 중복 추천 절대 금지
-5. **불확실시 거부**: 확실하지 않으면 "해당 지역에 적합한 장소를 찾을 수 없습니다"라고 명시
-6. **지역 일치**: 요청 지역과 다른 지역 장소 추천 절대 금지
-7. **이동 거리 제한**: 연속된 장소 간 대중교통 이동시간이 20분을 초과하지 않도록 구성
-8. **검증된 장소만 사용**: 아래 제공된 검증된 장소 목록에서만 선택
-9. **좌표 확인**: 모든 장소의 좌표가 중심점으로부터 {search_radius_km}km 이내인지 확인
-10. **주소 확인**: 모든 장소의 주소에 '{geographic_constraint}'이 포함되어 있는지 확인
-
-**날씨 기반 추천 우선순위:**
-- 날씨: {weather_data['condition']}
-- 기온: {weather_data['temperature']}°C
-- 강수확률: {weather_data['rain_probability']}%
-- 추천: {weather_data['recommendation']}
-
-**여행 스타일 특화:**
-{style_context}
-
-**8단계 처리된 장소 데이터:**
-{location_context}
-
-**절대 규칙: 위 검증된 장소들만 사용하세요. 가상의 장소 절대 금지!**
-
-**응답 규칙:**
-- 🚨 **각 장소는 전체 {days_count}일 일정에서 단 1번만 등장** (중복 절대 금지)
-- 🚨 **1일차와 2일차는 완전히 다른 장소**들로 구성 (같은 장소 재방문 금지)
-- 실제 존재하는 장소만 포함
-- 불확실한 경우 "verified": false로 표시
-- 날씨에 맞는 실내/실외 활동 우선 선택
-- **이동 거리 제한**: 연속된 장소 간 대중교통 이동시간 20분 이내로 제한
-- **도시 제한 강화**: {city} 내 장소만 추천 (예: 대구 요청시 대구광역시 내 장소만)
-- **지역 검증**: 모든 추천 장소가 {city}에 실제 위치하는지 재확인
-- **일자별 체크**: 일정 생성 후 1일차와 2일차에 중복된 장소가 있는지 반드시 확인하고 제거
-
-응답 형식:
-{{
-  "schedule": [
-    {{
-      "time": "09:00",
-      "place_name": "실제 존재하는 고유한 장소명",
-      "activity": "구체적인 활동",
-      "address": "정확한 주소 (구/동 포함)",
-      "duration": "30분",
-      "description": "장소 설명",
-      "transportation": "구체적인 대중교통 정보",
-      "rating": 4.5,
-      "price": "예상 비용",
-      "lat": 37.5665,
-      "lng": 126.9780,
-      "verified": false
-    }}
-  ]
-}}
-"""
+        # 프롬프트 조립 (규칙 블록 1회, 검증된 장소는 한 줄 형식, 입력 토큰 예산 적용)
+        router = get_model_router()
+        model = router.select_model(ITINERARY)
         
-        # 날씨 기반 프롬프트 생성
-        weather_context = f"""
-현재 날씨 상황:
-- 날씨: {weather_data['condition']}
-- 기온: {weather_data['temperature']}°C (체감온도: {weather_data['feels_like']}°C)
-- 강수확률: {weather_data['rain_probability']}%
-- 바람: {weather_data['wind_speed']}m/s
-- 추천: {weather_data['recommendation']}
-
-**날씨 기반 활동 조정:**
-{"- 비가 올 가능성이 있으니 실내 활동 위주로 구성하세요" if weather_data['is_rainy'] else ""}
-{"- 맑은 날씨이니 야외 활동을 적극 포함하세요" if weather_data['is_sunny'] else ""}
-"""
+        other_districts_rule = ''
+        if requested_neighborhood:
+            other_districts = self._get_example_other_districts(requested_city, requested_district, requested_neighborhood)
+            other_districts_rule = f"\n예시: {requested_neighborhood} 요청 시, 다른 동 ({other_districts}) 추천 절대 금지"
+        
+        weather_adjustment = ''
+        if weather_data.get('is_rainy'):
+            weather_adjustment = "\n- 비가 올 가능성이 있으니 실내 활동 위주로 구성하세요"
+        elif weather_data.get('is_sunny'):
+            weather_adjustment = "\n- 맑은 날씨이니 야외 활동을 적극 포함하세요"
         
         # 날씨 기반 실시간 추천 로직
         weather_service = WeatherRecommendationService()
         weather_recommendations = weather_service.get_weather_based_recommendations(weather_data, forecast_data)
+        weather_forecast = discovered_data.get('weather_forecast', {})
         
-        # days_count는 이미 위에서 계산됨
-        
-        user_prompt = f"""
-다음 요청에 대해 **{days_count}일간의 일자별 상세 여행 일정**을 생성해주세요:
+        def build_prompt(place_lines: List[str], day: Optional[int] = None, day_date: Optional[str] = None):
+            """전체 일정(day=None) 또는 특정 일차 일정 프롬프트 → (messages, 토큰 보고서)"""
+            builder = PromptBuilder(model)
+            
+            builder.add(SYSTEM, 'role', "당신은 한국 여행 전문가입니다. 사용자의 요청에 따라 30분 단위로 상세한 여행 일정을 JSON으로 생성해주세요.")
+            
+            builder.add(SYSTEM, 'geography', f"""
+**🎯 지리적 제약 (CRITICAL - 가장 중요)**
+요청 지역: {geographic_constraint}{poi_text}
+중심 좌표: ({center_lat:.4f}, {center_lng:.4f}) / 검색 반경: {search_radius_km}km 이내 / 위치 정밀도: {location_hierarchy.get('location_specificity', 'medium')}{other_districts_rule}
+""")
+            
+            if local_context.get('enriched'):
+                builder.add(SYSTEM, 'local_context', f"""
+**🏙️ 지역 특성 정보 (맥락 기반 추천)**
+{f'지역 특성: {context_characteristics}' if context_characteristics else ''}
+{f'추천 음식: {context_cuisines}' if context_cuisines else ''}
+{f'분위기: {context_atmosphere}' if context_atmosphere else ''}
+{f'최적 용도: {context_best_for}' if context_best_for else ''}
+{f'가격대: {local_context.get("target_price_range")}' if local_context.get('target_price_range') else ''}
+""", priority=3)
+            
+            if day is None:
+                duplicate_rule = f"각 장소는 전체 {days_count}일 일정에서 단 1번만 등장 (다른 날 재방문 금지, 장소명/주소/좌표 모두 확인)"
+                day_rule = f"모든 항목에 day 필드 포함, 매일 {start_time}~{end_time}, 하루 4-6개 장소"
+            else:
+                duplicate_rule = "같은 장소를 두 번 넣지 말 것 (다른 일차는 별도 장소 목록으로 따로 생성됨)"
+                day_rule = f'모든 항목에 "day": {day}, "date": "{day_date}", {start_time}~{end_time}, 4-6개 장소'
+            builder.add(SYSTEM, 'rules', f"""
+**🚨 절대 규칙 (위반 시 응답 거부)**
+1. **지역**: 모든 장소는 {geographic_constraint} 내, 중심점에서 {search_radius_km}km 이내, 주소에 '{geographic_constraint}' 포함. {requested_city} 외 다른 도시/지역 금지
+2. **검증된 장소만**: 아래 검증된 장소 목록에서만 선택. 가상/추측 장소 금지, 불확실하면 "verified": false
+3. **중복 금지**: {duplicate_rule}
+4. **일자 구분**: {day_rule}
+5. **동선**: 연속된 장소 간 대중교통/도보 이동시간 20분 이내, 지역별 클러스터링
+6. **주소**: 구/동까지 포함한 정확한 주소
+7. **스타일/날씨**: {travel_style} 스타일에 맞는 장소 우선, 날씨에 맞는 실내/실외 활동 선택
+8. **출발지**: {start_location or '미설정'}에서 시작하는 동선
+""")
+            
+            builder.add(SYSTEM, 'style', f"**여행 스타일 특화:**\n{style_context}", priority=2)
+            
+            builder.add_lines(
+                SYSTEM, 'verified_places',
+                f"**{day}일차 전용 장소 목록 (이 목록에서만 선택, 이름 | 주소 | 평점 | 후기):**" if day else
+                "**검증된 장소 목록 (이름 | 주소 | 평점 | 후기):**",
+                place_lines,
+                priority=5,
+                min_lines=min(int(os.getenv('PROMPT_MIN_PLACES', 8)), len(place_lines))
+            )
+            
+            builder.add(SYSTEM, 'response_format', f"""
+**응답 형식 (JSON만 출력):**
+{{"schedule": [{{"day": {day or 1}, "date": "{day_date or start_date_val or '2025-01-01'}", "time": "09:00", "place_name": "목록의 장소명", "activity": "구체적 활동", "address": "정확한 주소", "duration": "90분", "description": "장소 설명", "transportation": "대중교통 정보", "rating": 4.5, "price": "예상 비용", "lat": 37.5665, "lng": 126.9780, "verified": true}}]}}
+""")
+            
+            request_line = f"다음 요청에 대해 **{days_count}일간의 일자별 상세 여행 일정**을 생성해주세요:" if day is None else \
+                f"다음 요청의 {days_count}일 여행 중 **{day}일차({day_date}) 상세 일정**만 생성해주세요:"
+            builder.add(USER, 'request', f"""
+{request_line}
 
 요청: {prompt}
 
-{weather_context}
-
-**날씨 기반 실시간 추천:**
-{weather_recommendations}
-
-**UI에서 설정한 여행 정보:**
-- 도시: {city}
-- 여행 스타일: {travel_style}
-- 시작일: {start_date_val or '오늘'}
-- 종료일: {end_date_val or '오늘'}
-- 매일 시작 시간: {start_time}
-- 매일 종료 시간: {end_time}
-- 출발지: {start_location or '미설정'}
-- 총 {days_count}일간 여행 (반드시 일자별로 구분해서 생성)
-
-**일정 생성 규칙:**
-1. **일자별 구분**: 각 날짜별로 독립적인 일정 구성 (반드시 day 필드 포함)
-2. **시간 준수**: 매일 {start_time}부터 {end_time}까지 일정 구성
-3. **스타일 반영**: {travel_style} 스타일에 맞는 장소 우선 선택
-4. **도시 제한 강화**: {city} 내 장소만 추천 (다른 도시 절대 금지)
-5. **출발지 고려**: {start_location or '미설정'}에서 시작하는 동선 구성
-6. **실제 장소만**: 가상 장소 절대 금지, 검증된 장소만 추천
-7. **🚨 중복 절대 금지 (CRITICAL) 🚨**: 
-   - 전체 {days_count}일 여행 기간 동안 같은 장소를 두 번 이상 방문하는 것 절대 금지
-   - 1일차에 방문한 장소는 2일차에 절대 포함하지 않음
-   - 예: 1일차에 "청도한우마을" 방문 → 2일차에 "청도한우마을" 재방문 절대 금지
-   - 각 장소는 전체 일정에서 단 1번만 등장해야 함
-   - 장소명, 주소, 좌표 모두 확인하여 중복 방지
-8. **현실적 동선**: 지역별 클러스터링으로 효율적 이동
-9. **이동시간 제한**: 연속된 장소 간 대중교통/도보 이동시간 20분 이내
-10. **지역 특화**: {city}의 유명한 구/동 지역 내에서만 장소 선택
-11. **지역 검증**: 모든 장소가 {city}에 실제 위치하는지 반드시 확인
-12. **일자별 다양성**: 1일차와 2일차는 완전히 다른 장소들로 구성 (중복 0개)
-
-**응답 형식 (중요):**
-반드시 각 일정에 "day" 필드를 포함하여 {days_count}일간 일정을 생성하세요.
-
-예시 ({days_count}일 여행):
-{{
-  "schedule": [
-    # 1일차 (4-6개 장소)
-    {{
-      "day": 1,
-      "date": "{start_date_val or '2025-01-01'}",
-      "time": "09:00",
-      "place_name": "A 장소",  // 고유한 장소
-      "activity": "구체적 활동",
-      "address": "정확한 주소",
-      "duration": "90분",
-      "description": "상세 설명",
-      "transportation": "대중교통 정보",
-      "rating": 4.5,
-      "price": "예상 비용",
-      "lat": 37.5665,
-      "lng": 126.9780
-    }},
-    {{
-      "day": 1,
-      "time": "11:00",
-      "place_name": "B 장소",  // A와 완전히 다른 장소
-      ...
-    }},
-    # 2일차 (4-6개 장소, 1일차와 완전히 다른 장소들)
-    {{
-      "day": 2,
-      "date": "{end_date_val or '2025-01-02'}",
-      "time": "09:00",
-      "place_name": "C 장소",  // A, B와 완전히 다른 새로운 장소
-      ...
-    }},
-    {{
-      "day": 2,
-      "time": "11:00",
-      "place_name": "D 장소",  // A, B, C와 완전히 다른 새로운 장소
-      ...
-    }}
-  ]
-}}
-
-🚨 **중복 체크리스트 (반드시 확인):**
-- [ ] 1일차 장소 목록: [A, B, ...]
-- [ ] 2일차 장소 목록: [C, D, ...]  
-- [ ] 중복 확인: A ≠ C, A ≠ D, B ≠ C, B ≠ D (모두 다름 ✅)
-- [ ] 전체 {days_count}일 일정에 같은 장소가 2번 이상 나오면 응답 거부!
-"""
-
-        try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+**여행 정보:** 도시 {city} / 스타일 {travel_style} / {start_date_val or '오늘'} ~ {end_date_val or '오늘'} ({days_count}일) / 매일 {start_time}~{end_time} / 출발지 {start_location or '미설정'}
+""")
             
-            content = response.choices[0].message.content
+            builder.add(USER, 'weather', f"""
+**현재 날씨:** {weather_data['condition']}, {weather_data['temperature']}°C (체감 {weather_data['feels_like']}°C), 강수확률 {weather_data['rain_probability']}%, 바람 {weather_data['wind_speed']}m/s
+- 추천: {weather_data['recommendation']}{weather_adjustment}
+""")
             
-            # JSON 파싱 시도
-            try:
-                ai_result = json.loads(content)
+            forecast = weather_forecast
+            if day is not None and day_date in weather_forecast:
+                forecast = {day_date: weather_forecast[day_date]}
+            if forecast:
+                forecast_lines = [
+                    f"- {date}: {weather.get('condition', '')}, {weather.get('temperature', '')}°C"
+                    for date, weather in forecast.items()
+                ]
+                builder.add(USER, 'forecast', "**날짜별 예보:**\n" + '\n'.join(forecast_lines), priority=4)
+            
+            builder.add(USER, 'weather_tips', f"**날씨 기반 실시간 추천:**\n{weather_recommendations}", priority=1)
+            
+            messages, report = builder.build()
+            label = f"{day}일차 " if day else ""
+            print(
+                f"🧮 {label}프롬프트 토큰: {report['total_tokens']}/{report['budget']} "
+                f"(system {report['system_tokens']}, user {report['user_tokens']}, {report['tokenizer']})"
+            )
+            if report['dropped_sections'] or report['trimmed_lines']:
+                print(f"   ✂️ 예산 맞춤: 제외 {report['dropped_sections']}, 축소 {report['trimmed_lines']}")
+            return messages, report
+        
+        # 2~4일 여행은 장소를 일차별로 나눠 일차마다 동시에 생성 (지연이 일수에 비례하지 않음)
+        candidate_places = discovered_data.get('verified_places', [])
+        day_pools = None
+        if self._parallel_days_enabled(days_count, len(candidate_places)):
+            day_pools = self._partition_places_by_day(candidate_places, days_count)
+            print(f"🔀 일차별 병렬 생성: {[len(pool) for pool in day_pools]}개 장소 풀")
+        
+        try:
+            params = {'temperature': 0.7, 'max_tokens': 2000, **self._json_mode_params(model)}
+            item_counter = itertools.count()
+            
+            if day_pools:
+                day_params = {**params, 'max_tokens': int(os.getenv('ITINERARY_DAY_MAX_TOKENS', 1000))}
+                day_prompts = [
+                    build_prompt(self._build_place_lines(pool), day, self._day_date(start_date_val, day))
+                    for day, pool in enumerate(day_pools, 1)
+                ]
+                prompt_report = {
+                    'total_tokens': sum(report['total_tokens'] for _, report in day_prompts),
+                    'per_day': [report for _, report in day_prompts]
+                }
+                await events.emit(
+                    pipeline_events.LLM_STARTED,
+                    message=f'🤖 AI 일정 생성 중... ({days_count}일 동시 생성)',
+                    progress=60,
+                    model=model,
+                    mode='per_day',
+                    prompt_tokens=prompt_report['total_tokens']
+                )
+                
+                results = await asyncio.gather(*[
+                    self._complete_itinerary(messages, model, day_params, events, bypass_cache, item_counter, day=day)
+                    for day, (messages, _) in enumerate(day_prompts, 1)
+                ], return_exceptions=True)
+                
+                structured_result, day_reports = self._merge_day_results(results, start_date_val)
+                if not structured_result['schedule']:
+                    print("⚠️ 일차별 생성 결과 없음 - 기본 일정 사용")
+                    return self._generate_mock_itinerary(prompt, trip_details, days_count)
+                
+                parse_status = 'per_day'
+                cache_info = {
+                    'hit': all(report.get('cached') for report in day_reports),
+                    'bypassed': bypass_cache,
+                    'keys': [report.get('cache_key') for report in day_reports]
+                }
+            else:
+                messages, prompt_report = build_prompt(self._build_place_lines(candidate_places))
+                await events.emit(
+                    pipeline_events.LLM_STARTED,
+                    message='🤖 AI 일정 생성 중...',
+                    progress=60,
+                    model=model,
+                    mode='single',
+                    prompt_tokens=prompt_report['total_tokens']
+                )
+                
+                parsed, cached, cache_key = await self._complete_itinerary(
+                    messages, model, params, events, bypass_cache, item_counter
+                )
+                if parsed.data is None:
+                    return self._generate_mock_itinerary(prompt, trip_details, days_count)
+                
                 # 일자별 일정 구조화
-                structured_result = self._structure_daily_itinerary(ai_result, days_count)
-                # 8단계 처리된 데이터로 결과 향상
-                return await self._enhance_with_8step_data(structured_result, discovered_data)
-            except json.JSONDecodeError:
-                return self._generate_mock_itinerary(prompt, trip_details, days_count)
+                structured_result = self._structure_daily_itinerary(parsed.data, days_count)
+                parse_status = parsed.status
+                day_reports = None
+                cache_info = {'hit': cached, 'bypassed': bypass_cache, 'key': cache_key}
+            
+            # 8단계 처리된 데이터로 결과 향상
+            await events.emit(
+                pipeline_events.LLM_FINISHED,
+                message='✅ 검증된 장소와 매칭 중...',
+                progress=85,
+                items=len(structured_result.get('schedule', []))
+            )
+            items_count = len(structured_result.get('schedule', []))
+            enhanced_result = await self._enhance_with_8step_data(structured_result, discovered_data)
+            enhanced_result['llm_cache'] = cache_info
+            enhanced_result['llm_output'] = {
+                'mode': 'per_day' if day_pools else 'single',
+                'parse_status': parse_status,
+                'model': model,
+                'json_mode': 'response_format' in params,
+                'items': items_count,
+                'prompt': prompt_report
+            }
+            if day_reports is not None:
+                enhanced_result['llm_output']['days'] = day_reports
+            return enhanced_result
                 
         except Exception as e:
             print(f"OpenAI API 오류: {str(e)}")
             return self._generate_mock_itinerary(prompt, trip_details)
     
-
+    async def _complete_itinerary(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        params: Dict[str, Any],
+        events: PipelineEventBus,
+        bypass_cache: bool = False,
+        item_counter: Optional[Iterator[int]] = None,
+        day: Optional[int] = None
+    ) -> Tuple[ParsedItinerary, bool, str]:
+        """
+        일정 completion 1회: 캐시 조회 → (스트리밍/일반) 생성 → 파싱 → 온전한 응답만 캐시
+        
+        캐시 키는 요청한 model 기준이므로, 대체 모델이 응답한 경우(타임아웃 재시도, SLO 위반 중 선택)는
+        캐시하지 않습니다. (기본 모델이 회복된 뒤에도 TTL 동안 대체 모델 응답이 재사용되지 않도록)
+        
+        Returns:
+            (파싱 결과, 캐시 히트 여부, 캐시 키)
+        """
+        llm_cache = get_llm_response_cache()
+        router = get_model_router()
+        cache_key = make_cache_key(model, messages, params)
+        cached = await llm_cache.get(cache_key, bypass=bypass_cache)
+        usage = None
+        answered_by = model
+        label = f"{day}일차 " if day else ""
+        
+        if cached:
+            print(f"⚡ {label}LLM 응답 캐시 히트: {cache_key[-12:]}")
+            content = cached['content']
+            if events.has_subscribers():
+                await self._replay_cached_completion(content, events, item_counter, day)
+        elif events.has_subscribers():
+            content, answered_by = await self._stream_itinerary_completion(messages, model, params, events, item_counter, day)
+        else:
+            response, answered_by = await router.complete_with_model(self.client, ITINERARY, messages, model=model, **params)
+            content = response.choices[0].message.content
+            if getattr(response, 'usage', None):
+                usage = response.usage.model_dump()
+        
+        # JSON 파싱 (주석/코드 펜스 정리, 잘린 응답은 닫힌 항목만 복구)
+        parsed = parse_itinerary_json(content)
+        if parsed.data is None:
+            print(f"⚠️ {label}AI 응답 JSON 파싱 실패")
+        elif parsed.is_partial:
+            print(f"⚠️ {label}AI 응답이 잘림 - 완성된 {len(parsed.data['schedule'])}개 항목만 사용")
+        elif not cached:
+            if router.is_fallback(ITINERARY, answered_by):
+                print(f"   ↪️ {label}대체 모델({answered_by}) 응답 - LLM 캐시 저장 생략")
+            else:
+                # 온전한 기본 모델 응답만 캐시 (잘린 응답이 재사용되지 않도록)
+                await llm_cache.set(cache_key, content, answered_by, usage)
+        
+        return parsed, bool(cached), cache_key
+    
+    @staticmethod
+    def _parallel_days_enabled(days_count: int, places_count: int) -> bool:
+        """
+        일차별 병렬 생성 사용 여부
+        
+        ITINERARY_PARALLEL_DAYS=auto(기본)면 2~ITINERARY_PARALLEL_MAX_DAYS(4)일 여행에서,
+        일차마다 ITINERARY_MIN_PLACES_PER_DAY개 이상 장소를 나눠 줄 수 있을 때 사용합니다.
+        """
+        mode = os.getenv('ITINERARY_PARALLEL_DAYS', 'auto').lower()
+        if mode == 'false' or days_count < 2:
+            return False
+        if places_count < days_count * int(os.getenv('ITINERARY_MIN_PLACES_PER_DAY', 4)):
+            return False
+        return mode == 'true' or days_count <= int(os.getenv('ITINERARY_PARALLEL_MAX_DAYS', 4))
+    
+    @staticmethod
+    def _partition_places_by_day(places: List[Dict[str, Any]], days_count: int) -> List[List[Dict[str, Any]]]:
+        """
+        검증된 장소를 일차별로 겹치지 않게 분할
+        
+        좌표가 있는 장소는 중심점 기준 방위각 순으로 잘라 일차마다 한 구역을 맡기고
+        (하루 동선이 모이도록), 좌표가 없는 장소는 가장 작은 풀에 채웁니다.
+        각 풀 안에서는 원래 순서(품질 우선순위)를 유지합니다.
+        """
+        order = {id(place): i for i, place in enumerate(places)}
+        located = [place for place in places if place.get('lat') and place.get('lng')]
+        unlocated = [place for place in places if not (place.get('lat') and place.get('lng'))]
+        pools: List[List[Dict[str, Any]]] = [[] for _ in range(days_count)]
+        
+        if located:
+            center_lat = sum(place['lat'] for place in located) / len(located)
+            center_lng = sum(place['lng'] for place in located) / len(located)
+            located.sort(key=lambda place: math.atan2(place['lat'] - center_lat, place['lng'] - center_lng))
+            per_day = math.ceil(len(located) / days_count)
+            for i, place in enumerate(located):
+                pools[min(i // per_day, days_count - 1)].append(place)
+        
+        for place in unlocated:
+            min(pools, key=len).append(place)
+        
+        for pool in pools:
+            pool.sort(key=lambda place: order[id(place)])
+        return pools
+    
+    @staticmethod
+    def _day_date(start_date_val: Optional[str], day: int) -> str:
+        """N일차 날짜 (시작일이 없으면 _structure_daily_itinerary와 같은 기본값)"""
+        if start_date_val:
+            try:
+                return (datetime.strptime(start_date_val, '%Y-%m-%d') + timedelta(days=day - 1)).strftime('%Y-%m-%d')
+            except ValueError:
+                pass
+        return f"2025-01-{day:02d}"
+    
+    @staticmethod
+    def _normalize_place_name(name: str) -> str:
+        return (name or '').lower().replace(' ', '').replace('-', '').replace('_', '')
+    
+    def _merge_day_results(
+        self,
+        results: List[Any],
+        start_date_val: Optional[str]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        일차별 결과 병합
+        
+        일차/날짜는 요청한 일차로 고정하고, 앞선 일차에 이미 나온 장소는 제외하여
+        (모델이 목록 밖 장소를 만든 경우 포함) 일차 간 중복이 없도록 합니다.
+        """
+        schedule: List[Dict[str, Any]] = []
+        day_reports: List[Dict[str, Any]] = []
+        seen = set()
+        
+        for day, result in enumerate(results, 1):
+            if isinstance(result, BaseException):
+                print(f"⚠️ {day}일차 생성 실패: {result}")
+                day_reports.append({'day': day, 'parse_status': PARSE_FAILED, 'cached': False, 'items': 0})
+                continue
+            
+            parsed, cached, cache_key = result
+            day_date = self._day_date(start_date_val, day)
+            kept = 0
+            for item in (parsed.data or {}).get('schedule', []):
+                if not isinstance(item, dict):
+                    continue
+                normalized_name = self._normalize_place_name(item.get('place_name', ''))
+                if not normalized_name or normalized_name in seen:
+                    continue
+                seen.add(normalized_name)
+                schedule.append({**item, 'day': day, 'date': day_date})
+                kept += 1
+            
+            day_reports.append({
+                'day': day,
+                'parse_status': parsed.status,
+                'cached': cached,
+                'items': kept,
+                'cache_key': cache_key
+            })
+        
+        return {'schedule': schedule}, day_reports
+    
+    @staticmethod
+    def _json_mode_params(model: str) -> Dict[str, Any]:
+        """
+        JSON 모드 요청 파라미터
+        
+        OPENAI_JSON_MODE=auto(기본)면 response_format을 지원하는 모델에서만 켭니다.
+        (gpt-4 기본 모델은 미지원 → 파서의 복구 단계에 의존)
+        """
+        mode = os.getenv('OPENAI_JSON_MODE', 'auto').lower()
+        if mode == 'false':
+            return {}
+        if mode == 'auto' and not model.startswith(JSON_MODE_MODEL_PREFIXES):
+            return {}
+        return {'response_format': {'type': 'json_object'}}
+    
+    async def _stream_itinerary_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        params: Dict[str, Any],
+        events: PipelineEventBus,
+        item_counter: Optional[Iterator[int]] = None,
+        day: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """
+        GPT 응답을 stream=True로 받아 토큰과 완성된 일정 항목을 즉시 전달
+        
+        itinerary route의 타임아웃을 전체 스트림에 적용하고, 마지막 청크의 usage로 토큰을 집계합니다.
+        일차별 동시 생성 시에는 item_counter를 공유해 항목 index가 겹치지 않게 하고 day를 함께 전달합니다.
+        스트림은 대체 모델로 재시도하지 않으므로 응답 모델은 항상 요청한 model입니다.
+        
+        Returns:
+            (전체 응답 문자열, 응답한 모델) - 문자열은 parse_itinerary_json으로 최종 파싱
+        """
+        router = get_model_router()
+        route = router.route(ITINERARY)
+        scanner = ScheduleItemStreamParser()
+        item_counter = item_counter or itertools.count()
+        usage = None
+        
+        async def consume():
+            nonlocal usage
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={'include_usage': True},
+                **params
+            )
+            async for chunk in stream:
+                if getattr(chunk, 'usage', None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                await events.emit(pipeline_events.LLM_TOKEN, text=delta, day=day)
+                for item in scanner.feed(delta):
+                    await events.emit(pipeline_events.ITEM_PARSED, index=next(item_counter), item=item, day=day)
+        
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(consume(), timeout=route.timeout)
+        except asyncio.TimeoutError:
+            router.record(ITINERARY, model, (time.perf_counter() - started) * 1000, usage=usage, timed_out=True)
+            # 이미 전달된 토큰이 있으므로 재시도하지 않고 받은 부분까지 사용 (잘린 응답 복구)
+            print(f"   ⏱️ 일정 스트리밍 타임아웃 ({route.timeout:g}초) - 받은 부분만 사용")
+            return scanner.buffer, model
+        except Exception:
+            router.record(ITINERARY, model, (time.perf_counter() - started) * 1000, failed=True)
+            raise
+        
+        router.record(ITINERARY, model, (time.perf_counter() - started) * 1000, usage=usage)
+        return scanner.buffer, model
+    
+    async def _replay_cached_completion(
+        self,
+        content: str,
+        events: PipelineEventBus,
+        item_counter: Optional[Iterator[int]] = None,
+        day: Optional[int] = None
+    ):
+        """캐시된 응답을 스트리밍 구독자에게 한 번에 전달 (토큰 + 일정 항목)"""
+        await events.emit(pipeline_events.LLM_TOKEN, text=content, day=day)
+        item_counter = item_counter or itertools.count()
+        scanner = ScheduleItemStreamParser()
+        for item in scanner.feed(content):
+            await events.emit(pipeline_events.ITEM_PARSED, index=next(item_counter), item=item, day=day)
     
     async def _enhance_with_real_data(self, ai_result: Dict[str, Any]) -> Dict[str, Any]:
         """AI 결과를 실제 API 데이터로 보강 및 검증 - 중복 제거 및 할루시네이션 방지"""
@@ -896,43 +1172,10 @@ class OpenAIService:
         
         return "다른 동"
     
-    def _build_enhanced_context(self, discovered_data: Dict[str, Any]) -> str:
-        """8단계 처리된 데이터를 AI 컨텍스트로 변환"""
-        verified_places = discovered_data.get('verified_places', [])
-        weather_forecast = discovered_data.get('weather_forecast', {})
-        cache_usage = discovered_data.get('cache_usage', {})
-        
-        if not verified_places:
-            return "검증된 장소가 없습니다."
-        
-        context = f"8단계 처리 결과:\n"
-        context += f"- 검증된 장소: {len(verified_places)}개\n"
-        context += f"- 캐시 활용: {cache_usage.get('cached', 0)}개, 신규 크롤링: {cache_usage.get('new_crawl', 0)}개\n"
-        
-        # 날씨 정보
-        if weather_forecast:
-            context += f"\n날씨 기반 필터링 적용됨:\n"
-            for date, weather in weather_forecast.items():
-                context += f"- {date}: {weather.get('condition', '')}, {weather.get('temperature', '')}°C\n"
-        
-        context += f"\n검증된 장소 목록:\n"
-        
-        for i, place in enumerate(verified_places[:15], 1):  # 최대 15개
-            name = place.get('name', '')
-            address = place.get('address', '')
-            verification_status = place.get('verification_status', 'unknown')
-            
-            context += f"{i}. {name} [검증: {verification_status}]\n"
-            context += f"   - 주소: {address}\n"
-            
-            # 블로그 후기 요약
-            blog_contents = place.get('blog_contents', [])
-            if blog_contents:
-                context += f"   - 후기: {blog_contents[0].get('summary', '')[:30]}...\n"
-            
-            context += "\n"
-        
-        return context
+    def _build_place_lines(self, verified_places: List[Dict[str, Any]]) -> List[str]:
+        """8단계 처리된 검증 장소(전체 또는 일차별 풀)를 프롬프트용 한 줄 형식으로 변환 (우선순위 순)"""
+        max_places = int(os.getenv('PROMPT_MAX_PLACES', 20))
+        return [compact_place_line(i, place) for i, place in enumerate(verified_places[:max_places], 1)]
     
     async def _enhance_with_8step_data(self, ai_result: Dict[str, Any], discovered_data: Dict[str, Any]) -> Dict[str, Any]:
         """8단계 처리된 데이터로 AI 결과 향상 + 중복 제거"""
@@ -946,27 +1189,28 @@ class OpenAIService:
             print(f"검증된 장소 목록: {[p.get('name', '?') for p in verified_places[:5]]}")
         print()
         
+        # 🆕 검증된 장소 색인을 한 번 만들고 항목별 최적 장소 배정 (처음 포함되는 장소가 아니라 점수 순)
+        schedule = ai_result.get('schedule', [])
+        matcher = VerifiedPlaceMatcher(verified_places)
+        assignments = matcher.assign(schedule)
+        match_stats = {MATCH_EXACT: 0, MATCH_CONTAINED: 0, MATCH_FUZZY: 0, 'unmatched': 0, 'skipped': 0}
+        
         # 🆕 사용된 장소 추적 (중복 방지)
-        used_places = set()  # 전체 기간 사용된 장소명
-        used_addresses = set()  # 전체 기간 사용된 주소
-        used_coords = []  # 사용된 좌표 [(lat, lng), ...]
+        used_places = set()  # 전체 기간 사용된 장소명 (정규화)
         
         # 🆕 일자별 사용 추적 (같은 날 중복 방지)
         used_today = {}  # {day: set([장소1, 장소2, ...])}
         
         # AI가 생성한 일정과 8단계 검증된 장소 매칭
-        for item in ai_result.get('schedule', []):
+        for item, match in zip(schedule, assignments):
             place_name = item.get('place_name', '')
             day = item.get('day', 1)
             
-            # 정규화 함수 (띄어쓰기 제거)
-            def normalize_name(name):
-                return name.lower().replace(' ', '').replace('-', '').replace('_', '')
-            
             # 🆕 전체 기간 중복 체크 (다일 여행)
-            normalized_place_name = normalize_name(place_name)
+            normalized_place_name = match_key(place_name)
             if normalized_place_name in used_places:
                 print(f"   ⚠️ 전체 중복 스킵: '{place_name}' ({day}일차, 이미 다른 날 사용됨)")
+                match_stats['skipped'] += 1
                 continue
             
             # 🆕 일내 중복 체크 (같은 날 2번 방문 방지)
@@ -975,34 +1219,24 @@ class OpenAIService:
             
             if normalized_place_name in used_today[day]:
                 print(f"   ⚠️ {day}일차 중복 스킵: '{place_name}' (같은 날 이미 방문)")
+                match_stats['skipped'] += 1
                 continue
             
-            # 검증된 장소에서 매칭되는 장소 찾기 (🆕 아직 사용되지 않은 장소만)
+            # 배정된 검증 장소 (같은 이름의 검증 장소가 이미 사용되었으면 미매칭 처리)
             matched_place = None
-            
-            for verified_place in verified_places:
-                verified_name = verified_place.get('name', '')
-                normalized_verified_name = normalize_name(verified_name)
-                
-                # 🆕 이미 사용된 장소면 스킵
-                if normalized_verified_name in used_places:
-                    continue
+            if match is not None and matcher.keys[match.place_index] not in used_places:
+                matched_place = verified_places[match.place_index]
+                verified_name = matched_place.get('name', '')
+                print(f"✅ 매칭 성공 ({match.kind} {match.similarity:.2f}): '{place_name}' ↔ '{verified_name}' ({day}일차)")
                 
-                # 정규화된 이름으로 비교
-                if normalized_place_name in normalized_verified_name or \
-                   normalized_verified_name in normalized_place_name:
-                    matched_place = verified_place
-                    print(f"✅ 매칭 성공: '{place_name}' ↔ '{verified_name}' ({day}일차)")
-                    
-                    # 🆕 사용됨으로 마킹 (전체 + 일자별)
-                    used_places.add(normalized_verified_name)
-                    used_today[day].add(normalized_verified_name)
-                    if verified_place.get('address'):
-                        used_addresses.add(verified_place['address'])
-                    break
+                # 🆕 사용됨으로 마킹 (전체 + 일자별)
+                used_places.add(matcher.keys[match.place_index])
+                used_today[day].add(matcher.keys[match.place_index])
+                match_stats[match.kind] += 1
             
             if not matched_place:
                 print(f"❌ 매칭 실패: '{place_name}' (검증된 장소 {len(verified_places)}개 중)")
+                match_stats['unmatched'] += 1
             
             if matched_place:
                 # 검증된 데이터로 아이템 향상
@@ -1031,6 +1265,7 @@ class OpenAIService:
         ai_result['processing_metadata'] = {
             'total_verified_places': len(verified_places),
             'matched_places': len([item for item in enhanced_schedule if item.get('verified')]),
+            'match_stats': match_stats,
             'cache_usage': discovered_data.get('cache_usage', {}),
             'weather_forecast': discovered_data.get('weather_forecast', {}),
             'optimized_route': discovered_data.get('optimized_route', {})
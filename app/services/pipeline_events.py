@@ -0,0 +1,95 @@
+"""
+파이프라인 단계 이벤트 버스
+
+장소 발견(discover_places_with_weather)부터 일정 생성(generate_detailed_itinerary),
+경로 계산까지 각 단계가 끝날 때마다 이벤트를 발행합니다.
+SSE 스트리밍, 로그, 단계별 지연 시간 측정 등이 같은 이벤트를 구독합니다.
+"""
+
+import inspect
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+# 이벤트 이름
+DISCOVERY_STARTED = 'discovery_started'
+LOCATION_EXTRACTED = 'location_extracted'
+CONTEXT_RESOLVED = 'context_resolved'
+QUERY_CRAWLED = 'query_crawled'
+GEO_FILTERED = 'geo_filtered'
+PLACES_VERIFIED = 'places_verified'
+PLACES_DISCOVERED = 'places_discovered'
+LLM_STARTED = 'llm_started'
+LLM_TOKEN = 'llm_token'
+ITEM_PARSED = 'item_parsed'
+LLM_FINISHED = 'llm_finished'
+ROUTE_COMPUTED = 'route_computed'
+
+# 구독자: (이벤트 이름, 데이터) → None 또는 코루틴
+EventHandler = Callable[[str, Dict[str, Any]], Union[None, Awaitable[None]]]
+
+# 단계 지연 측정에서 제외할 고빈도 이벤트
+_HIGH_FREQUENCY_EVENTS = {LLM_TOKEN, ITEM_PARSED, QUERY_CRAWLED}
+
+
+class PipelineEventBus:
+    """
+    요청 단위 이벤트 버스 (비동기 observer)
+    
+    - subscribe(handler)로 구독, emit(event, **data)로 발행
+    - 모든 이벤트에 elapsed_ms(요청 시작 후 경과 시간)를 붙여 전달
+    - 구독자 오류는 파이프라인을 멈추지 않고 로그만 남김
+    - 단계 이벤트의 최초 발생 시각을 기록하여 get_timings()로 제공
+    """
+    
+    def __init__(self, handlers: Optional[List[EventHandler]] = None):
+        self._handlers: List[EventHandler] = list(handlers or [])
+        self._started = time.perf_counter()
+        self._timings: Dict[str, float] = {}
+        
+        if os.getenv('PIPELINE_EVENT_LOG', 'false').lower() == 'true':
+            self._handlers.append(log_event)
+    
+    def subscribe(self, handler: EventHandler) -> EventHandler:
+        self._handlers.append(handler)
+        return handler
+    
+    def unsubscribe(self, handler: EventHandler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+    
+    def has_subscribers(self) -> bool:
+        return bool(self._handlers)
+    
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 1)
+    
+    async def emit(self, event: str, **data: Any):
+        """이벤트 발행 (구독자가 없으면 타이밍만 기록)"""
+        elapsed = self.elapsed_ms()
+        if event not in _HIGH_FREQUENCY_EVENTS and event not in self._timings:
+            self._timings[event] = elapsed
+        
+        if not self._handlers:
+            return
+        
+        payload = {**data, 'elapsed_ms': elapsed}
+        for handler in list(self._handlers):
+            try:
+                result = handler(event, payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"   ⚠️ 이벤트 구독자 오류 ({event}): {e}")
+    
+    def get_timings(self) -> Dict[str, float]:
+        """단계별 최초 발생 시각 (요청 시작 기준 ms)"""
+        return dict(self._timings)
+
+
+def log_event(event: str, data: Dict[str, Any]):
+    """로그 구독자 (PIPELINE_EVENT_LOG=true 시 자동 등록)"""
+    if event == LLM_TOKEN:
+        return
+    message = data.get('message', '')
+    print(f"   📡 [{data.get('elapsed_ms', 0):.0f}ms] {event} {message}")
@@ -0,0 +1,141 @@
+"""
+AI 일정 항목 ↔ 검증된 장소 매칭
+
+요청마다 검증된 장소 목록으로 색인을 한 번 만들고, AI가 생성한 일정 항목을 가장 잘 맞는
+검증 장소에 배정합니다 (목록 순서상 처음 포함되는 장소가 아니라 점수가 가장 높은 장소).
+
+- 정규화 이름 해시맵: 완전 일치 (유사도 1.0)
+- 토큰 역색인: 단어 토큰 + 정규화 이름의 글자 2-gram → 후보만 비교
+- 점수: 이름 유사도 (포함 관계 0.9, 그 외 편집 거리) + 길이 비율 + 좌표 거리 보정
+- 배정: 전체 (항목, 장소, 점수) 쌍을 점수 순으로 보며 겹치지 않게 배정
+  (점수가 같으면 일정상 앞선 항목 우선)
+"""
+
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from app.utils.similarity import calculate_coordinate_distance, normalize_place_name, similarity_many
+
+_TOKEN_SPLIT = re.compile(r'[^\w가-힣]+')
+
+# 매칭 종류
+MATCH_EXACT = 'exact'
+MATCH_CONTAINED = 'contained'
+MATCH_FUZZY = 'fuzzy'
+
+
+def match_key(name: str) -> str:
+    """매칭용 정규화 이름 (공백/특수문자/밑줄/지점명 접미사 제거)"""
+    return normalize_place_name(name or '').replace('_', '')
+
+
+def _tokens(name: str, key: str) -> Set[str]:
+    """역색인 토큰: 2글자 이상 단어 + 정규화 이름의 글자 2-gram"""
+    words = {word for word in _TOKEN_SPLIT.split((name or '').lower()) if len(word) >= 2}
+    grams = {key[i:i + 2] for i in range(len(key) - 1)}
+    return words | grams
+
+
+class PlaceMatch(NamedTuple):
+    """항목 하나의 매칭 결과"""
+    place_index: int
+    score: float
+    similarity: float
+    kind: str
+    distance_m: Optional[float]
+
+
+class VerifiedPlaceMatcher:
+    """검증된 장소 색인 + 최적 배정"""
+    
+    def __init__(self, verified_places: List[Dict[str, Any]]):
+        self.places = verified_places
+        self.min_similarity = float(os.getenv('PLACE_MATCH_MIN_SIMILARITY', 0.75))
+        self.max_distance_m = float(os.getenv('PLACE_MATCH_MAX_DISTANCE_M', 3000))
+        
+        self.keys: List[str] = [match_key(place.get('name', '')) for place in verified_places]
+        self._by_key: Dict[str, List[int]] = {}
+        self._token_index: Dict[str, Set[int]] = {}
+        for index, (place, key) in enumerate(zip(verified_places, self.keys)):
+            if not key:
+                continue
+            self._by_key.setdefault(key, []).append(index)
+            for token in _tokens(place.get('name', ''), key):
+                self._token_index.setdefault(token, set()).add(index)
+    
+    def _candidates(self, name: str, key: str) -> List[int]:
+        exact = self._by_key.get(key)
+        if exact:
+            return list(exact)
+        found: Set[int] = set()
+        for token in _tokens(name, key):
+            found |= self._token_index.get(token, set())
+        return sorted(found)
+    
+    def rank(self, item: Dict[str, Any]) -> List[PlaceMatch]:
+        """항목 하나에 대한 후보 점수 (높은 순, 기준 미달 제외)"""
+        name = item.get('place_name', '')
+        key = match_key(name)
+        if not key:
+            return []
+        
+        candidates = self._candidates(name, key)
+        similarities = similarity_many(key, [self.keys[index] for index in candidates], threshold=self.min_similarity)
+        item_lat, item_lng = item.get('lat'), item.get('lng')
+        
+        matches = []
+        for index, similarity in zip(candidates, similarities):
+            if similarity < self.min_similarity:
+                continue
+            place_key = self.keys[index]
+            if place_key == key:
+                kind = MATCH_EXACT
+            elif key in place_key or place_key in key:
+                kind = MATCH_CONTAINED
+            else:
+                kind = MATCH_FUZZY
+            
+            distance_m = None
+            place = self.places[index]
+            if item_lat and item_lng and place.get('lat') and place.get('lng'):
+                distance_m = calculate_coordinate_distance(item_lat, item_lng, place['lat'], place['lng'])
+                # 이름만 비슷하고 멀리 떨어진 장소는 다른 장소로 간주 (완전 일치 제외)
+                if kind != MATCH_EXACT and distance_m > self.max_distance_m:
+                    continue
+            
+            # 포함 관계는 길이가 비슷할수록, 좌표가 있으면 가까울수록 우선
+            length_ratio = min(len(key), len(place_key)) / max(len(key), len(place_key))
+            score = similarity + 0.05 * length_ratio
+            if distance_m is not None:
+                score -= 0.05 * min(distance_m / self.max_distance_m, 1.0)
+            matches.append(PlaceMatch(index, round(score, 6), similarity, kind, distance_m))
+        
+        matches.sort(key=lambda match: (-match.score, match.place_index))
+        return matches
+    
+    def assign(self, items: List[Dict[str, Any]]) -> List[Optional[PlaceMatch]]:
+        """
+        항목별 검증 장소 배정 (항목 순서대로 결과, 미배정은 None)
+        
+        한 검증 장소는 한 항목에만 배정됩니다.
+        """
+        pairs = []
+        seen_keys: Set[str] = set()
+        for item_index, item in enumerate(items):
+            key = match_key(item.get('place_name', ''))
+            # AI가 같은 장소를 반복한 항목은 앞선 항목만 배정 대상 (반복 항목이 다른 장소를 차지하지 않도록)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            for match in self.rank(item):
+                pairs.append((-match.score, item_index, match.place_index, match))
+        pairs.sort(key=lambda pair: pair[:3])
+        
+        assigned: List[Optional[PlaceMatch]] = [None] * len(items)
+        taken: Set[int] = set()
+        for _, item_index, place_index, match in pairs:
+            if assigned[item_index] is None and place_index not in taken:
+                assigned[item_index] = match
+                taken.add(place_index)
+        return assigned
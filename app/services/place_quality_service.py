@@ -6,6 +6,13 @@
 
 from typing import Dict, Any, List, Set, Tuple
 from app.utils.similarity import are_similar_places, are_same_location, normalize_place_name
+from app.utils.dedup_index import NgramIndex
+from app.utils.spatial_index import SpatialIndex
+
+# 중복 판정 기준
+NAME_SIMILARITY_THRESHOLD = 0.85
+ADDRESS_SIMILARITY_THRESHOLD = 0.9
+SAME_LOCATION_METERS = 50.0
 
 class PlaceQualityService:
     def __init__(self):
@@ -13,6 +20,10 @@ class PlaceQualityService:
         self.used_places: List[Dict[str, Any]] = []
         # 빠른 조회를 위한 정규화된 이름 세트
         self.normalized_names: Set[str] = set()
+        # 🆕 유사 후보 색인 (used_places의 인덱스를 저장)
+        self._name_index = NgramIndex(NAME_SIMILARITY_THRESHOLD)
+        self._address_index = NgramIndex(ADDRESS_SIMILARITY_THRESHOLD)
+        self._location_index = SpatialIndex(SAME_LOCATION_METERS)
     
     def verify_real_place(self, enhanced_item: Dict[str, Any]) -> bool:
         """실제 장소 존재 여부 확인"""
@@ -29,8 +40,11 @@ class PlaceQualityService:
         강화된 중복 장소 검사
         
         1. 정규화된 이름으로 빠른 조회
-        2. 문자열 유사도 검사
-        3. 좌표 기반 위치 검사
+        2. 이름 / 3. 주소 유사도 검사
+        4. 좌표 기반 위치 검사
+        
+        🆕 used_places 전체를 훑지 않고 색인(이름/주소 2-gram, 50m 격자)이 고른 후보만 비교합니다.
+        판정 결과는 전체 비교와 같습니다.
         """
         if not place_name:
             return False
@@ -41,27 +55,26 @@ class PlaceQualityService:
             print(f"🔍 중복 발견 (정규화 이름): {place_name}")
             return True
         
-        # 2. 기존 장소들과 유사도 비교
-        for used_place in self.used_places:
-            used_name = used_place.get('name', '')
-            used_address = used_place.get('address', '')
-            used_lat = used_place.get('lat')
-            used_lng = used_place.get('lng')
-            
-            # 이름 유사도 검사 (임계값: 0.85)
-            if are_similar_places(place_name, used_name, threshold=0.85):
+        # 2. 이름 유사도 검사 (임계값: 0.85) - 2-gram 색인이 고른 후보만 비교
+        for index in self._name_index.candidates(place_name):
+            used_name = self.used_places[index].get('name', '')
+            if are_similar_places(place_name, used_name, threshold=NAME_SIMILARITY_THRESHOLD):
                 print(f"🔍 중복 발견 (유사 이름): {place_name} ≈ {used_name}")
                 return True
-            
-            # 주소 유사도 검사
-            if address and used_address:
-                if are_similar_places(address, used_address, threshold=0.9):
+        
+        # 3. 주소 유사도 검사
+        if address:
+            for index in self._address_index.candidates(address):
+                used_address = self.used_places[index].get('address', '')
+                if are_similar_places(address, used_address, threshold=ADDRESS_SIMILARITY_THRESHOLD):
                     print(f"🔍 중복 발견 (유사 주소): {address} ≈ {used_address}")
                     return True
-            
-            # 좌표 기반 위치 검사 (50m 이내)
-            if lat and lng and used_lat and used_lng:
-                if are_same_location(lat, lng, used_lat, used_lng, threshold=50.0):
+        
+        # 4. 좌표 기반 위치 검사 (50m 이내) - 주변 격자 칸만 비교
+        if lat and lng:
+            for index in self._location_index.candidates(lat, lng, SAME_LOCATION_METERS):
+                used_place = self.used_places[index]
+                if are_same_location(lat, lng, used_place['lat'], used_place['lng'], threshold=SAME_LOCATION_METERS):
                     print(f"🔍 중복 발견 (같은 위치): {place_name} ({lat}, {lng})")
                     return True
         
@@ -69,12 +82,18 @@ class PlaceQualityService:
     
     def add_to_used(self, place_name: str, address: str, lat: float = None, lng: float = None):
         """사용된 장소 목록에 추가"""
+        index = len(self.used_places)
         self.used_places.append({
             'name': place_name,
             'address': address,
             'lat': lat,
             'lng': lng
         })
+        self._name_index.add(index, place_name)
+        if address:
+            self._address_index.add(index, address)
+        if lat and lng:
+            self._location_index.add(index, lat, lng)
         
         # 정규화된 이름도 추가
         normalized_name = normalize_place_name(place_name)
@@ -87,6 +106,9 @@ class PlaceQualityService:
         """사용된 장소 목록 초기화"""
         self.used_places.clear()
         self.normalized_names.clear()
+        self._name_index.clear()
+        self._address_index.clear()
+        self._location_index.clear()
     
     def get_used_count(self) -> int:
         """사용된 장소 수 반환"""
@@ -0,0 +1,349 @@
+"""
+여행 계획 백그라운드 작업 (job) 서비스
+
+HTTP 요청 안에서 수십 초 동안 계획을 생성하지 않고,
+요청은 작업을 큐에 넣고 바로 job_id를 돌려받은 뒤 상태를 폴링하거나 SSE로 구독합니다.
+
+- 큐: 크기 제한이 있는 asyncio.Queue (PLAN_JOB_QUEUE_SIZE) → 가득 차면 JobQueueFullError (503)
+- 워커: PLAN_JOB_WORKERS개 (동시에 생성하는 계획 수 = 요청 동시성과 분리)
+- 저장소: 메모리 + Redis (REDIS_URL, 다른 워커 프로세스에서도 조회 가능)
+  대기/실행 중인 작업은 축출되지 않는 dict에, 끝난 작업만 BoundedMemoryCache에 보관
+- 보관: PLAN_JOB_TTL_SECONDS (기본 1시간)
+
+작업 상태: queued → running → succeeded / failed
+진행 이벤트는 작업별 목록에 순서대로 쌓이고 (0부터 시작하는 id), 클라이언트는 마지막으로 받은
+id 이후만 다시 요청할 수 있습니다 (SSE 재연결 시 Last-Event-ID).
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.services import pipeline_events
+from app.services.memory_cache import BoundedMemoryCache
+from app.services.pipeline_events import PipelineEventBus
+from app.services.redis_pool import get_redis_handle
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+TERMINAL_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+KEY_PREFIX = "plan_job:v1:"
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업이 큐 상한에 도달 (클라이언트는 잠시 후 재시도)"""
+    pass
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class PlanJobStore:
+    """
+    작업 상태/결과/진행 이벤트 저장소 (메모리 + Redis)
+    
+    쓰기는 양쪽에 모두 하고, 읽기는 메모리(작업을 실행 중인 프로세스) → Redis 순으로 조회합니다.
+    Redis를 쓸 수 없으면 메모리만 사용합니다 (단일 프로세스 배포).
+    """
+    
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or int(os.getenv('PLAN_JOB_TTL_SECONDS', 3600))
+        self.poll_interval = float(os.getenv('PLAN_JOB_POLL_INTERVAL', 0.5))
+        
+        self._redis = None
+        if os.getenv('PLAN_JOB_BACKEND', 'redis').lower() == 'redis':
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            self._redis = get_redis_handle(redis_url, decode_responses=True)
+        
+        # 대기/실행 중인 작업: job_id → {'record': {...}, 'events': [...]}
+        # (이벤트 id가 Redis 목록과 어긋나지 않도록 LRU 축출 대상에서 제외, 큐 크기 + 워커 수로 제한됨)
+        self._active: Dict[str, Dict[str, Any]] = {}
+        # 끝난 작업 (더 이상 바뀌지 않으므로 저장 시 측정한 크기가 정확함)
+        self._finished = BoundedMemoryCache(
+            max_entries=int(os.getenv('PLAN_JOB_MEMORY_MAX_ENTRIES', 500)),
+            max_bytes=int(float(os.getenv('PLAN_JOB_MEMORY_MAX_MB', 64)) * 1024 * 1024),
+            ttl_seconds=self.ttl_seconds
+        )
+        # 새 이벤트 대기용 (같은 프로세스의 SSE 구독자)
+        self._signals: Dict[str, asyncio.Event] = {}
+    
+    async def _redis_available(self) -> bool:
+        return self._redis is not None and await self._redis.is_available()
+    
+    def _record_key(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}{job_id}"
+    
+    def _events_key(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}{job_id}:events"
+    
+    def _entry(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._active.get(job_id)
+        return entry if entry is not None else self._finished.get(job_id)
+    
+    def _notify(self, job_id: str):
+        signal = self._signals.pop(job_id, None)
+        if signal is not None:
+            signal.set()
+    
+    async def _save_record(self, record: Dict[str, Any]):
+        if await self._redis_available():
+            try:
+                await self._redis.client.setex(self._record_key(record['job_id']), self.ttl_seconds, _dumps(record))
+            except Exception as e:
+                self._redis.mark_failed()
+                print(f"   ⚠️ 작업 저장 오류 (Redis): {e}")
+    
+    async def save(self, record: Dict[str, Any]):
+        """대기/실행 중인 작업 레코드 저장 (생성/상태 변경)"""
+        job_id = record['job_id']
+        entry = self._active.setdefault(job_id, {'record': record, 'events': []})
+        entry['record'] = record
+        await self._save_record(record)
+        self._notify(job_id)
+    
+    async def finish(self, record: Dict[str, Any], event: Dict[str, Any]):
+        """
+        작업 종료: 최종 레코드 저장 → 마지막 이벤트(complete/error) 추가 → 끝난 작업 보관소로 이동
+        
+        구독자가 마지막 이벤트를 받았을 때 최종 레코드(result/error)가 이미 조회되도록 이 순서를 지킵니다.
+        """
+        job_id = record['job_id']
+        entry = self._active.setdefault(job_id, {'record': record, 'events': []})
+        entry['record'] = record
+        await self._save_record(record)
+        await self.append_event(job_id, event)
+        self._finished.set(job_id, self._active.pop(job_id))
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(job_id)
+        if entry is not None:
+            return entry['record']
+        if await self._redis_available():
+            try:
+                raw = await self._redis.client.get(self._record_key(job_id))
+                if raw:
+                    return json.loads(raw)
+            except Exception as e:
+                self._redis.mark_failed()
+                print(f"   ⚠️ 작업 조회 오류 (Redis): {e}")
+        return None
+    
+    async def append_event(self, job_id: str, event: Dict[str, Any]) -> int:
+        """실행 중인 작업에 진행 이벤트 추가 → 이벤트 id (작업 내 순번)"""
+        entry = self._active.get(job_id)
+        if entry is None:
+            return -1
+        event_id = len(entry['events'])
+        entry['events'].append({'id': event_id, **event})
+        
+        if await self._redis_available():
+            try:
+                key = self._events_key(job_id)
+                async with self._redis.client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(key, _dumps(event))
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                self._redis.mark_failed()
+                print(f"   ⚠️ 작업 이벤트 저장 오류 (Redis): {e}")
+        self._notify(job_id)
+        return event_id
+    
+    async def events_since(self, job_id: str, after: int = -1) -> List[Dict[str, Any]]:
+        """id가 after보다 큰 이벤트 목록"""
+        entry = self._entry(job_id)
+        if entry is not None:
+            return entry['events'][after + 1:]
+        if await self._redis_available():
+            try:
+                raw_events = await self._redis.client.lrange(self._events_key(job_id), after + 1, -1)
+                return [
+                    {'id': after + 1 + offset, **json.loads(raw)}
+                    for offset, raw in enumerate(raw_events)
+                ]
+            except Exception as e:
+                self._redis.mark_failed()
+                print(f"   ⚠️ 작업 이벤트 조회 오류 (Redis): {e}")
+        return []
+    
+    async def wait_for_change(self, job_id: str, after: int, timeout: float):
+        """
+        id가 after보다 큰 이벤트가 생길 때까지 대기 (최대 timeout초)
+        
+        이 프로세스에서 실행 중인 작업은 신호로 즉시 깨우고,
+        다른 프로세스의 작업은 poll_interval 간격으로 다시 조회하게 합니다.
+        """
+        entry = self._entry(job_id)
+        if entry is None:
+            await asyncio.sleep(min(timeout, self.poll_interval))
+            return
+        signal = self._signals.setdefault(job_id, asyncio.Event())
+        if len(entry['events']) > after + 1:
+            return
+        try:
+            await asyncio.wait_for(signal.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'redis' if self._redis is not None and self._redis.available else 'memory',
+            'ttl_seconds': self.ttl_seconds,
+            'active': len(self._active),
+            'memory_tier': self._finished.get_stats()
+        }
+
+
+# 작업 실행 함수: (요청 payload, 이벤트 버스) → JSON 직렬화 가능한 결과
+PlanRunner = Callable[[Dict[str, Any], PipelineEventBus], Awaitable[Dict[str, Any]]]
+
+
+class PlanJobService:
+    """크기 제한 큐 + 고정 워커로 계획 생성 작업 실행"""
+    
+    def __init__(self, runner: PlanRunner, store: Optional[PlanJobStore] = None):
+        self.runner = runner
+        self.store = store or PlanJobStore()
+        self.worker_count = int(os.getenv('PLAN_JOB_WORKERS', 4))
+        self.queue_size = int(os.getenv('PLAN_JOB_QUEUE_SIZE', 100))
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {'submitted': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0, 'running': 0}
+    
+    def _ensure_workers(self):
+        """워커 시작 (첫 작업 제출 시 현재 이벤트 루프에서 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"plan-job-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        print(f"🧵 계획 작업 워커 {self.worker_count}개 시작 (큐 {self.queue_size})")
+    
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        작업 등록
+        
+        Raises:
+            JobQueueFullError: 대기 작업이 PLAN_JOB_QUEUE_SIZE에 도달한 경우
+        """
+        self._ensure_workers()
+        if self._queue.full():
+            self.stats['rejected'] += 1
+            raise JobQueueFullError(f"대기 중인 작업이 많습니다 ({self._queue.qsize()}개). 잠시 후 다시 시도하세요.")
+        
+        now = time.time()
+        record = {
+            'job_id': str(uuid.uuid4()),
+            'status': JOB_QUEUED,
+            'progress': 0,
+            'message': '⏳ 대기 중...',
+            'created_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        await self.store.save(record)
+        self._queue.put_nowait((record['job_id'], payload))
+        self.stats['submitted'] += 1
+        return {**record, 'queue_position': self._queue.qsize()}
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(job_id)
+    
+    async def _worker(self, index: int):
+        while True:
+            job_id, payload = await self._queue.get()
+            try:
+                await self._run_job(job_id, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"   ⚠️ 작업 워커 {index} 오류: {e}")
+            finally:
+                self._queue.task_done()
+    
+    async def _run_job(self, job_id: str, payload: Dict[str, Any]):
+        record = await self.store.get(job_id)
+        if record is None:
+            print(f"   ⚠️ 만료된 작업 건너뜀: {job_id}")
+            return
+        record.update(status=JOB_RUNNING, started_at=time.time(), message='🚀 여행 계획 생성 시작...')
+        await self.store.save(record)
+        await self.store.append_event(job_id, {'type': 'status', 'stage': 'started', 'message': record['message'], 'progress': 0})
+        
+        async def on_event(event: str, data: Dict[str, Any]):
+            # 토큰 이벤트는 너무 잦아 저장하지 않음 (항목 단위로 충분)
+            if event == pipeline_events.LLM_TOKEN:
+                return
+            if event == pipeline_events.ITEM_PARSED:
+                await self.store.append_event(job_id, {'type': 'item', **data})
+                return
+            await self.store.append_event(job_id, {'type': 'status', 'stage': event, **data})
+            if data.get('progress') is not None and data['progress'] > record['progress']:
+                record.update(progress=data['progress'], message=data.get('message', record['message']))
+                await self.store.save(record)
+        
+        events = PipelineEventBus()
+        events.subscribe(on_event)
+        
+        self.stats['running'] += 1
+        try:
+            result = await self.runner(payload, events)
+            record.update(status=JOB_SUCCEEDED, progress=100, message='✅ 여행 계획 생성 완료', result=result)
+            self.stats['succeeded'] += 1
+        except ValueError as ve:
+            # 장소 0개 등 사용자 에러
+            record.update(status=JOB_FAILED, message='❌ 계획 생성 실패', error={'type': 'user', 'message': str(ve)})
+            self.stats['failed'] += 1
+        except Exception as e:
+            print(f"   ❌ 작업 실패 {job_id}: {e}")
+            record.update(
+                status=JOB_FAILED,
+                message='❌ 계획 생성 실패',
+                error={'type': 'system', 'message': f"계획 생성 중 시스템 오류: {str(e)}"}
+            )
+            self.stats['failed'] += 1
+        finally:
+            self.stats['running'] -= 1
+        
+        record['finished_at'] = time.time()
+        if record['status'] == JOB_SUCCEEDED:
+            await self.store.finish(record, {'type': 'complete', 'progress': 100})
+        else:
+            await self.store.finish(record, {'type': 'error', 'message': record['error']['message']})
+        print(f"🧵 작업 {record['status']}: {job_id} ({record['finished_at'] - record['started_at']:.1f}초)")
+    
+    async def close(self):
+        """애플리케이션 종료 시 워커 정리 (대기 중인 작업은 폐기)"""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            print("🧵 계획 작업 워커 종료")
+        self._workers = []
+        self._queue = None
+        self._loop = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.worker_count,
+            'queue_size': self.queue_size,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            **self.stats,
+            'store': self.store.get_stats()
+        }
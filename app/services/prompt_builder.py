@@ -0,0 +1,213 @@
+"""
+프롬프트 빌더 + 토큰 예산
+
+system/user 프롬프트를 섹션 단위로 조립하고 로컬 토크나이저로 토큰 수를 측정합니다.
+입력 토큰 예산(PROMPT_INPUT_TOKEN_BUDGET)을 넘으면 우선순위가 낮은 섹션부터
+줄이거나 제외하여 예산 안에 맞춥니다.
+
+- 필수 섹션(priority=None): 역할, 지역 제약, 규칙, 응답 형식 → 항상 포함
+- 선택 섹션: 우선순위가 낮은 순서로 제외
+- 목록 섹션(add_lines): 뒤쪽 항목부터 min_lines까지 줄임 (검증된 장소 목록)
+
+토크나이저: tiktoken (미설치 시 문자 수 기반 추정)
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+SYSTEM = 'system'
+USER = 'user'
+
+# 메시지당 고정 오버헤드 (role, 구분자)
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoders: Dict[str, Any] = {}
+
+
+def _get_encoder(model: str):
+    if model not in _encoders:
+        try:
+            _encoders[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encoders[model] = tiktoken.get_encoding('cl100k_base')
+    return _encoders[model]
+
+
+def count_tokens(text: str, model: str = 'gpt-4') -> int:
+    """
+    토큰 수 측정
+    
+    tiktoken이 없으면 ASCII 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰으로 추정합니다.
+    """
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        return len(_get_encoder(model).encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def compact_text(text: str) -> str:
+    """줄 끝 공백 제거 + 연속 빈 줄 하나로 축소"""
+    lines = [line.rstrip() for line in text.strip().split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines))
+
+
+def compact_place_line(index: int, place: Dict[str, Any]) -> str:
+    """
+    검증된 장소 한 줄 표현
+    
+    예: 3. 성수 카페거리 | 서울 성동구 성수동2가 | ★4.5 | 후기: 분위기 좋은 ...
+    """
+    parts = [f"{index}. {place.get('name', '')}"]
+    if place.get('address'):
+        parts.append(place['address'])
+    rating = place.get('rating') or (place.get('google_info') or {}).get('rating')
+    if rating:
+        parts.append(f"★{rating}")
+    blog_contents = place.get('blog_contents') or []
+    summary = (blog_contents[0].get('summary') or '').strip() if blog_contents else ''
+    if summary:
+        parts.append(f"후기: {summary[:30].rstrip()}")
+    return ' | '.join(parts)
+
+
+class _Section:
+    def __init__(
+        self,
+        role: str,
+        name: str,
+        priority: Optional[int],
+        text: str = '',
+        header: str = '',
+        lines: Optional[List[str]] = None,
+        min_lines: int = 0
+    ):
+        self.role = role
+        self.name = name
+        self.priority = priority
+        self.text = compact_text(text) if text else ''
+        self.header = header
+        self.lines = list(lines) if lines is not None else None
+        self.min_lines = min_lines
+        self.included = True
+    
+    def render(self) -> str:
+        if self.lines is None:
+            return self.text
+        if not self.lines:
+            return ''
+        return '\n'.join(([self.header] if self.header else []) + self.lines)
+
+
+class PromptBuilder:
+    """
+    섹션 기반 프롬프트 조립 + 입력 토큰 예산 적용
+    
+    사용 예:
+        builder = PromptBuilder("gpt-4")
+        builder.add(SYSTEM, 'rules', rules_text)
+        builder.add_lines(SYSTEM, 'places', '검증된 장소:', lines, priority=5, min_lines=8)
+        builder.add(USER, 'weather_tips', tips, priority=1)
+        messages, report = builder.build()
+    """
+    
+    def __init__(self, model: str = 'gpt-4', token_budget: Optional[int] = None):
+        self.model = model
+        self.token_budget = token_budget if token_budget is not None else \
+            int(os.getenv('PROMPT_INPUT_TOKEN_BUDGET', 3000))
+        self._sections: List[_Section] = []
+        self._line_tokens: Dict[str, List[int]] = {}
+    
+    def add(self, role: str, name: str, text: str, priority: Optional[int] = None):
+        """텍스트 섹션 추가 (priority=None이면 필수, 숫자가 작을수록 먼저 제외)"""
+        if text and text.strip():
+            self._sections.append(_Section(role, name, priority, text=text))
+        return self
+    
+    def add_lines(
+        self,
+        role: str,
+        name: str,
+        header: str,
+        lines: List[str],
+        priority: int,
+        min_lines: int = 0
+    ):
+        """목록 섹션 추가 (예산 초과 시 뒤쪽 항목부터 min_lines까지 줄임)"""
+        if lines:
+            self._sections.append(_Section(role, name, priority, header=header, lines=lines, min_lines=min_lines))
+            self._line_tokens[name] = [count_tokens(line, self.model) + 1 for line in lines]
+        return self
+    
+    def _section_tokens(self, section: _Section) -> int:
+        if not section.included:
+            return 0
+        if section.lines is None:
+            return count_tokens(section.text, self.model)
+        line_tokens = self._line_tokens[section.name][:len(section.lines)]
+        return count_tokens(section.header, self.model) + sum(line_tokens) if line_tokens else 0
+    
+    def build(self) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        예산에 맞춘 메시지 목록과 측정 보고서 반환
+        
+        Returns:
+            (messages, report) - report: 역할별/전체 토큰, 제외된 섹션, 줄인 목록 항목 수
+        """
+        tokens = {id(section): self._section_tokens(section) for section in self._sections}
+        roles = {section.role for section in self._sections}
+        overhead = _MESSAGE_OVERHEAD_TOKENS * len(roles)
+        total = sum(tokens.values()) + overhead
+        
+        dropped: List[str] = []
+        trimmed: Dict[str, int] = {}
+        optional = sorted(
+            (section for section in self._sections if section.priority is not None),
+            key=lambda section: section.priority
+        )
+        
+        for section in optional:
+            if total <= self.token_budget:
+                break
+            if section.lines is not None:
+                while section.lines and len(section.lines) > section.min_lines and total > self.token_budget:
+                    section.lines.pop()
+                    trimmed[section.name] = trimmed.get(section.name, 0) + 1
+                    new_tokens = self._section_tokens(section)
+                    total += new_tokens - tokens[id(section)]
+                    tokens[id(section)] = new_tokens
+                continue
+            section.included = False
+            dropped.append(section.name)
+            total -= tokens[id(section)]
+            tokens[id(section)] = 0
+        
+        messages = []
+        role_tokens = {}
+        for role in (SYSTEM, USER):
+            parts = [section.render() for section in self._sections if section.role == role and section.included]
+            content = '\n\n'.join(part for part in parts if part)
+            if content:
+                messages.append({'role': role, 'content': content})
+                role_tokens[role] = count_tokens(content, self.model) + _MESSAGE_OVERHEAD_TOKENS
+        
+        measured_total = sum(role_tokens.values())
+        report = {
+            'tokenizer': 'tiktoken' if TIKTOKEN_AVAILABLE else 'estimate',
+            'budget': self.token_budget,
+            'system_tokens': role_tokens.get(SYSTEM, 0),
+            'user_tokens': role_tokens.get(USER, 0),
+            'total_tokens': measured_total,
+            'over_budget': measured_total > self.token_budget,
+            'dropped_sections': dropped,
+            'trimmed_lines': trimmed
+        }
+        return messages, report
@@ -2,71 +2,116 @@
 Redis 캐시 서비스
 
 메모리 캐시를 대체하여 서버 재시작 후에도 캐시 유지
-30일 TTL로 크롤링 데이터 영구 보관
+30일 soft TTL 이후에는 stale로 반환하고 백그라운드 갱신, hard TTL(기본 90일)에 만료
+redis.asyncio 공유 커넥션 풀을 사용하여 이벤트 루프를 막지 않음
+값은 CacheCodec으로 직렬화 (msgpack + 압축, 기존 JSON 항목도 읽음)
 """
 
-import json
-import redis
-from datetime import timedelta
 from typing import Dict, Any, List, Optional
 import os
+import time
+
+from app.services.cache_codec import get_cache_codec
+from app.services.crawl_cache_service import (
+    CRAWL_HARD_TTL, CRAWL_SOFT_TTL, MISSING_ENTRY, CachedPlaces, create_crawl_memory_tier
+)
+from app.services.redis_pool import get_redis_handle
 
 
 class RedisCacheService:
     """Redis 기반 캐시 서비스"""
     
+    KEY_PREFIX = "crawl:"
+    SCAN_BATCH = 500
+    
     def __init__(self):
         # Redis 연결 설정
         redis_host = os.getenv('REDIS_HOST', 'localhost')
         redis_port = int(os.getenv('REDIS_PORT', 6379))
         redis_password = os.getenv('REDIS_PASSWORD', None)
         
+        # 프로세스 전역 커넥션 풀 공유 (연결 확인은 첫 사용 시 비동기로)
+        self._redis = get_redis_handle(
+            host=redis_host,
+            port=redis_port,
+            password=redis_password,
+            decode_responses=False,  # 바이너리 코덱 사용
+            socket_connect_timeout=2
+        )
+        self.redis_client = self._redis.client
+        self.codec = get_cache_codec()
+        
+        self.cache_duration = CRAWL_SOFT_TTL  # 이후 stale (값 헤더의 저장 시각으로 판단)
+        self.ttl_seconds = int(CRAWL_HARD_TTL.total_seconds())  # Redis 키 만료
+        
+        # 메모리 폴백 (개수/바이트 상한 + hard TTL, 값: CachedPlaces)
+        self._memory_fallback = create_crawl_memory_tier(self.ttl_seconds)
+    
+    @property
+    def redis_available(self) -> bool:
+        """Redis 사용 가능 여부 (확인 전에는 사용 가능으로 간주)"""
+        return self._redis.available is not False
+    
+    def _cache_key(self, search_key: str) -> str:
+        return f"{self.KEY_PREFIX}{search_key}"
+    
+    def _decode(self, search_key: str, raw) -> CachedPlaces:
+        """캐시 값 복원 (복원 실패 시 미스로 처리)"""
+        if not raw:
+            return MISSING_ENTRY
         try:
-            self.redis_client = redis.Redis(
-                host=redis_host,
-                port=redis_port,
-                password=redis_password,
-                decode_responses=True,
-                socket_connect_timeout=2
-            )
-            # 연결 테스트
-            self.redis_client.ping()
-            self.redis_available = True
-            print(f"✅ Redis 연결 성공: {redis_host}:{redis_port}")
+            places, stored_at = self.codec.decode_entry(raw)
+            return CachedPlaces(places or [], stored_at)
         except Exception as e:
-            print(f"⚠️ Redis 연결 실패: {e}")
-            print(f"   메모리 캐시로 폴백합니다.")
-            self.redis_available = False
-            self._memory_fallback = {}  # 메모리 폴백
-        
-        self.cache_duration = timedelta(days=30)
-        self.ttl_seconds = int(self.cache_duration.total_seconds())
+            print(f"   ⚠️ 캐시 값 복원 실패: {search_key} ({e})")
+            return MISSING_ENTRY
     
-    def get_cached_data(self, search_key: str) -> List[Dict[str, Any]]:
+    async def get_cached_data(self, search_key: str) -> List[Dict[str, Any]]:
         """캐시된 크롤링 데이터 조회"""
-        cache_key = f"crawl:{search_key}"
-        
-        if self.redis_available:
-            try:
-                cached_json = self.redis_client.get(cache_key)
-                if cached_json:
-                    data = json.loads(cached_json)
-                    print(f"   ✅ Redis 캐시 히트: {search_key}")
-                    return data
-                else:
-                    return []
-            except Exception as e:
-                print(f"   ⚠️ Redis 조회 오류: {e}, 메모리 폴백")
-                return self._memory_fallback.get(search_key, [])
-        else:
+        if not await self._redis.is_available():
             # 메모리 폴백
-            return self._memory_fallback.get(search_key, [])
+            return self._memory_fallback.get(search_key, MISSING_ENTRY).places
+        
+        try:
+            raw = await self.redis_client.get(self._cache_key(search_key))
+            data = self._decode(search_key, raw).places
+            if data:
+                print(f"   ✅ Redis 캐시 히트: {search_key}")
+            return data
+        except Exception as e:
+            print(f"   ⚠️ Redis 조회 오류: {e}, 메모리 폴백")
+            self._redis.mark_failed()
+            return self._memory_fallback.get(search_key, MISSING_ENTRY).places
     
-    def save_crawled_data(self, search_key: str, places_data: List[Dict[str, Any]]):
-        """크롤링 데이터를 Redis에 저장 (30일 TTL)"""
-        cache_key = f"crawl:{search_key}"
+    async def get_many(self, search_keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 검색 키를 MGET 한 번으로 조회
         
-        # 캐시 데이터 정리
+        Returns:
+            {search_key: 장소 리스트} (미스는 빈 리스트)
+        """
+        entries = await self.get_many_entries(search_keys)
+        return {key: entry.places for key, entry in entries.items()}
+    
+    async def get_many_entries(self, search_keys: List[str]) -> Dict[str, CachedPlaces]:
+        """여러 검색 키를 MGET 한 번으로 조회 (저장 시각 포함, stale 판단용)"""
+        if not search_keys:
+            return {}
+        
+        if not await self._redis.is_available():
+            return {key: self._memory_fallback.get(key, MISSING_ENTRY) for key in search_keys}
+        
+        try:
+            values = await self.redis_client.mget([self._cache_key(key) for key in search_keys])
+        except Exception as e:
+            print(f"   ⚠️ Redis MGET 오류: {e}, 메모리 폴백")
+            self._redis.mark_failed()
+            return {key: self._memory_fallback.get(key, MISSING_ENTRY) for key in search_keys}
+        
+        return {key: self._decode(key, raw) for key, raw in zip(search_keys, values)}
+    
+    def _compact_places(self, places_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """캐시 데이터 정리"""
         cached_places = []
         for place in places_data:
             cached_place = {
@@ -82,42 +127,74 @@ class RedisCacheService:
                 'blog_reviews': place.get('blog_reviews', [])
             }
             cached_places.append(cached_place)
+        return cached_places
+    
+    async def save_crawled_data(self, search_key: str, places_data: List[Dict[str, Any]]):
+        """크롤링 데이터를 Redis에 저장 (30일 후 stale, hard TTL에 만료)"""
+        cached_places = self._compact_places(places_data)
+        stored_at = time.time()
         
-        if self.redis_available:
+        if await self._redis.is_available():
             try:
-                # JSON 직렬화 후 Redis에 저장
-                self.redis_client.setex(
-                    cache_key,
+                # 코덱 직렬화 후 Redis에 저장
+                await self.redis_client.setex(
+                    self._cache_key(search_key),
                     self.ttl_seconds,
-                    json.dumps(cached_places, ensure_ascii=False)
+                    self.codec.encode(cached_places, stored_at=stored_at)
                 )
                 print(f"💾 Redis 캐시 저장: {search_key} ({len(cached_places)}개 장소, TTL: 30일)")
             except Exception as e:
                 print(f"   ⚠️ Redis 저장 오류: {e}, 메모리에만 저장")
-                self._memory_fallback[search_key] = cached_places
+                self._redis.mark_failed()
+                self._memory_fallback.set(search_key, CachedPlaces(cached_places, stored_at))
         else:
             # 메모리 폴백
-            self._memory_fallback[search_key] = cached_places
+            self._memory_fallback.set(search_key, CachedPlaces(cached_places, stored_at))
             print(f"💾 메모리 캐시 저장: {search_key} ({len(cached_places)}개 장소)")
     
+    async def set_many(self, mapping: Dict[str, List[Dict[str, Any]]]):
+        """여러 검색 키를 파이프라인 SETEX 한 번으로 저장 (30일 후 stale)"""
+        if not mapping:
+            return
+        
+        compacted = {key: self._compact_places(places) for key, places in mapping.items()}
+        stored_at = time.time()
+        
+        if await self._redis.is_available():
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for search_key, cached_places in compacted.items():
+                        pipe.setex(
+                            self._cache_key(search_key),
+                            self.ttl_seconds,
+                            self.codec.encode(cached_places, stored_at=stored_at)
+                        )
+                    await pipe.execute()
+                print(f"💾 Redis 캐시 일괄 저장: {len(compacted)}개 키 (TTL: 30일)")
+                return
+            except Exception as e:
+                print(f"   ⚠️ Redis 일괄 저장 오류: {e}, 메모리에만 저장")
+                self._redis.mark_failed()
+        
+        # 메모리 폴백
+        for search_key, cached_places in compacted.items():
+            self._memory_fallback.set(search_key, CachedPlaces(cached_places, stored_at))
+        print(f"💾 메모리 캐시 일괄 저장: {len(compacted)}개 키")
+    
     def cleanup_expired_cache(self) -> int:
         """만료된 캐시 정리 (Redis는 자동 만료되므로 메모리 폴백만)"""
-        if not self.redis_available:
-            expired_count = len(self._memory_fallback)
-            self._memory_fallback.clear()
-            return expired_count
-        return 0
+        return self._memory_fallback.cleanup_expired()
     
     def generate_search_key(self, city: str, keyword: str) -> str:
         """검색 키 생성"""
         return f"{city}_{keyword}".lower().replace(' ', '_')
     
-    def get_cache_stats(self) -> Dict[str, Any]:
+    async def get_cache_stats(self) -> Dict[str, Any]:
         """캐시 통계 조회"""
-        if self.redis_available:
+        if await self._redis.is_available():
             try:
-                info = self.redis_client.info('stats')
-                keys_count = self.redis_client.dbsize()
+                info = await self.redis_client.info('stats')
+                keys_count = await self.redis_client.dbsize()
                 
                 return {
                     'backend': 'redis',
@@ -125,14 +202,17 @@ class RedisCacheService:
                     'total_commands': info.get('total_commands_processed', 0),
                     'keyspace_hits': info.get('keyspace_hits', 0),
                     'keyspace_misses': info.get('keyspace_misses', 0),
-                    'hit_rate': self._calculate_hit_rate(info)
+                    'hit_rate': self._calculate_hit_rate(info),
+                    'codec': self.codec.describe(),
+                    'memory_tier': self._memory_fallback.get_stats()
                 }
             except Exception as e:
                 return {'backend': 'redis', 'error': str(e)}
         else:
             return {
                 'backend': 'memory_fallback',
-                'total_keys': len(self._memory_fallback)
+                'total_keys': len(self._memory_fallback),
+                'memory_tier': self._memory_fallback.get_stats()
             }
     
     def _calculate_hit_rate(self, info: Dict) -> float:
@@ -146,21 +226,25 @@ class RedisCacheService:
         
         return round(hits / total * 100, 2)
     
-    def clear_all_cache(self):
+    async def clear_all_cache(self):
         """모든 캐시 삭제 (개발/디버깅용)"""
-        if self.redis_available:
+        if await self._redis.is_available():
             try:
-                # crawl: 접두사를 가진 키만 삭제
-                keys = self.redis_client.keys('crawl:*')
-                if keys:
-                    self.redis_client.delete(*keys)
-                    print(f"🗑️ Redis 캐시 삭제: {len(keys)}개 키")
-                return len(keys)
+                # crawl: 접두사를 가진 키만 삭제 (KEYS 대신 SCAN으로 Redis 블로킹 방지)
+                deleted = 0
+                batch = []
+                async for key in self.redis_client.scan_iter(match=f"{self.KEY_PREFIX}*", count=self.SCAN_BATCH):
+                    batch.append(key)
+                    if len(batch) >= self.SCAN_BATCH:
+                        deleted += await self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += await self.redis_client.unlink(*batch)
+                if deleted:
+                    print(f"🗑️ Redis 캐시 삭제: {deleted}개 키")
+                return deleted
             except Exception as e:
                 print(f"⚠️ Redis 삭제 오류: {e}")
                 return 0
         else:
-            count = len(self._memory_fallback)
-            self._memory_fallback.clear()
-            return count
-
+            return self._memory_fallback.clear()
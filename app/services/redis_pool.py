@@ -0,0 +1,83 @@
+"""
+비동기 Redis 커넥션 풀
+
+redis.asyncio 클라이언트를 연결 설정별로 하나씩만 만들어
+RedisCacheService, CacheService 등 모든 캐시 서비스가 커넥션 풀을 공유합니다.
+요청마다 서비스가 생성되어도 연결/ping 비용은 프로세스당 한 번만 발생합니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+
+class AsyncRedisHandle:
+    """공유 redis.asyncio 클라이언트 + 연결 가능 여부 상태"""
+    
+    # 연결 실패 후 재시도까지 대기 시간 (초)
+    RETRY_INTERVAL = 30
+    PING_TIMEOUT = 2
+    
+    def __init__(self, url: Optional[str] = None, **connection_kwargs):
+        if url:
+            pool = aioredis.ConnectionPool.from_url(url, **connection_kwargs)
+        else:
+            pool = aioredis.ConnectionPool(**connection_kwargs)
+        self.client = aioredis.Redis(connection_pool=pool)
+        self.description = url or f"{connection_kwargs.get('host')}:{connection_kwargs.get('port')}"
+        self.available: Optional[bool] = None  # None: 아직 확인 전
+        self._checked_at = 0.0
+    
+    async def is_available(self) -> bool:
+        """
+        Redis 연결 가능 여부 (최초 1회 ping, 실패 시 RETRY_INTERVAL 후 재확인)
+        """
+        if self.available:
+            return True
+        now = time.monotonic()
+        if self.available is False and now - self._checked_at < self.RETRY_INTERVAL:
+            return False
+        
+        self._checked_at = now
+        try:
+            await asyncio.wait_for(self.client.ping(), timeout=self.PING_TIMEOUT)
+            self.available = True
+            print(f"✅ Redis 연결 성공: {self.description}")
+        except Exception as e:
+            self.available = False
+            print(f"⚠️ Redis 연결 실패: {e}")
+            print(f"   메모리 캐시로 폴백합니다.")
+        return self.available
+    
+    def mark_failed(self):
+        """명령 실행 중 연결 오류 발생 시 호출 (재시도 대기 시작)"""
+        self.available = False
+        self._checked_at = time.monotonic()
+    
+    async def close(self):
+        # redis-py 5.0.1부터 aclose() 제공
+        close = getattr(self.client, 'aclose', None) or self.client.close
+        await close()
+
+
+_handles: Dict[Tuple, AsyncRedisHandle] = {}
+
+def get_redis_handle(url: Optional[str] = None, **connection_kwargs) -> AsyncRedisHandle:
+    """연결 설정별 공유 핸들 반환"""
+    key = (url, tuple(sorted(connection_kwargs.items())))
+    handle = _handles.get(key)
+    if handle is None:
+        handle = AsyncRedisHandle(url, **connection_kwargs)
+        _handles[key] = handle
+    return handle
+
+async def close_all_redis_handles():
+    """애플리케이션 종료 시 모든 커넥션 풀 정리"""
+    for handle in list(_handles.values()):
+        try:
+            await handle.close()
+        except Exception as e:
+            print(f"⚠️ Redis 연결 종료 오류: {e}")
+    _handles.clear()
@@ -0,0 +1,187 @@
+"""
+요청 단위 시간 예산 (데드라인 + 단계별 축소)
+
+/plan 요청 하나에 전체 시간 상한(PLAN_REQUEST_DEADLINE_SECONDS)을 두고,
+남은 시간이 부족하면 선택 단계를 건너뛰거나 줄여서 응답 시간을 예측 가능하게 유지합니다.
+
+- 필수 단계: 지역 추출, 장소 수집, 일정 생성(LLM), 경로 계산
+- 선택 단계: Step 7 구역별 세분화, 블로그 본문 크롤링, 실시간 대중교통
+- 선택 단계는 "남은 시간 - LLM/후처리 예약 시간(PLAN_LLM_RESERVE_SECONDS)" 안에서만 실행
+
+예산은 contextvar로 전달되므로 asyncio.create_task/gather로 만든 하위 작업에도 자동으로 적용됩니다.
+여러 요청이 공유하거나 응답 뒤에도 계속되는 작업(single-flight 크롤링, stale 캐시 갱신)은
+create_task_without_budget으로 예산 없이 시작합니다.
+
+사용 예:
+    with request_budget(45) as budget:
+        ...
+        if current_budget().allows(STAGE_DISTRICTS, min_seconds=15):
+            await current_budget().run(STAGE_DISTRICTS, crawl(), fallback={})
+        metadata['degradation'] = budget.to_metadata()
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Coroutine, Dict, Iterator, Optional
+
+# 선택 단계 이름 (메타데이터에 기록)
+STAGE_DISTRICTS = 'district_recommendations'
+STAGE_BLOG_CRAWL = 'blog_crawl'
+STAGE_REALTIME_TRANSPORT = 'realtime_transport'
+
+
+class RequestBudget:
+    """요청 하나의 데드라인과 건너뛴/줄인 단계 기록"""
+    
+    def __init__(self, total_seconds: Optional[float] = None, reserve_seconds: Optional[float] = None):
+        self.total_seconds = total_seconds
+        self.reserve_seconds = reserve_seconds if reserve_seconds is not None else \
+            float(os.getenv('PLAN_LLM_RESERVE_SECONDS', 25))
+        self.started = time.monotonic()
+        self.deadline = self.started + total_seconds if total_seconds else None
+        self._skipped: Dict[str, Dict[str, Any]] = {}
+        self._truncated: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def unlimited(self) -> bool:
+        return self.deadline is None
+    
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+    
+    def remaining(self) -> Optional[float]:
+        """남은 시간 (초, 예산이 없으면 None)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def spare(self) -> Optional[float]:
+        """선택 단계에 쓸 수 있는 시간 (남은 시간 - LLM/후처리 예약)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return max(0.0, remaining - self.reserve_seconds)
+    
+    def allows(self, stage: str, min_seconds: float = 0.0) -> bool:
+        """
+        선택 단계 실행 가능 여부 (불가하면 건너뜀으로 기록)
+        
+        Args:
+            stage: 단계 이름 (STAGE_*)
+            min_seconds: 이 단계가 의미 있는 결과를 내는 데 필요한 최소 시간
+        """
+        spare = self.spare()
+        if spare is None or spare >= max(min_seconds, 0.001):
+            return True
+        self.skip(stage, f"남은 예산 {spare:.1f}초 < 필요 {min_seconds:g}초")
+        return False
+    
+    def skip(self, stage: str, reason: str):
+        """건너뛴 단계 기록 (같은 단계는 횟수만 증가)"""
+        entry = self._skipped.get(stage)
+        if entry is None:
+            self._skipped[stage] = {
+                'stage': stage,
+                'reason': reason,
+                'at_ms': round(self.elapsed() * 1000, 1),
+                'count': 1
+            }
+            print(f"   ⏭️ 시간 예산 부족으로 건너뜀: {stage} ({reason})")
+        else:
+            entry['count'] += 1
+    
+    def truncate(self, stage: str, reason: str, **detail: Any):
+        """일부만 실행한 단계 기록"""
+        entry = self._truncated.get(stage)
+        if entry is None:
+            self._truncated[stage] = {
+                'stage': stage,
+                'reason': reason,
+                'at_ms': round(self.elapsed() * 1000, 1),
+                'count': 1,
+                **detail
+            }
+            print(f"   ✂️ 시간 예산 부족으로 축소: {stage} ({reason})")
+        else:
+            entry['count'] += 1
+            entry.update(detail)
+    
+    async def run(self, stage: str, awaitable: Awaitable[Any], fallback: Any = None) -> Any:
+        """
+        선택 단계를 남은 여유 시간 안에서 실행 (초과 시 취소하고 fallback 반환)
+        
+        예산이 없으면 그대로 기다립니다.
+        """
+        spare = self.spare()
+        if spare is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout=max(spare, 0.001))
+        except asyncio.TimeoutError:
+            self.truncate(stage, f"{spare:.1f}초 안에 끝나지 않아 중단")
+            return fallback
+    
+    @property
+    def degraded(self) -> bool:
+        return bool(self._skipped or self._truncated)
+    
+    def to_metadata(self) -> Dict[str, Any]:
+        """응답 processing_metadata용 요약"""
+        remaining = self.remaining()
+        return {
+            'budget_seconds': self.total_seconds,
+            'reserve_seconds': self.reserve_seconds,
+            'elapsed_ms': round(self.elapsed() * 1000, 1),
+            'remaining_ms': round(remaining * 1000, 1) if remaining is not None else None,
+            'degraded': self.degraded,
+            'skipped': list(self._skipped.values()),
+            'truncated': list(self._truncated.values())
+        }
+
+
+# 현재 요청의 예산 (없으면 무제한)
+_current_budget: contextvars.ContextVar[Optional[RequestBudget]] = contextvars.ContextVar(
+    'plan_request_budget', default=None
+)
+
+
+def current_budget() -> RequestBudget:
+    """현재 요청의 예산 (request_budget 밖에서는 무제한 예산)"""
+    budget = _current_budget.get()
+    return budget if budget is not None else RequestBudget(None)
+
+
+@contextmanager
+def request_budget(seconds: Optional[float] = None) -> Iterator[RequestBudget]:
+    """
+    블록 안의 작업에 요청 예산 적용
+    
+    seconds를 생략하면 PLAN_REQUEST_DEADLINE_SECONDS (기본 45초, 0이면 무제한)를 사용합니다.
+    """
+    if seconds is None:
+        seconds = float(os.getenv('PLAN_REQUEST_DEADLINE_SECONDS', 45))
+    budget = RequestBudget(seconds or None)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def stage_min_seconds(stage: str, default: float) -> float:
+    """단계별 최소 필요 시간 (PLAN_MIN_SECONDS_<STAGE> 환경변수로 조정)"""
+    return float(os.getenv(f'PLAN_MIN_SECONDS_{stage.upper()}', default))
+
+
+def create_task_without_budget(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    호출한 요청의 예산을 물려받지 않는 Task 생성
+    
+    새 Task는 만들어질 때의 contextvar를 복사하므로, 예산만 비운 컨텍스트 안에서 만듭니다.
+    """
+    context = contextvars.copy_context()
+    context.run(_current_budget.set, None)
+    return context.run(asyncio.ensure_future, coro)
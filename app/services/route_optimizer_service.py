@@ -7,6 +7,11 @@
 from typing import Dict, Any, List, Tuple
 import math
 from app.services.district_service import DistrictService
+from app.utils.spatial_index import SpatialIndex
+
+# 좌표가 없는 장소의 기본 위치 (서울시청)
+DEFAULT_LAT = 37.5665
+DEFAULT_LNG = 126.9780
 
 class RouteOptimizerService:
     def __init__(self):
@@ -37,20 +42,17 @@ class RouteOptimizerService:
         districts = self.district_service.get_districts_by_city(city)
         clusters = {}
         
+        # 🆕 구역 중심 색인 (장소마다 모든 구역과 비교하지 않음)
+        district_names = list(districts)
+        district_index = SpatialIndex.from_points(
+            ((i, districts[name]["center"]["lat"], districts[name]["center"]["lng"]) for i, name in enumerate(district_names)),
+            cell_meters=2000
+        ).freeze()
+        
         for place in places:
-            place_coords = {"lat": place.get("lat", 37.5665), "lng": place.get("lng", 126.9780)}
-            
             # 가장 가까운 구역 찾기
-            closest_district = None
-            min_distance = float('inf')
-            
-            for district_name, district_info in districts.items():
-                district_center = district_info["center"]
-                distance = self.district_service.calculate_distance(place_coords, district_center)
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_district = district_name
+            nearest = district_index.nearest(place.get("lat", DEFAULT_LAT), place.get("lng", DEFAULT_LNG))
+            closest_district = district_names[nearest[0][0]] if nearest else None
             
             # 클러스터에 추가
             if closest_district:
@@ -75,23 +77,19 @@ class RouteOptimizerService:
         else:
             current_location = clusters[0]["center"]
         
+        # 🆕 남은 구역 중심 색인 (방문한 구역은 색인에서 제거)
+        remaining = SpatialIndex.from_points(
+            ((i, cluster["center"]["lat"], cluster["center"]["lng"]) for i, cluster in enumerate(clusters)),
+            cell_meters=2000
+        )
         optimized_order = []
-        remaining_clusters = clusters.copy()
         
         # 가장 가까운 구역부터 방문
-        while remaining_clusters:
-            min_distance = float('inf')
-            next_cluster = None
-            
-            for cluster in remaining_clusters:
-                distance = self.district_service.calculate_distance(current_location, cluster["center"])
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    next_cluster = cluster
-            
+        while len(remaining):
+            next_index, _ = remaining.nearest(current_location["lat"], current_location["lng"])[0]
+            next_cluster = clusters[next_index]
             optimized_order.append(next_cluster)
-            remaining_clusters.remove(next_cluster)
+            remaining.remove(next_index)
             current_location = next_cluster["center"]
         
         return optimized_order
@@ -101,33 +99,26 @@ class RouteOptimizerService:
         if len(places) <= 2:
             return places
         
-        # 간단한 TSP 해결 (Nearest Neighbor)
-        optimized_places = []
-        remaining_places = places.copy()
+        # 간단한 TSP 해결 (Nearest Neighbor) - 🆕 남은 장소는 공간 색인에서 최근접 조회
+        remaining = SpatialIndex.from_points(
+            ((i, place.get("lat", DEFAULT_LAT), place.get("lng", DEFAULT_LNG)) for i, place in enumerate(places)),
+            cell_meters=300
+        )
         
         # 첫 번째 장소 선택 (가장 북쪽 또는 서쪽)
-        first_place = min(remaining_places, key=lambda p: (p.get("lat", 0), p.get("lng", 0)))
-        optimized_places.append(first_place)
-        remaining_places.remove(first_place)
+        first_index = min(range(len(places)), key=lambda i: (places[i].get("lat", 0), places[i].get("lng", 0)))
+        optimized_places = [places[first_index]]
+        remaining.remove(first_index)
         
-        current_location = {"lat": first_place.get("lat", 37.5665), "lng": first_place.get("lng", 126.9780)}
+        current_location = {"lat": places[first_index].get("lat", DEFAULT_LAT), "lng": places[first_index].get("lng", DEFAULT_LNG)}
         
         # 가장 가까운 장소부터 방문
-        while remaining_places:
-            min_distance = float('inf')
-            next_place = None
-            
-            for place in remaining_places:
-                place_coords = {"lat": place.get("lat", 37.5665), "lng": place.get("lng", 126.9780)}
-                distance = self.district_service.calculate_distance(current_location, place_coords)
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    next_place = place
-            
+        while len(remaining):
+            next_index, _ = remaining.nearest(current_location["lat"], current_location["lng"])[0]
+            next_place = places[next_index]
             optimized_places.append(next_place)
-            remaining_places.remove(next_place)
-            current_location = {"lat": next_place.get("lat", 37.5665), "lng": next_place.get("lng", 126.9780)}
+            remaining.remove(next_index)
+            current_location = {"lat": next_place.get("lat", DEFAULT_LAT), "lng": next_place.get("lng", DEFAULT_LNG)}
         
         return optimized_places
     
@@ -0,0 +1,189 @@
+"""
+Single-flight 요청 병합 서비스
+
+같은 검색 키에 대한 크롤링이 동시에 여러 번 시작되지 않도록
+진행 중인 작업 하나를 모든 호출자가 함께 기다리게 합니다.
+
+- SingleFlight: 프로세스 내부 병합 (asyncio Task 공유)
+- RedisSingleFlight: 멀티 워커 배포용, Redis 락으로 워커 간에도 병합
+"""
+
+import asyncio
+import inspect
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.request_budget import create_task_without_budget
+
+
+async def _maybe_await(value: Any) -> Any:
+    """동기/비동기 반환값을 모두 처리"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class SingleFlight:
+    """프로세스 내부 single-flight"""
+
+    # 다른 워커가 캐시를 폴링해 결과를 받는지 여부 (True면 작업 안에서 캐시 저장 필요)
+    shares_via_cache = False
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {'leaders': 0, 'joined': 0}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        load_cached: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """
+        key에 대해 fn을 한 번만 실행하고 결과를 공유
+
+        먼저 호출한 요청이 작업을 시작하고, 이후 호출자는 같은 Task를 기다립니다.
+        작업은 별도 Task로 실행되므로 최초 호출자가 취소되어도 나머지 호출자는 결과를 받습니다.
+        공유 작업이므로 최초 호출자의 요청 예산은 물려받지 않습니다.
+
+        Args:
+            key: 병합 기준 키 (예: generate_search_key 결과)
+            fn: 실제 작업 (크롤링 + 캐시 저장)
+            load_cached: 캐시 조회 함수 (분산 변형에서 사용)
+        """
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.stats['joined'] += 1
+            print(f"   🔗 진행 중인 크롤링에 합류: {key}")
+            return await asyncio.shield(task)
+
+        self.stats['leaders'] += 1
+        task = create_task_without_budget(self._run(key, fn, load_cached))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, key=key: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        load_cached: Optional[Callable[[], Any]]
+    ) -> Any:
+        return await fn()
+
+    def _forget(self, key: str, task: asyncio.Task):
+        """완료된 작업 제거 (그 사이 새 작업이 등록되었다면 유지)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'local',
+            'inflight': len(self._inflight),
+            **self.stats
+        }
+
+
+class RedisSingleFlight(SingleFlight):
+    """
+    Redis 락 기반 single-flight (멀티 워커용)
+
+    워커 내부에서는 SingleFlight로 병합하고, 워커 간에는
+    `SET lock:crawl:{key} NX PX` 락을 잡은 워커만 크롤링합니다.
+    락을 못 잡은 워커는 캐시에 결과가 생기거나 락이 풀릴 때까지 폴링합니다.
+    """
+
+    shares_via_cache = True
+
+    # 자신이 잡은 락만 해제 (compare-and-delete)
+    RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, redis_client):
+        super().__init__()
+        self.redis_client = redis_client
+        self.lock_ttl_ms = int(os.getenv('CRAWL_LOCK_TTL_MS', 60000))
+        self.wait_timeout = float(os.getenv('CRAWL_LOCK_WAIT_SECONDS', 45))
+        self.poll_interval = float(os.getenv('CRAWL_LOCK_POLL_SECONDS', 0.5))
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        load_cached: Optional[Callable[[], Any]]
+    ) -> Any:
+        lock_key = f"lock:crawl:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await _maybe_await(
+                self.redis_client.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+            )
+        except Exception as e:
+            print(f"   ⚠️ Redis 락 오류: {e}, 로컬 병합만 사용")
+            return await fn()
+
+        if acquired:
+            try:
+                return await fn()
+            finally:
+                try:
+                    await _maybe_await(self.redis_client.eval(self.RELEASE_SCRIPT, 1, lock_key, token))
+                except Exception as e:
+                    print(f"   ⚠️ Redis 락 해제 오류: {e}")
+
+        # 다른 워커가 크롤링 중 → 결과가 캐시에 저장될 때까지 대기
+        print(f"   ⏳ 다른 워커의 크롤링 대기: {key}")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if load_cached is not None:
+                    cached = await _maybe_await(load_cached())
+                    if cached:
+                        return cached
+                if not await _maybe_await(self.redis_client.exists(lock_key)):
+                    break
+            except Exception as e:
+                print(f"   ⚠️ Redis 대기 중 오류: {e}")
+                break
+
+        # 타임아웃/락 해제 후에도 결과가 없으면 직접 크롤링
+        if load_cached is not None:
+            cached = await _maybe_await(load_cached())
+            if cached:
+                return cached
+        return await fn()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['backend'] = 'redis'
+        return stats
+
+
+# 싱글톤 인스턴스 (프로세스 내 모든 요청이 공유)
+_crawl_single_flight: Optional[SingleFlight] = None
+
+def get_crawl_single_flight(cache_service=None) -> SingleFlight:
+    """
+    크롤링용 single-flight 인스턴스 반환
+
+    CRAWL_SINGLE_FLIGHT=redis 이고 캐시 백엔드가 Redis면 Redis 락 변형을 사용합니다.
+    Redis 연결 오류 시에는 RedisSingleFlight가 로컬 병합으로 동작합니다.
+    """
+    global _crawl_single_flight
+    if _crawl_single_flight is None:
+        mode = os.getenv('CRAWL_SINGLE_FLIGHT', 'local').lower()
+        redis_client = getattr(cache_service, 'redis_client', None)
+        if mode == 'redis' and redis_client is not None:
+            _crawl_single_flight = RedisSingleFlight(redis_client)
+            print("🔒 Redis single-flight 사용 (워커 간 크롤링 병합)")
+        else:
+            _crawl_single_flight = SingleFlight()
+    return _crawl_single_flight
@@ -3,7 +3,6 @@ SSL 헬퍼 - SSL 인증서 문제 해결
 """
 
 import ssl
-import aiohttp
 
 def create_ssl_context():
     """SSL 인증서 검증을 비활성화한 컨텍스트 생성"""
@@ -13,7 +12,12 @@ def create_ssl_context():
     return ssl_context
 
 def create_http_session():
-    """SSL 문제를 해결한 HTTP 세션 생성"""
-    ssl_context = create_ssl_context()
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    return aiohttp.ClientSession(connector=connector)
\ No newline at end of file
+    """
+    SSL 문제를 해결한 공유 HTTP 세션 반환
+
+    매 호출마다 세션을 새로 만들지 않고 애플리케이션 전역 커넥션 풀을 빌려줍니다.
+    `async with create_http_session() as session:` 형태는 그대로 사용 가능하며,
+    블록을 빠져나가도 세션은 닫히지 않습니다.
+    """
+    from app.services.http_client import http_client_registry
+    return http_client_registry.borrow()
@@ -0,0 +1,148 @@
+"""
+2계층 크롤링 캐시 (L1 메모리 + L2 Redis)
+
+- L1: 워커 프로세스 내 BoundedMemoryCache (짧은 TTL로 워커 간 수렴)
+- L2: RedisCacheService (30일 soft TTL, 워커 간 공유)
+- 조회: L1 → L2 순서로 읽고, L2 히트는 L1에 채움 (read-through)
+- 저장: L1에 즉시 반영하고 L2 저장은 백그라운드에서 모아서 처리 (write-behind)
+
+인기 검색 키(예: "서울_맛집")는 네트워크 왕복/역직렬화 없이 로컬 메모리에서 응답합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.crawl_cache_service import MISSING_ENTRY, CachedPlaces
+from app.services.memory_cache import BoundedMemoryCache
+from app.services.redis_cache_service import RedisCacheService
+
+
+class TieredCrawlCache:
+    """L1 메모리 + L2 Redis 크롤링 캐시 (CrawlCacheService와 같은 인터페이스)"""
+    
+    def __init__(self, l2: Optional[RedisCacheService] = None):
+        self.l2 = l2 or RedisCacheService()
+        self.redis_client = self.l2.redis_client  # single-flight 락용
+        
+        self.l1 = BoundedMemoryCache(
+            max_entries=int(os.getenv('CRAWL_L1_MAX_ENTRIES', 256)),
+            max_bytes=int(float(os.getenv('CRAWL_L1_MAX_MB', 32)) * 1024 * 1024),
+            ttl_seconds=float(os.getenv('CRAWL_L1_TTL_SECONDS', 60))
+        )
+        
+        # write-behind 대기열 (같은 키는 마지막 값만 저장)
+        self.write_behind_delay = float(os.getenv('CRAWL_WRITE_BEHIND_DELAY_MS', 50)) / 1000
+        self._pending: Dict[str, CachedPlaces] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.write_behind_stats = {'queued': 0, 'flushed': 0, 'batches': 0, 'errors': 0}
+    
+    @staticmethod
+    def _copy(places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """L1 값은 요청 간 공유되므로 장소 dict는 복사해서 반환"""
+        return [dict(place) for place in places]
+    
+    def generate_search_key(self, city: str, keyword: str) -> str:
+        return self.l2.generate_search_key(city, keyword)
+    
+    async def get_cached_data(self, search_key: str) -> List[Dict[str, Any]]:
+        """L1 → L2 순서로 조회 (L2 히트는 L1에 채움)"""
+        entries = await self.get_many_entries([search_key])
+        return entries[search_key].places
+    
+    async def get_many(self, search_keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """L1에 없는 키만 L2에서 MGET으로 조회"""
+        entries = await self.get_many_entries(search_keys)
+        return {key: entry.places for key, entry in entries.items()}
+    
+    async def get_many_entries(self, search_keys: List[str]) -> Dict[str, CachedPlaces]:
+        """L1 → 대기 중인 write-behind → L2(MGET) 순서로 조회 (저장 시각 포함)"""
+        results: Dict[str, CachedPlaces] = {}
+        missing = []
+        for key in search_keys:
+            entry = self.l1.get(key) or self._pending.get(key)
+            if entry is not None:
+                results[key] = CachedPlaces(self._copy(entry.places), entry.stored_at)
+            else:
+                missing.append(key)
+        
+        if missing:
+            l2_results = await self.l2.get_many_entries(missing)
+            for key in missing:
+                entry = l2_results.get(key) or MISSING_ENTRY
+                if entry.places:
+                    self.l1.set(key, entry)
+                    entry = CachedPlaces(self._copy(entry.places), entry.stored_at)
+                results[key] = entry
+        
+        return results
+    
+    async def save_crawled_data(self, search_key: str, places_data: List[Dict[str, Any]]):
+        """
+        L1 + L2에 바로 저장 (write-through)
+        
+        다른 워커가 L2를 폴링해 결과를 기다리는 경우(Redis single-flight)에 사용합니다.
+        """
+        cached_places = self.l2._compact_places(places_data)
+        self.l1.set(search_key, CachedPlaces(cached_places, time.time()))
+        await self.l2.save_crawled_data(search_key, places_data)
+    
+    async def set_many(self, mapping: Dict[str, List[Dict[str, Any]]]):
+        """L1에 즉시 저장하고 L2 저장은 백그라운드로 미룸 (write-behind)"""
+        stored_at = time.time()
+        for search_key, places_data in mapping.items():
+            entry = CachedPlaces(self.l2._compact_places(places_data), stored_at)
+            self.l1.set(search_key, entry)
+            self._pending[search_key] = entry
+            self.write_behind_stats['queued'] += 1
+        
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        """잠깐 모았다가 L2에 파이프라인으로 저장"""
+        await asyncio.sleep(self.write_behind_delay)
+        await self.flush()
+    
+    async def flush(self):
+        """대기 중인 write-behind 항목을 L2에 저장"""
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            try:
+                await self.l2.set_many({key: entry.places for key, entry in batch.items()})
+                self.write_behind_stats['flushed'] += len(batch)
+                self.write_behind_stats['batches'] += 1
+            except Exception as e:
+                self.write_behind_stats['errors'] += 1
+                print(f"   ⚠️ L2 write-behind 저장 실패: {e}")
+                break
+    
+    def cleanup_expired_cache(self) -> int:
+        return self.l1.cleanup_expired() + self.l2.cleanup_expired_cache()
+    
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        stats = await self.l2.get_cache_stats()
+        stats['l1'] = self.l1.get_stats()
+        stats['write_behind'] = {**self.write_behind_stats, 'pending': len(self._pending)}
+        return stats
+    
+    async def clear_all_cache(self):
+        self.l1.clear()
+        self._pending.clear()
+        return await self.l2.clear_all_cache()
+
+
+# 싱글톤 인스턴스 (워커 내 모든 요청이 L1 공유)
+_tiered_crawl_cache: Optional[TieredCrawlCache] = None
+
+def get_tiered_crawl_cache() -> TieredCrawlCache:
+    global _tiered_crawl_cache
+    if _tiered_crawl_cache is None:
+        _tiered_crawl_cache = TieredCrawlCache()
+    return _tiered_crawl_cache
+
+async def flush_tiered_crawl_cache():
+    """종료 시 남은 write-behind 항목 저장"""
+    if _tiered_crawl_cache is not None:
+        await _tiered_crawl_cache.flush()
@@ -0,0 +1,83 @@
+"""
+중복 검사용 색인
+
+PlaceQualityService.is_duplicate가 사용된 장소 전체를 매번 비교하지 않도록
+유사할 가능성이 있는 후보만 골라 주는 색인입니다. 최종 판정은 similarity 모듈이 합니다.
+
+- NgramIndex: 정규화된 이름/주소의 글자 2-gram 역색인 + q-gram 개수 필터
+  편집 거리 k 이하인 두 문자열은 최소 (긴 길이 - 1 - 2k)개의 2-gram을 공유하므로,
+  임계값을 넘을 수 없는 후보는 유사도 계산 없이 제외됩니다 (누락 없음).
+- 좌표 중복(50m)은 app.utils.spatial_index.SpatialIndex를 사용합니다.
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Set
+
+from app.utils.similarity import normalize_place_name
+
+
+def _bigrams(text: str) -> Counter:
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
+
+
+class NgramIndex:
+    """
+    정규화 문자열 2-gram 역색인
+    
+    candidates()는 calculate_similarity(text, 저장된 문자열) >= threshold가 될 수 있는
+    모든 id를 반환합니다 (포함 관계 0.9 규칙 포함).
+    """
+    
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        # 2-gram → {id: 등장 횟수}
+        self._grams: Dict[str, Dict[int, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        # 정규화 후 1글자 이하 (2-gram이 없어 역색인으로 찾을 수 없음 → 항상 후보)
+        self._short: Set[int] = set()
+    
+    def __len__(self) -> int:
+        return len(self._lengths)
+    
+    def add(self, item_id: int, text: str):
+        normalized = normalize_place_name(text)
+        self._lengths[item_id] = len(normalized)
+        if len(normalized) <= 1:
+            self._short.add(item_id)
+            return
+        for gram, count in _bigrams(normalized).items():
+            self._grams.setdefault(gram, {})[item_id] = count
+    
+    def _min_shared(self, query_length: int, length: int) -> int:
+        """유사도 임계값(또는 포함 관계)을 만족하려면 공유해야 하는 최소 2-gram 수"""
+        longest = max(query_length, length)
+        max_distance = math.floor((1.0 - self.threshold) * longest + 1e-9)
+        # 한쪽이 다른 쪽에 포함되면 짧은 쪽 2-gram은 모두 공유
+        return min(longest - 1 - 2 * max_distance, min(query_length, length) - 1)
+    
+    def candidates(self, text: str) -> List[int]:
+        """비교가 필요한 id 목록 (추가 순서)"""
+        normalized = normalize_place_name(text)
+        query_length = len(normalized)
+        
+        # 짧은 질의이거나 임계값이 낮아 2-gram을 하나도 공유하지 않는 후보도 통과할 수 있으면 전체 비교
+        if query_length <= 1 or query_length * (2 * self.threshold - 1) - 1 <= 0:
+            return sorted(self._lengths)
+        
+        shared: Dict[int, int] = {}
+        for gram, count in _bigrams(normalized).items():
+            for item_id, item_count in self._grams.get(gram, {}).items():
+                shared[item_id] = shared.get(item_id, 0) + min(count, item_count)
+        
+        result = [
+            item_id for item_id, shared_count in shared.items()
+            if shared_count >= self._min_shared(query_length, self._lengths[item_id])
+        ]
+        result.extend(self._short)
+        return sorted(set(result))
+    
+    def clear(self):
+        self._grams.clear()
+        self._lengths.clear()
+        self._short.clear()
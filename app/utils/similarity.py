@@ -2,83 +2,174 @@
 문자열 유사도 검사 유틸리티
 
 장소 이름의 유사도를 계산하여 중복 여부를 판단합니다.
+
+- 편집 거리: 비트 병렬(Myers/Hyyrö) 알고리즘, 한 글자당 정수 연산 몇 번으로 한 열을 계산
+- 임계값이 있으면 도달 불가능해지는 즉시 중단 (길이 차이 / 남은 글자 수 기준)
+- 정규화 결과와 비교 패턴(문자별 비트마스크)은 LRU 캐시에 보관
+- 한 이름을 여러 후보와 비교하는 배치 API (similarity_many, find_similar)
 """
 
-from typing import Tuple
+import math
+import os
 import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
+# 정규화/패턴 캐시 크기 (프로세스당)
+_CACHE_SIZE = int(os.getenv('SIMILARITY_CACHE_SIZE', 8192))
 
-def levenshtein_distance(s1: str, s2: str) -> int:
-    """Levenshtein Distance 계산 (편집 거리)"""
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
-    
-    if len(s2) == 0:
-        return len(s1)
+# 공백 + 특수문자 (\w와 한글 외 전부)
+_NON_WORD = re.compile(r'[^\w가-힣]')
+# 지점명 접미사 (예: "스타벅스 강남점" -> "스타벅스강남")
+_BRANCH_SUFFIX = re.compile(r'(점|지점|매장|본점|분점)$')
+
+# 한 문자열이 다른 문자열에 포함될 때의 유사도
+CONTAINMENT_SIMILARITY = 0.9
+
+
+class _BitPattern:
+    """편집 거리 비교용 패턴 (문자 → 등장 위치 비트마스크)"""
     
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            # 삽입, 삭제, 대체 비용 계산
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+    __slots__ = ('text', 'length', 'peq', 'full', 'last')
     
-    return previous_row[-1]
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        peq: Dict[str, int] = {}
+        for i, ch in enumerate(text):
+            peq[ch] = peq.get(ch, 0) | (1 << i)
+        self.peq = peq
+        self.full = (1 << self.length) - 1
+        self.last = 1 << (self.length - 1) if self.length else 0
 
 
-def normalize_place_name(name: str) -> str:
-    """장소 이름 정규화"""
-    if not name:
-        return ""
-    
-    # 소문자 변환
-    name = name.lower()
+@lru_cache(maxsize=_CACHE_SIZE)
+def _pattern(text: str) -> _BitPattern:
+    return _BitPattern(text)
+
+
+def _bit_parallel_distance(pattern: _BitPattern, text: str, max_distance: Optional[int] = None) -> int:
+    """
+    Myers/Hyyrö 비트 병렬 편집 거리
     
-    # 공백 정규화
-    name = re.sub(r'\s+', '', name)
+    max_distance를 넘는 것이 확실해지면 max_distance + 1을 반환합니다.
+    """
+    m = pattern.length
+    n = len(text)
+    if m == 0:
+        return n
+    if n == 0:
+        return m
     
-    # 특수문자 제거
-    name = re.sub(r'[^\w가-힣]', '', name)
+    peq = pattern.peq
+    full = pattern.full
+    last = pattern.last
+    pv = full
+    mv = 0
+    score = m
     
-    # 지점명 제거 (예: "스타벅스 강남점" -> "스타벅스강남")
-    name = re.sub(r'(점|지점|매장|본점|분점)$', '', name)
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        
+        # 남은 글자마다 거리는 최대 1씩만 줄어듦
+        if max_distance is not None and score - (n - j - 1) > max_distance:
+            return max_distance + 1
+        
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
     
-    return name
+    return score
 
 
-def calculate_similarity(s1: str, s2: str) -> float:
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
     """
-    두 문자열의 유사도 계산 (0.0 ~ 1.0)
+    Levenshtein Distance 계산 (편집 거리)
     
-    Returns:
-        1.0: 완전히 동일
-        0.0: 완전히 다름
+    Args:
+        max_distance: 지정하면 이 값을 넘는 순간 계산을 멈추고 max_distance + 1 반환
     """
-    # 정규화
-    s1_norm = normalize_place_name(s1)
-    s2_norm = normalize_place_name(s2)
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return max_distance + 1
+    if s1 == s2:
+        return 0
     
+    # 짧은 쪽을 패턴(비트마스크)으로 사용
+    return _bit_parallel_distance(_pattern(s2), s1, max_distance)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def normalize_place_name(name: str) -> str:
+    """장소 이름 정규화 (소문자, 공백/특수문자 제거, 지점명 접미사 제거)"""
+    if not name:
+        return ""
+    
+    name = _NON_WORD.sub('', name.lower())
+    return _BRANCH_SUFFIX.sub('', name)
+
+
+def _max_distance_for(threshold: Optional[float], max_len: int) -> Optional[int]:
+    """유사도 임계값 → 허용 가능한 최대 편집 거리"""
+    if threshold is None:
+        return None
+    # 부동소수점 오차로 경계값이 빠지지 않도록 약간 여유
+    return max(0, math.floor((1.0 - threshold) * max_len + 1e-9))
+
+
+def _normalized_similarity(
+    s1_norm: str,
+    s2_norm: str,
+    threshold: Optional[float] = None,
+    pattern: Optional[_BitPattern] = None
+) -> float:
+    """정규화된 두 문자열의 유사도 (pattern은 s1_norm의 미리 만든 패턴)"""
     # 완전 일치
     if s1_norm == s2_norm:
         return 1.0
     
     # 한 문자열이 다른 문자열에 포함되는 경우
     if s1_norm in s2_norm or s2_norm in s1_norm:
-        return 0.9
+        return CONTAINMENT_SIMILARITY
     
-    # Levenshtein 거리 기반 유사도
     max_len = max(len(s1_norm), len(s2_norm))
-    if max_len == 0:
-        return 0.0
+    max_distance = _max_distance_for(threshold, max_len)
+    
+    # 길이 차이만으로 임계값에 도달할 수 없으면 편집 거리 계산 생략
+    length_gap = abs(len(s1_norm) - len(s2_norm))
+    if max_distance is not None and length_gap > max_distance:
+        return 1.0 - length_gap / max_len
+    
+    if pattern is not None:
+        distance = _bit_parallel_distance(pattern, s2_norm, max_distance)
+    else:
+        distance = levenshtein_distance(s1_norm, s2_norm, max_distance)
+    return 1.0 - (distance / max_len)
+
+
+def calculate_similarity(s1: str, s2: str, threshold: Optional[float] = None) -> float:
+    """
+    두 문자열의 유사도 계산 (0.0 ~ 1.0)
     
-    distance = levenshtein_distance(s1_norm, s2_norm)
-    similarity = 1.0 - (distance / max_len)
+    Args:
+        threshold: 지정하면 이 값에 도달할 수 없다고 판단되는 즉시 중단합니다.
+            이때 반환값은 threshold보다 작다는 것만 보장됩니다 (정확한 유사도 아님).
     
-    return similarity
+    Returns:
+        1.0: 완전히 동일
+        0.0: 완전히 다름
+    """
+    return _normalized_similarity(normalize_place_name(s1), normalize_place_name(s2), threshold)
 
 
 def are_similar_places(name1: str, name2: str, threshold: float = 0.85) -> bool:
@@ -94,18 +185,47 @@ def are_similar_places(name1: str, name2: str, threshold: float = 0.85) -> bool:
         True: 유사함 (중복으로 간주)
         False: 다름
     """
-    similarity = calculate_similarity(name1, name2)
+    similarity = calculate_similarity(name1, name2, threshold=threshold)
     return similarity >= threshold
 
 
+def similarity_many(name: str, candidates: Iterable[str], threshold: Optional[float] = None) -> List[float]:
+    """
+    한 이름을 여러 후보와 비교 (후보 순서대로 유사도 목록)
+    
+    기준 이름의 정규화와 비트마스크 패턴은 한 번만 만듭니다.
+    threshold를 지정하면 calculate_similarity와 같이 임계값 미만 후보는 일찍 중단합니다.
+    """
+    query = normalize_place_name(name)
+    pattern = _pattern(query) if query else None
+    return [
+        _normalized_similarity(query, normalize_place_name(candidate), threshold, pattern)
+        for candidate in candidates
+    ]
+
+
+def find_similar(name: str, candidates: Iterable[str], threshold: float = 0.85) -> Optional[Tuple[int, float]]:
+    """
+    임계값 이상인 첫 번째 후보 찾기
+    
+    Returns:
+        (후보 인덱스, 유사도) 또는 None
+    """
+    query = normalize_place_name(name)
+    pattern = _pattern(query) if query else None
+    for index, candidate in enumerate(candidates):
+        similarity = _normalized_similarity(query, normalize_place_name(candidate), threshold, pattern)
+        if similarity >= threshold:
+            return index, similarity
+    return None
+
+
 def calculate_coordinate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """
     두 좌표 간의 거리 계산 (미터 단위)
     
     Haversine formula 사용
     """
-    import math
-    
     # 지구 반지름 (미터)
     R = 6371000
     
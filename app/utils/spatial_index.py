@@ -0,0 +1,188 @@
+"""
+공간 색인 (격자 버킷 + 선택적 KD-tree)
+
+좌표를 일정 크기(cell_meters)의 위경도 격자 칸에 넣어 두고, 질의 지점 주변 칸만 보고
+반경 / k-최근접 / "N미터 이내" 질의에 답합니다. 최종 거리는 항상 calculate_coordinate_distance
+(haversine, 미터)로 다시 계산하므로 결과는 전체 비교와 같습니다.
+
+- candidates(): 반경 안에 있을 수 있는 모든 id (후보, 거리 미계산)
+- within(): 반경 안의 (id, 거리) 목록 (거리순)
+- nearest(): 가장 가까운 k개 (거리순, 같은 거리면 id 순) — 반경을 두 배씩 넓히며 탐색
+- remove(): 최근접 이웃 경로 탐색처럼 방문한 지점을 빼 가며 질의할 때 사용
+- freeze(): 더 이상 바뀌지 않는 점 집합이면 KD-tree를 만들어 사용 (scipy 설치 시, 선택)
+
+경도 방향 칸은 위도에 따라 좁아지므로 cos(위도)에 맞춰 조회 열 수를 늘립니다.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.similarity import calculate_coordinate_distance
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+EARTH_RADIUS_M = 6371000
+
+# 위도 1도의 길이 (미터, calculate_coordinate_distance와 같은 지구 반지름)
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+# 이보다 적은 점 집합은 KD-tree 없이 격자만 사용
+KDTREE_MIN_POINTS = 256
+
+
+def _unit_vector(lat: float, lng: float) -> Tuple[float, float, float]:
+    lat_rad, lng_rad = math.radians(lat), math.radians(lng)
+    return (math.cos(lat_rad) * math.cos(lng_rad), math.cos(lat_rad) * math.sin(lng_rad), math.sin(lat_rad))
+
+
+def _chord(meters: float) -> float:
+    """대원 거리(미터) → 단위구 현 길이"""
+    return 2 * math.sin(min(meters / EARTH_RADIUS_M, math.pi) / 2)
+
+
+class SpatialIndex:
+    """
+    위경도 격자 색인
+    
+    id는 호출하는 쪽이 정합니다 (보통 원본 리스트의 인덱스).
+    """
+    
+    def __init__(self, cell_meters: float = 500.0):
+        self.cell_meters = cell_meters
+        self.cell_degrees = cell_meters / METERS_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._kdtree = None
+        self._kdtree_ids: List[int] = []
+    
+    @classmethod
+    def from_points(cls, points: Iterable[Tuple[int, float, float]], cell_meters: float = 500.0) -> 'SpatialIndex':
+        """(id, lat, lng) 목록으로 색인 생성"""
+        index = cls(cell_meters)
+        for item_id, lat, lng in points:
+            index.add(item_id, lat, lng)
+        return index
+    
+    def __len__(self) -> int:
+        return len(self._points)
+    
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._points
+    
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+    
+    def add(self, item_id: int, lat: float, lng: float):
+        if item_id in self._points:
+            self.remove(item_id)
+        self._points[item_id] = (lat, lng)
+        self._cells.setdefault(self._cell(lat, lng), []).append(item_id)
+        self._kdtree = None
+    
+    def remove(self, item_id: int):
+        point = self._points.pop(item_id, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        ids = self._cells[cell]
+        ids.remove(item_id)
+        if not ids:
+            del self._cells[cell]
+        self._kdtree = None
+    
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+        self._kdtree = None
+        self._kdtree_ids = []
+    
+    def freeze(self) -> 'SpatialIndex':
+        """
+        점 집합이 고정되었을 때 KD-tree 생성 (scipy가 없거나 점이 적으면 격자 유지)
+        
+        이후 add/remove를 하면 KD-tree는 버리고 격자로 돌아갑니다.
+        """
+        if SCIPY_AVAILABLE and len(self._points) >= KDTREE_MIN_POINTS:
+            self._kdtree_ids = list(self._points)
+            self._kdtree = cKDTree([_unit_vector(*self._points[item_id]) for item_id in self._kdtree_ids])
+        return self
+    
+    def distance(self, item_id: int, lat: float, lng: float) -> float:
+        """저장된 점까지의 거리 (미터)"""
+        point_lat, point_lng = self._points[item_id]
+        return calculate_coordinate_distance(lat, lng, point_lat, point_lng)
+    
+    def candidates(self, lat: float, lng: float, radius_m: float) -> List[int]:
+        """반경 radius_m 안에 있을 수 있는 모든 id (id 순, 거리 미확인)"""
+        row, col = self._cell(lat, lng)
+        row_radius = math.ceil(radius_m / self.cell_meters)
+        farthest_lat = min(abs(lat) + row_radius * self.cell_degrees, 89.0)
+        col_radius = math.ceil(row_radius * 1.01 / math.cos(math.radians(farthest_lat)))
+        
+        # 조회할 칸이 채워진 칸보다 많으면 채워진 칸을 훑는 편이 빠름
+        if (2 * row_radius + 1) * (2 * col_radius + 1) > len(self._cells):
+            result = [
+                item_id
+                for (cell_row, cell_col), ids in self._cells.items()
+                if abs(cell_row - row) <= row_radius and abs(cell_col - col) <= col_radius
+                for item_id in ids
+            ]
+        else:
+            result = []
+            for d_row in range(-row_radius, row_radius + 1):
+                for d_col in range(-col_radius, col_radius + 1):
+                    result.extend(self._cells.get((row + d_row, col + d_col), ()))
+        return sorted(result)
+    
+    def within(self, lat: float, lng: float, radius_m: float) -> List[Tuple[int, float]]:
+        """반경 radius_m 안의 (id, 거리) 목록 (가까운 순)"""
+        if self._kdtree is not None:
+            ids = [self._kdtree_ids[i] for i in self._kdtree.query_ball_point(_unit_vector(lat, lng), _chord(radius_m) * 1.000001)]
+        else:
+            ids = self.candidates(lat, lng, radius_m)
+        
+        found = []
+        for item_id in ids:
+            distance = self.distance(item_id, lat, lng)
+            if distance <= radius_m:
+                found.append((item_id, distance))
+        found.sort(key=lambda pair: (pair[1], pair[0]))
+        return found
+    
+    def nearest(self, lat: float, lng: float, k: int = 1, max_distance_m: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        가장 가까운 k개의 (id, 거리) (가까운 순, 같은 거리면 id가 작은 쪽 우선)
+        
+        max_distance_m을 주면 그보다 먼 점은 제외합니다.
+        """
+        if not self._points or k <= 0:
+            return []
+        
+        if self._kdtree is not None:
+            count = min(k, len(self._kdtree_ids))
+            _, positions = self._kdtree.query(_unit_vector(lat, lng), k=count)
+            positions = [positions] if count == 1 else list(positions)
+            found = [(self._kdtree_ids[i], self.distance(self._kdtree_ids[i], lat, lng)) for i in positions]
+        else:
+            # 반경을 두 배씩 넓히며 k개가 반경 안에 들어올 때까지 탐색 (반경 밖 점은 반경 안 점보다 멂)
+            radius = self.cell_meters
+            while True:
+                found = self.within(lat, lng, radius)
+                if len(found) >= k or len(found) == len(self._points):
+                    break
+                if max_distance_m is not None and radius >= max_distance_m:
+                    break
+                if (2 * math.ceil(radius / self.cell_meters) + 1) ** 2 > len(self._cells):
+                    # 거의 모든 칸을 보게 되면 전체 비교
+                    found = [(item_id, self.distance(item_id, lat, lng)) for item_id in self._points]
+                    break
+                radius *= 2
+        
+        if max_distance_m is not None:
+            found = [pair for pair in found if pair[1] <= max_distance_m]
+        found.sort(key=lambda pair: (pair[1], pair[0]))
+        return found[:k]
@@ -250,6 +250,18 @@ async function handleFormSubmit() {
     }
 }
 
+// 진행 로그 한 줄 추가 (아이콘만 고정 마크업, 서버/LLM 텍스트는 textContent로 넣어 HTML 해석 방지)
+function appendProgressLog(progressLog, className, iconClass, text) {
+    const logItem = document.createElement('div');
+    logItem.className = className;
+    const icon = document.createElement('i');
+    icon.className = `fas ${iconClass} mr-2`;
+    logItem.appendChild(icon);
+    logItem.appendChild(document.createTextNode(text));
+    progressLog.appendChild(logItem);
+    progressLog.scrollTop = progressLog.scrollHeight;
+}
+
 // 🆕 SSE 스트리밍 방식으로 여행 계획 생성
 async function handleFormSubmitWithSSE(requestData) {
     const progressLog = document.getElementById('progressLog');
@@ -269,27 +281,39 @@ async function handleFormSubmitWithSSE(requestData) {
         
         const reader = response.body.getReader();
         const decoder = new TextDecoder();
+        let buffer = '';
         
         while (true) {
             const { done, value } = await reader.read();
             if (done) break;
             
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
+            // 이벤트가 여러 청크로 나뉘어 올 수 있으므로 빈 줄 단위로 끊어서 처리
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
             
-            for (const line of lines) {
+            for (const line of events) {
                 if (line.startsWith('data: ')) {
                     const jsonStr = line.substring(6);
                     try {
                         const data = JSON.parse(jsonStr);
                         
-                        if (data.type === 'status' || data.type === 'info') {
+                        if (data.type === 'item') {
+                            // 생성되는 일정 항목 즉시 표시 (LLM 출력이므로 텍스트로만 표시)
+                            appendProgressLog(
+                                progressLog,
+                                'text-gray-700',
+                                'fa-map-marker-alt',
+                                `${data.item.day ? data.item.day + '일차 ' : ''}${data.item.time || ''} ${data.item.place_name || ''}`
+                            );
+                        } else if (data.type === 'status' || data.type === 'info') {
                             // 로그 추가
-                            const logItem = document.createElement('div');
-                            logItem.className = data.type === 'status' ? 'text-blue-700' : 'text-green-600';
-                            logItem.innerHTML = `<i class="fas fa-check-circle mr-2"></i>${data.message}`;
-                            progressLog.appendChild(logItem);
-                            progressLog.scrollTop = progressLog.scrollHeight;
+                            appendProgressLog(
+                                progressLog,
+                                data.type === 'status' ? 'text-blue-700' : 'text-green-600',
+                                'fa-check-circle',
+                                data.message || ''
+                            );
                             
                             // 진행률 업데이트
                             if (data.progress) {
@@ -304,7 +328,7 @@ async function handleFormSubmitWithSSE(requestData) {
                             throw new Error(data.message);
                         }
                     } catch (e) {
-                        if (e.message) {
+                        if (!(e instanceof SyntaxError)) {
                             throw e;
                         }
                         console.log('JSON 파싱 무시:', jsonStr);
@@ -0,0 +1,111 @@
+"""
+캐시 값 코덱 왕복 테스트
+
+압축 방식(zstd/zlib/none), 압축 임계값 미만 값, v1 헤더 / 헤더 없는 기존 JSON 값을 확인합니다.
+"""
+
+import json
+import zlib
+
+import pytest
+
+from app.services.cache_codec import (
+    CacheCodec,
+    CacheCodecError,
+    MSGPACK_AVAILABLE,
+    ZSTD_AVAILABLE,
+)
+
+PLACES = [
+    {
+        'name': f'장소 {i}',
+        'address': '서울특별시 중구 세종대로 110',
+        'lat': 37.5665 + i * 0.001,
+        'lng': 126.9780 - i * 0.001,
+        'rating': None if i % 3 == 0 else 4.5,
+        'tags': ['카페', '야경'],
+    }
+    for i in range(40)
+]
+
+# 필드 구성이 서로 다른 dict (누락 필드와 None 값 구분 확인)
+MIXED_PLACES = [
+    {'name': '경복궁', 'rating': None},
+    {'name': '남산타워', 'lat': 37.5512},
+    {'name': '광장시장', 'rating': 4.2, 'lat': 37.57, 'lng': 126.99},
+]
+
+SERIALIZERS = ['json'] + (['msgpack'] if MSGPACK_AVAILABLE else [])
+
+
+def _compression_byte(codec: CacheCodec) -> int:
+    """코덱이 실제로 쓰는 압축 방식의 헤더 값 (zstd 미설치 시 zlib)"""
+    return {
+        'zstd': CacheCodec.COMPRESS_ZSTD,
+        'zlib': CacheCodec.COMPRESS_ZLIB,
+        'none': CacheCodec.COMPRESS_NONE,
+    }[codec.compression]
+
+
+@pytest.mark.parametrize('serializer', SERIALIZERS)
+@pytest.mark.parametrize('compression', ['zstd', 'zlib', 'none'])
+@pytest.mark.parametrize('value', [PLACES, MIXED_PLACES, {'key': '값', 'items': [1, 2, 3]}, [], '문자열'])
+def test_round_trip(serializer, compression, value):
+    codec = CacheCodec(serializer=serializer, compression=compression, compress_min_bytes=0)
+    data = codec.encode(value, stored_at=1_700_000_000)
+    
+    assert data.startswith(CacheCodec.MAGIC)
+    assert data[len(CacheCodec.MAGIC) + 2] == _compression_byte(codec)
+    assert codec.decode_entry(data) == (value, 1_700_000_000)
+
+
+@pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard 미설치")
+def test_zstd_entry_decodes_with_fresh_codec():
+    data = CacheCodec(compression='zstd', compress_min_bytes=0).encode(PLACES)
+    
+    assert data[len(CacheCodec.MAGIC) + 2] == CacheCodec.COMPRESS_ZSTD
+    assert CacheCodec(compression='zstd').decode(data) == PLACES
+
+
+@pytest.mark.parametrize('compression', ['zstd', 'zlib'])
+def test_below_threshold_is_not_compressed(compression):
+    codec = CacheCodec(compression=compression, compress_min_bytes=1 << 20)
+    data = codec.encode(PLACES)
+    
+    assert data[len(CacheCodec.MAGIC) + 2] == CacheCodec.COMPRESS_NONE
+    assert codec.decode_entry(data) == (PLACES, None)
+
+
+@pytest.mark.parametrize('level', [-5, 0, 3, 19, 99])
+def test_out_of_range_level_is_clamped(level):
+    codec = CacheCodec(compression='zlib', compress_min_bytes=0, level=level)
+    
+    assert codec.decode(codec.encode(PLACES)) == PLACES
+
+
+def test_v1_entry_has_no_stored_at():
+    codec = CacheCodec(serializer='json', compression='zlib')
+    payload = zlib.compress(json.dumps(PLACES).encode('utf-8'))
+    data = CacheCodec.MAGIC + bytes((1, CacheCodec.FORMAT_JSON, CacheCodec.COMPRESS_ZLIB)) + payload
+    
+    assert codec.decode_entry(data) == (PLACES, None)
+
+
+@pytest.mark.parametrize('legacy', [json.dumps(PLACES, ensure_ascii=False), json.dumps(PLACES).encode('utf-8')])
+def test_legacy_json_without_header(legacy):
+    assert CacheCodec().decode_entry(legacy) == (PLACES, None)
+
+
+def test_none_decodes_to_none():
+    assert CacheCodec().decode_entry(None) == (None, None)
+
+
+@pytest.mark.parametrize('data', [
+    CacheCodec.MAGIC + b'\x02',
+    CacheCodec.MAGIC + bytes((9, CacheCodec.FORMAT_JSON, CacheCodec.COMPRESS_NONE)) + b'00000000[]',
+    CacheCodec.MAGIC + bytes((2, ord('?'), CacheCodec.COMPRESS_NONE)) + b'00000000[]',
+    CacheCodec.MAGIC + bytes((2, CacheCodec.FORMAT_JSON, ord('?'))) + b'00000000[]',
+])
+def test_invalid_header_raises(data):
+    with pytest.raises(CacheCodecError):
+        CacheCodec().decode(data)
@@ -0,0 +1,62 @@
+"""
+중복 검사 색인 테스트
+
+NgramIndex.candidates()가 전체 비교에서 임계값을 넘는 항목을 하나도 빠뜨리지 않는지
+무작위 이름으로 확인합니다.
+"""
+
+import random
+
+import pytest
+
+from app.utils.dedup_index import NgramIndex
+from app.utils.similarity import calculate_similarity
+
+ALPHABET = 'abc가나다 점'
+
+
+def _random_names(rng: random.Random, count: int):
+    base = [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 14))) for _ in range(count // 3)]
+    names = list(base)
+    while len(names) < count:
+        chars = list(rng.choice(base))
+        for _ in range(rng.randint(1, 4)):
+            position = rng.randint(0, len(chars))
+            if rng.random() < 0.5 or not chars:
+                chars.insert(position, rng.choice(ALPHABET))
+            else:
+                chars[min(position, len(chars) - 1)] = rng.choice(ALPHABET)
+        names.append(''.join(chars))
+    rng.shuffle(names)
+    return names
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_candidates_cover_brute_force_matches(threshold, seed):
+    rng = random.Random(seed)
+    stored = _random_names(rng, 150)
+    queries = _random_names(rng, 150)
+    
+    index = NgramIndex(threshold)
+    for item_id, name in enumerate(stored):
+        index.add(item_id, name)
+    assert len(index) == len(stored)
+    
+    for query in queries:
+        expected = {
+            item_id for item_id, name in enumerate(stored)
+            if calculate_similarity(query, name) >= threshold
+        }
+        candidates = index.candidates(query)
+        assert candidates == sorted(set(candidates))
+        assert expected <= set(candidates), (query, sorted(expected - set(candidates)))
+
+
+def test_clear():
+    index = NgramIndex(0.85)
+    index.add(0, '경복궁')
+    index.clear()
+    
+    assert len(index) == 0
+    assert index.candidates('경복궁') == []
@@ -0,0 +1,127 @@
+"""
+일정 JSON 파서 테스트
+
+완전한 응답, 코드 펜스/설명 문장/주석이 섞인 응답, 중간에 잘린 응답의 파싱 결과와
+스트리밍 중 schedule 항목이 닫힐 때마다 나오는 항목 이벤트를 확인합니다.
+"""
+
+import json
+
+import pytest
+
+from app.services.itinerary_json_parser import (
+    PARSE_COMPLETE,
+    PARSE_FAILED,
+    PARSE_REPAIRED,
+    PARSE_SALVAGED,
+    ScheduleItemStreamParser,
+    clean_json_text,
+    parse_itinerary_json,
+)
+
+ITEMS = [
+    {'time': '09:00', 'place_name': '경복궁', 'description': '조선 궁궐 {정문} 광화문 [입장]'},
+    {'time': '11:00', 'place_name': '광장시장', 'location': {'lat': 37.57, 'lng': 126.99}, 'tags': ['먹거리', '빈대떡']},
+    {'time': '14:00', 'place_name': '남산타워', 'description': '따옴표 \\" 와 역슬래시 \\\\ 포함'},
+]
+FULL = json.dumps({'title': '서울 여행', 'schedule': ITEMS}, ensure_ascii=False, indent=2)
+
+
+def _cut_before(text: str, marker: str, offset: int = 0) -> str:
+    """marker가 처음 나오는 위치(+offset)에서 자른 응답"""
+    return text[:text.index(marker) + offset]
+
+
+PARSE_CASES = [
+    # (설명, 응답, 상태, schedule의 place_name 목록)
+    ('complete', FULL, PARSE_COMPLETE, ['경복궁', '광장시장', '남산타워']),
+    ('top-level array', json.dumps(ITEMS, ensure_ascii=False), PARSE_COMPLETE, ['경복궁', '광장시장', '남산타워']),
+    ('code fence', f"```json\n{FULL}\n```", PARSE_REPAIRED, ['경복궁', '광장시장', '남산타워']),
+    ('prose around', f"다음은 일정입니다.\n{FULL}\n즐거운 여행 되세요!", PARSE_REPAIRED, ['경복궁', '광장시장', '남산타워']),
+    (
+        'comments and trailing commas',
+        '{\n  // 일정\n  "schedule": [\n    {"place_name": "경복궁", /* 궁궐 */ "time": "09:00",},\n'
+        '    {"place_name": "http://a.b/#c", "time": "10:00"}, # 끝\n  ],\n}',
+        PARSE_REPAIRED,
+        ['경복궁', 'http://a.b/#c'],
+    ),
+    ('cut inside a string', _cut_before(FULL, '남산타워', 2), PARSE_SALVAGED, ['경복궁', '광장시장']),
+    ('cut inside an object', _cut_before(FULL, '"lng"'), PARSE_SALVAGED, ['경복궁']),
+    ('cut inside a nested array', _cut_before(FULL, '빈대떡'), PARSE_SALVAGED, ['경복궁']),
+    ('cut between schedule items', FULL[:FULL.index('{', FULL.index('빈대떡'))], PARSE_SALVAGED, ['경복궁', '광장시장']),
+    ('cut after the last item', FULL.rstrip()[:-1].rstrip()[:-1], PARSE_SALVAGED, ['경복궁', '광장시장', '남산타워']),
+    ('fenced and cut', '```json\n' + _cut_before(FULL, '남산타워'), PARSE_SALVAGED, ['경복궁', '광장시장']),
+    ('cut before any item closes', _cut_before(FULL, '"place_name"'), PARSE_FAILED, None),
+    ('no json', '죄송합니다. 일정을 만들 수 없습니다.', PARSE_FAILED, None),
+    ('empty', '', PARSE_FAILED, None),
+    ('none', None, PARSE_FAILED, None),
+]
+
+
+@pytest.mark.parametrize('content, status, names', [case[1:] for case in PARSE_CASES], ids=[case[0] for case in PARSE_CASES])
+def test_parse_itinerary_json(content, status, names):
+    parsed = parse_itinerary_json(content)
+    
+    assert parsed.status == status
+    assert parsed.is_partial == (status == PARSE_SALVAGED)
+    if names is None:
+        assert parsed.data is None
+    else:
+        assert [item['place_name'] for item in parsed.data['schedule']] == names
+
+
+def test_salvaged_items_are_unchanged():
+    parsed = parse_itinerary_json(_cut_before(FULL, '남산타워'))
+    
+    assert parsed.data == {'schedule': ITEMS[:2]}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('```json\n{"a": 1}\n```', '{"a": 1}\n'),
+    ('{"a": [1, 2,], }', '{"a": [1, 2] }'),
+    ('{"a": "// 문자열 안 /* 주석 아님 */ #"} // 주석', '{"a": "// 문자열 안 /* 주석 아님 */ #"} '),
+])
+def test_clean_json_text(text, expected):
+    assert clean_json_text(text) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, len(FULL)])
+def test_stream_emits_each_item_once_in_order(chunk_size):
+    parser = ScheduleItemStreamParser()
+    emitted = []
+    for start in range(0, len(FULL), chunk_size):
+        emitted.extend(parser.feed(FULL[start:start + chunk_size]))
+    
+    assert emitted == ITEMS
+    assert parser.items == ITEMS
+    assert parser.buffer == FULL
+
+
+def test_stream_emits_item_when_it_closes():
+    parser = ScheduleItemStreamParser()
+    first_close = FULL.index('}', FULL.index('[입장]')) + 1  # 문자열 안의 {정문}은 건너뜀
+    
+    assert parser.feed(FULL[:first_close - 1]) == []
+    assert parser.feed(FULL[first_close - 1:first_close]) == [ITEMS[0]]
+    # 중첩 객체(location)가 닫혀도 항목이 닫히기 전에는 나오지 않음
+    nested_close = FULL.index('}', FULL.index('"lng"')) + 1
+    assert parser.feed(FULL[first_close:nested_close]) == []
+    assert parser.feed(FULL[nested_close:]) == ITEMS[1:]
+
+
+def test_stream_ignores_arrays_outside_schedule():
+    content = json.dumps({
+        'notes': [{'place_name': '메모'}],
+        'schedule': [{'place_name': '경복궁'}],
+        'meta': {'schedule': [{'place_name': '중첩'}]},
+    }, ensure_ascii=False)
+    
+    assert ScheduleItemStreamParser().feed(content) == [{'place_name': '경복궁'}]
+
+
+def test_stream_waits_for_comment_end_across_chunks():
+    parser = ScheduleItemStreamParser()
+    
+    assert parser.feed('{"schedule": [ /* {"place_name": "주석"} ') == []
+    assert parser.feed('*/ {"place_name": "경복궁"} // {"x": 1}') == [{'place_name': '경복궁'}]
+    assert parser.feed('\n ]}') == []
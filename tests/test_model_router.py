@@ -0,0 +1,60 @@
+"""
+모델 라우터 테스트
+
+타임아웃 시 대체 모델로 재시도하고, 실제로 응답한 모델을 돌려주는지 확인합니다.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.model_router import ITINERARY, ModelRouter
+
+
+class FakeClient:
+    """모델별 지연 시간을 흉내 내는 chat completion 클라이언트"""
+    
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    async def _create(self, model, messages, **params):
+        self.calls.append(model)
+        await asyncio.sleep(self.delays.get(model, 0))
+        return SimpleNamespace(model=model, usage=None)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setenv('LLM_ROUTE_ITINERARY_MODEL', 'primary')
+    monkeypatch.setenv('LLM_ROUTE_ITINERARY_FALLBACK', 'fallback')
+    monkeypatch.setenv('LLM_ROUTE_ITINERARY_TIMEOUT', '0.05')
+    return ModelRouter()
+
+
+def test_primary_answer(router):
+    client = FakeClient({})
+    response, model = asyncio.run(router.complete_with_model(client, ITINERARY, []))
+    
+    assert model == response.model == 'primary'
+    assert not router.is_fallback(ITINERARY, model)
+
+
+def test_timeout_reports_fallback_model(router):
+    client = FakeClient({'primary': 1.0})
+    response, model = asyncio.run(router.complete_with_model(client, ITINERARY, [], model='primary'))
+    
+    assert client.calls == ['primary', 'fallback']
+    assert model == response.model == 'fallback'
+    assert router.is_fallback(ITINERARY, model)
+    # 타임아웃 뒤에는 대체 모델이 선택됨
+    assert router.select_model(ITINERARY) == 'fallback'
+
+
+def test_fallback_timeout_raises(router):
+    client = FakeClient({'primary': 1.0, 'fallback': 1.0})
+    
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(router.complete(client, ITINERARY, []))
@@ -0,0 +1,145 @@
+"""
+문자열 유사도 테스트
+
+비트 병렬 편집 거리와 임계값 조기 중단이 기존 O(n·m) 동적 계획법 결과와
+같은지 무작위 문자열로 비교합니다.
+"""
+
+import random
+from functools import lru_cache
+
+import pytest
+
+from app.utils.similarity import (
+    CONTAINMENT_SIMILARITY,
+    are_similar_places,
+    calculate_similarity,
+    find_similar,
+    levenshtein_distance,
+    normalize_place_name,
+    similarity_many,
+)
+
+# 겹치는 글자가 많도록 작은 알파벳 (공백/특수문자/지점 접미사는 정규화 대상)
+ALPHABET = 'abc가나다라 -점'
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.85, 0.9]
+
+
+@lru_cache(maxsize=None)
+def reference_levenshtein(s1: str, s2: str) -> int:
+    """기존 구현과 같은 전체 동적 계획법 (같은 쌍을 여러 테스트에서 쓰므로 캐시)"""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def reference_similarity(s1: str, s2: str) -> float:
+    """기존 calculate_similarity (임계값 없이 전체 계산)"""
+    s1_norm, s2_norm = normalize_place_name(s1), normalize_place_name(s2)
+    if s1_norm == s2_norm:
+        return 1.0
+    if s1_norm in s2_norm or s2_norm in s1_norm:
+        return CONTAINMENT_SIMILARITY
+    max_len = max(len(s1_norm), len(s2_norm))
+    return 1.0 - reference_levenshtein(s1_norm, s2_norm) / max_len
+
+
+def _random_text(rng: random.Random, max_length: int) -> str:
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def _mutate(rng: random.Random, text: str, edits: int) -> str:
+    """text에서 몇 글자를 바꾸거나 넣거나 뺀 문자열 (유사한 쌍 생성용)"""
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        position = rng.randint(0, len(chars))
+        if op == 0 or not chars:
+            chars.insert(position, rng.choice(ALPHABET))
+        elif op == 1:
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice(ALPHABET)
+    return ''.join(chars)
+
+
+def _pairs(seed: int, count: int, max_length: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        first = _random_text(rng, max_length)
+        if rng.random() < 0.5:
+            yield first, _mutate(rng, first, rng.randint(0, 6))
+        else:
+            yield first, _random_text(rng, max_length)
+
+
+# 64자를 넘는 문자열 포함 (비트마스크가 한 워드를 넘는 경우)
+PAIRS = list(_pairs(seed=21, count=1500, max_length=20)) + list(_pairs(seed=22, count=300, max_length=90))
+
+
+def test_levenshtein_matches_reference():
+    for s1, s2 in PAIRS:
+        assert levenshtein_distance(s1, s2) == reference_levenshtein(s1, s2), (s1, s2)
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 2, 5, 10])
+def test_levenshtein_with_max_distance(max_distance):
+    for s1, s2 in PAIRS:
+        expected = reference_levenshtein(s1, s2)
+        distance = levenshtein_distance(s1, s2, max_distance)
+        if expected <= max_distance:
+            assert distance == expected, (s1, s2)
+        else:
+            assert distance > max_distance, (s1, s2)
+
+
+def test_similarity_matches_reference():
+    for s1, s2 in PAIRS:
+        assert calculate_similarity(s1, s2) == pytest.approx(reference_similarity(s1, s2)), (s1, s2)
+
+
+@pytest.mark.parametrize('threshold', THRESHOLDS)
+def test_thresholded_similarity_keeps_decisions(threshold):
+    for s1, s2 in PAIRS:
+        expected = reference_similarity(s1, s2)
+        similarity = calculate_similarity(s1, s2, threshold=threshold)
+        assert (similarity >= threshold) == (expected >= threshold), (s1, s2)
+        assert are_similar_places(s1, s2, threshold) == (expected >= threshold), (s1, s2)
+        if expected >= threshold:
+            assert similarity == pytest.approx(expected), (s1, s2)
+
+
+@pytest.mark.parametrize('threshold', [None] + THRESHOLDS)
+def test_batch_apis_match_pairwise(threshold):
+    rng = random.Random(23)
+    for _ in range(100):
+        query = _random_text(rng, 15)
+        candidates = [_mutate(rng, query, rng.randint(0, 5)) for _ in range(10)]
+        expected = [reference_similarity(query, candidate) for candidate in candidates]
+        
+        similarities = similarity_many(query, candidates, threshold)
+        for similarity, reference in zip(similarities, expected):
+            if threshold is None or reference >= threshold:
+                assert similarity == pytest.approx(reference)
+            else:
+                assert similarity < threshold
+        
+        if threshold is not None:
+            first = next((i for i, value in enumerate(expected) if value >= threshold), None)
+            found = find_similar(query, candidates, threshold)
+            assert (found[0] if found else None) == first
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('스타벅스 강남점', '스타벅스강남'),
+    ('Cafe-ONION (성수)', 'cafeonion성수'),
+    ('', ''),
+])
+def test_normalize_place_name(name, expected):
+    assert normalize_place_name(name) == expected
@@ -0,0 +1,115 @@
+"""
+공간 색인 테스트
+
+SpatialIndex의 반경 / 최근접 질의가 모든 점을 haversine으로 비교한 결과와 같은지
+여러 격자 크기와 위도(경도 칸이 좁아지는 고위도 포함)에서 확인합니다.
+"""
+
+import random
+
+import pytest
+
+from app.utils.similarity import calculate_coordinate_distance
+from app.utils.spatial_index import KDTREE_MIN_POINTS, SCIPY_AVAILABLE, SpatialIndex
+
+CELL_SIZES = [50.0, 500.0, 5000.0]
+CENTERS = [(37.5665, 126.9780), (33.4996, 126.5312), (64.1466, -21.9426)]
+
+
+def _random_points(rng: random.Random, center, count: int, spread_deg: float):
+    lat, lng = center
+    return [
+        (item_id, lat + rng.uniform(-spread_deg, spread_deg), lng + rng.uniform(-spread_deg, spread_deg))
+        for item_id in range(count)
+    ]
+
+
+def brute_force(points, lat: float, lng: float):
+    """모든 점과의 거리 (가까운 순, 같은 거리면 id 순)"""
+    found = [(item_id, calculate_coordinate_distance(lat, lng, p_lat, p_lng)) for item_id, p_lat, p_lng in points]
+    return sorted(found, key=lambda pair: (pair[1], pair[0]))
+
+
+def _queries(rng: random.Random, center, count: int, spread_deg: float):
+    lat, lng = center
+    return [(lat + rng.uniform(-spread_deg, spread_deg), lng + rng.uniform(-spread_deg, spread_deg)) for _ in range(count)]
+
+
+@pytest.mark.parametrize('cell_meters', CELL_SIZES)
+@pytest.mark.parametrize('center', CENTERS)
+def test_within_matches_brute_force(cell_meters, center):
+    rng = random.Random(25)
+    points = _random_points(rng, center, 200, 0.05)
+    # 격자 경계/같은 칸에 몰린 점과 같은 좌표의 점
+    points += [(200 + i, center[0], center[1]) for i in range(3)]
+    index = SpatialIndex.from_points(points, cell_meters)
+    
+    for lat, lng in _queries(rng, center, 40, 0.06):
+        ranked = brute_force(points, lat, lng)
+        for radius in (10.0, 50.0, 333.0, 1200.0, 8000.0):
+            expected = [pair for pair in ranked if pair[1] <= radius]
+            assert index.within(lat, lng, radius) == expected
+            assert {item_id for item_id, _ in expected} <= set(index.candidates(lat, lng, radius))
+
+
+@pytest.mark.parametrize('cell_meters', CELL_SIZES)
+@pytest.mark.parametrize('center', CENTERS)
+def test_nearest_matches_brute_force(cell_meters, center):
+    rng = random.Random(26)
+    points = _random_points(rng, center, 150, 0.08)
+    index = SpatialIndex.from_points(points, cell_meters)
+    
+    for lat, lng in _queries(rng, center, 40, 0.2):
+        ranked = brute_force(points, lat, lng)
+        for k in (1, 3, 10, len(points) + 5):
+            assert index.nearest(lat, lng, k) == ranked[:k]
+        for max_distance in (100.0, 2000.0):
+            assert index.nearest(lat, lng, 5, max_distance) == [pair for pair in ranked if pair[1] <= max_distance][:5]
+
+
+@pytest.mark.parametrize('cell_meters', CELL_SIZES)
+def test_nearest_neighbour_walk_with_remove(cell_meters):
+    """방문한 지점을 빼 가며 최근접을 찾는 경로 탐색과 전체 비교 결과가 같음"""
+    rng = random.Random(27)
+    points = _random_points(rng, CENTERS[0], 80, 0.1)
+    index = SpatialIndex.from_points(points, cell_meters)
+    remaining = list(points)
+    lat, lng = CENTERS[0]
+    
+    while remaining:
+        expected_id, expected_distance = brute_force(remaining, lat, lng)[0]
+        assert index.nearest(lat, lng) == [(expected_id, expected_distance)]
+        index.remove(expected_id)
+        remaining = [point for point in remaining if point[0] != expected_id]
+        _, lat, lng = points[expected_id]
+    
+    assert len(index) == 0
+    assert index.nearest(lat, lng) == []
+
+
+@pytest.mark.skipif(not SCIPY_AVAILABLE, reason="scipy 미설치")
+def test_frozen_kdtree_matches_brute_force():
+    rng = random.Random(28)
+    points = _random_points(rng, CENTERS[0], KDTREE_MIN_POINTS * 2, 0.1)
+    index = SpatialIndex.from_points(points, 500.0).freeze()
+    assert index._kdtree is not None
+    
+    for lat, lng in _queries(rng, CENTERS[0], 30, 0.12):
+        ranked = brute_force(points, lat, lng)
+        assert index.within(lat, lng, 700.0) == [pair for pair in ranked if pair[1] <= 700.0]
+        assert index.nearest(lat, lng, 7) == ranked[:7]
+    
+    # 점을 바꾸면 KD-tree를 버리고 격자로 계속 정확히 답함
+    index.add(len(points), *CENTERS[0])
+    assert index._kdtree is None
+    assert index.nearest(*CENTERS[0]) == [(len(points), 0.0)]
+
+
+def test_add_existing_id_moves_point():
+    index = SpatialIndex(100.0)
+    index.add(1, 37.5, 127.0)
+    index.add(1, 37.6, 127.1)
+    
+    assert len(index) == 1
+    assert index.within(37.5, 127.0, 1000.0) == []
+    assert index.nearest(37.6, 127.1) == [(1, 0.0)]